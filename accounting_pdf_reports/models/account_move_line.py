@@ -1,5 +1,23 @@
 import ast
-from odoo import api, models, fields
+from odoo import api, models, fields, tools
+
+# context keys read by _query_get, they make up the key of the compiled filter
+QUERY_GET_CONTEXT_KEYS = [
+    'aged_balance', 'date_to', 'date_from', 'strict_range', 'initial_bal',
+    'journal_ids', 'state', 'company_id', 'allowed_company_ids', 'reconcile_date',
+    'account_tag_ids', 'account_ids', 'analytic_tag_ids', 'analytic_account_ids',
+    'partner_ids', 'partner_categories', 'active_test',
+]
+
+
+def _freeze(value):
+    if isinstance(value, models.BaseModel):
+        return value._name, tuple(value.ids)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(val)) for key, val in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(val) for val in value)
+    return value
 
 
 class AccountMoveLine(models.Model):
@@ -9,10 +27,22 @@ class AccountMoveLine(models.Model):
     def _query_get(self, domain=None):
         self.check_access('read')
 
-        context = dict(self._context or {})
         domain = domain or []
         if not isinstance(domain, (list, tuple)):
             domain = ast.literal_eval(domain)
+        context = self._context or {}
+        context_key = tuple((key, _freeze(context.get(key))) for key in QUERY_GET_CONTEXT_KEYS)
+        tables, where_clause, where_clause_params = self._get_query_filter(
+            list(domain), _freeze(domain), context_key, tuple(self.env.companies.ids))
+        return tables, where_clause, list(where_clause_params)
+
+    @api.model
+    @tools.ormcache('self.env.uid', 'self.env.su', 'self.env.company.id', 'company_ids', 'domain_key', 'context_key')
+    def _get_query_filter(self, domain, domain_key, context_key, company_ids):
+        # The report domain compiled to SQL with the record rules applied. It only depends on the
+        # report context, the user and the companies, so it is built once per report instead of
+        # once per account, partner or journal being printed.
+        context = dict(self._context or {})
 
         date_field = 'date'
         if context.get('aged_balance'):
@@ -74,4 +104,4 @@ class AccountMoveLine(models.Model):
             from_string, from_params = query.from_clause
             where_string, where_params = query.where_clause
             tables, where_clause, where_clause_params = from_string, where_string, from_params + where_params
-        return tables, where_clause, where_clause_params
+        return tables, where_clause, tuple(where_clause_params)
@@ -37,47 +37,67 @@ class ReportFinancial(models.AbstractModel):
                 res[row['id']] = row
         return res
 
+    def _get_report_accounts(self, report, accounts_by_type):
+        if report.type == 'accounts':
+            return report.account_ids
+        if report.type == 'account_type':
+            account_types = tuple(sorted(report.account_type_ids.mapped('type')))
+            if account_types not in accounts_by_type:
+                accounts_by_type[account_types] = self.env['account.account'].search(
+                    [('account_type', 'in', account_types)])
+            return accounts_by_type[account_types]
+        return self.env['account.account']
+
     def _compute_report_balance(self, reports):
         '''returns a dictionary with key=the ID of a record and value=the credit, debit and balance amount
-           computed for this record. If the record is of type :
-               'accounts' : it's the sum of the linked accounts
-               'account_type' : it's the sum of leaf accoutns with such an account_type
-               'account_report' : it's the amount of the related report
-               'sum' : it's the sum of the children of this record (aka a 'view' record)'''
-        res = {}
+           computed for this record. If the record is of type :
+               'accounts' : it's the sum of the linked accounts
+               'account_type' : it's the sum of leaf accoutns with such an account_type
+               'account_report' : it's the amount of the related report
+               'sum' : it's the sum of the children of this record (aka a 'view' record)
+           The balances of the leaf accounts of the whole tree are fetched in a single query, then every
+           node is evaluated once, bottom-up, so reports shared by several parents are not recomputed.'''
         fields = ['credit', 'debit', 'balance']
-        for report in reports:
-            if report.id in res:
-                continue
-            res[report.id] = dict((fn, 0.0) for fn in fields)
-            if report.type == 'accounts':
-                # it's the sum of the linked accounts
-                res[report.id]['account'] = self._compute_account_balance(report.account_ids)
-                for value in res[report.id]['account'].values():
-                    for field in fields:
-                        res[report.id][field] += value.get(field)
-            elif report.type == 'account_type':
-                # it's the sum the leaf accounts with such an account type
-                accounts = self.env['account.account'].search(
-                    [('account_type', 'in', report.account_type_ids.mapped('type'))])
+        nodes = self.env['account.financial.report']
+        todo = reports
+        while todo:
+            nodes |= todo
+            todo = (todo.children_ids | todo.filtered(
+                lambda r: r.type == 'account_report').account_report_id) - nodes
+
+        accounts_by_type = {}
+        report_accounts = {}
+        for node in nodes:
+            report_accounts[node.id] = self._get_report_accounts(node, accounts_by_type)
+        all_accounts = self.env['account.account'].union(*report_accounts.values())
+        account_balances = self._compute_account_balance(all_accounts)
 
-                res[report.id]['account'] = self._compute_account_balance(accounts)
-                for value in res[report.id]['account'].values():
+        memo = {}
+
+        def evaluate(report):
+            if report.id in memo:
+                return memo[report.id]
+            value = memo[report.id] = dict((fn, 0.0) for fn in fields)
+            if report.type in ('accounts', 'account_type'):
+                value['account'] = dict(
+                    (account.id, account_balances[account.id]) for account in report_accounts[report.id])
+                for account_value in value['account'].values():
                     for field in fields:
-                        res[report.id][field] += value.get(field)
+                        value[field] += account_value.get(field)
             elif report.type == 'account_report' and report.account_report_id:
                 # it's the amount of the linked report
-                res2 = self._compute_report_balance(report.account_report_id)
-                for key, value in res2.items():
-                    for field in fields:
-                        res[report.id][field] += value[field]
+                linked_value = evaluate(report.account_report_id)
+                for field in fields:
+                    value[field] += linked_value[field]
             elif report.type == 'sum':
                 # it's the sum of the children of this account.report
-                res2 = self._compute_report_balance(report.children_ids)
-                for key, value in res2.items():
+                for child in report.children_ids:
+                    child_value = evaluate(child)
                     for field in fields:
-                        res[report.id][field] += value[field]
-        return res
+                        value[field] += child_value[field]
+            return value
+
+        return dict((report.id, evaluate(report)) for report in reports)
 
     def get_account_lines(self, data):
         lines = []
@@ -24,70 +24,69 @@ class ReportJournal(models.AbstractModel):
             query += 'am.name'
         query += ', "account_move_line".move_id'
         self.env.cr.execute(query, tuple(params))
-        ids = (x[0] for x in self.env.cr.fetchall())
+        ids = [x[0] for x in self.env.cr.fetchall()]
         return self.env['account.move.line'].browse(ids)
 
-    def _sum_debit(self, data, journal_id):
+    def _get_journal_totals(self, data, journal_ids):
         move_state = ['draft', 'posted']
         if data['form'].get('target_move', 'all') == 'posted':
             move_state = ['posted']
 
         query_get_clause = self._get_query_get_clause(data)
-        params = [tuple(move_state), tuple(journal_id.ids)] + query_get_clause[2]
-        self.env.cr.execute('SELECT SUM(debit) FROM ' + query_get_clause[0] + ', account_move am '
-                        'WHERE "account_move_line".move_id=am.id AND am.state IN %s AND "account_move_line".journal_id IN %s AND ' + query_get_clause[1] + ' ',
-                        tuple(params))
-        return self.env.cr.fetchone()[0] or 0.0
-
-    def _sum_credit(self, data, journal_id):
-        move_state = ['draft', 'posted']
-        if data['form'].get('target_move', 'all') == 'posted':
-            move_state = ['posted']
-
-        query_get_clause = self._get_query_get_clause(data)
-        params = [tuple(move_state), tuple(journal_id.ids)] + query_get_clause[2]
-        self.env.cr.execute('SELECT SUM(credit) FROM ' + query_get_clause[0] + ', account_move am '
-                        'WHERE "account_move_line".move_id=am.id AND am.state IN %s AND "account_move_line".journal_id IN %s AND ' + query_get_clause[1] + ' ',
+        params = [tuple(move_state), tuple(journal_ids)] + query_get_clause[2]
+        self.env.cr.execute('SELECT "account_move_line".journal_id, SUM(debit), SUM(credit) FROM ' + query_get_clause[0] + ', account_move am '
+                        'WHERE "account_move_line".move_id=am.id AND am.state IN %s AND "account_move_line".journal_id IN %s AND ' + query_get_clause[1] + ' '
+                        'GROUP BY "account_move_line".journal_id',
                         tuple(params))
-        return self.env.cr.fetchone()[0] or 0.0
+        res = {journal_id: {'debit': 0.0, 'credit': 0.0} for journal_id in journal_ids}
+        for journal_id, debit, credit in self.env.cr.fetchall():
+            res[journal_id] = {'debit': debit or 0.0, 'credit': credit or 0.0}
+        return res
 
-    def _get_taxes(self, data, journal_id):
+    def _get_journal_taxes(self, data, journals):
         move_state = ['draft', 'posted']
         if data['form'].get('target_move', 'all') == 'posted':
             move_state = ['posted']
 
         query_get_clause = self._get_query_get_clause(data)
-        params = [tuple(move_state), tuple(journal_id.ids)] + query_get_clause[2]
+        params = [tuple(move_state), tuple(journals.ids)] + query_get_clause[2]
+        # Base amounts come from the taxes of the lines and tax amounts from
+        # the tax lines, only the taxes having a base are reported.
         query = """
-            SELECT rel.account_tax_id, SUM("account_move_line".balance) AS base_amount
-            FROM account_move_line_account_tax_rel rel, """ + query_get_clause[0] + """ 
-            LEFT JOIN account_move am ON "account_move_line".move_id = am.id
-            WHERE "account_move_line".id = rel.account_move_line_id
-                AND am.state IN %s
-                AND "account_move_line".journal_id IN %s
-                AND """ + query_get_clause[1] + """
-           GROUP BY rel.account_tax_id"""
-        self.env.cr.execute(query, tuple(params))
-        ids = []
-        base_amounts = {}
-        for row in self.env.cr.fetchall():
-            ids.append(row[0])
-            base_amounts[row[0]] = row[1]
-
-
-        res = {}
-        for tax in self.env['account.tax'].browse(ids):
-            self.env.cr.execute('SELECT sum(debit - credit) FROM ' + query_get_clause[0] + ', account_move am '
-                'WHERE "account_move_line".move_id=am.id AND am.state IN %s AND "account_move_line".journal_id IN %s AND ' + query_get_clause[1] + ' AND tax_line_id = %s',
-                tuple(params + [tax.id]))
-            res[tax] = {
-                'base_amount': base_amounts[tax.id],
-                'tax_amount': self.env.cr.fetchone()[0] or 0.0,
+            SELECT journal_id, tax_id, SUM(base_amount), SUM(tax_amount)
+            FROM (
+                SELECT "account_move_line".journal_id, rel.account_tax_id AS tax_id,
+                    "account_move_line".balance AS base_amount, 0.0 AS tax_amount, TRUE AS is_base
+                FROM account_move_line_account_tax_rel rel, """ + query_get_clause[0] + """
+                LEFT JOIN account_move am ON "account_move_line".move_id = am.id
+                WHERE "account_move_line".id = rel.account_move_line_id
+                    AND am.state IN %s
+                    AND "account_move_line".journal_id IN %s
+                    AND """ + query_get_clause[1] + """
+                UNION ALL
+                SELECT "account_move_line".journal_id, "account_move_line".tax_line_id,
+                    0.0, "account_move_line".debit - "account_move_line".credit, FALSE
+                FROM """ + query_get_clause[0] + """, account_move am
+                WHERE "account_move_line".move_id = am.id
+                    AND am.state IN %s
+                    AND "account_move_line".journal_id IN %s
+                    AND "account_move_line".tax_line_id IS NOT NULL
+                    AND """ + query_get_clause[1] + """
+            ) AS journal_tax
+            GROUP BY journal_id, tax_id
+            HAVING bool_or(is_base)
+            ORDER BY journal_id, tax_id"""
+        self.env.cr.execute(query, tuple(params + params))
+        rows = self.env.cr.fetchall()
+        taxes = self.env['account.tax'].browse([row[1] for row in rows])
+        res = {journal.id: {} for journal in journals}
+        for journal_id, tax_id, base_amount, tax_amount in rows:
+            #sales operation are credits
+            sign = -1 if journals.browse(journal_id).type == 'sale' else 1
+            res[journal_id][taxes.browse(tax_id)] = {
+                'base_amount': sign * base_amount,
+                'tax_amount': sign * (tax_amount or 0.0),
             }
-            if journal_id.type == 'sale':
-                #sales operation are credits
-                res[tax]['base_amount'] = res[tax]['base_amount'] * -1
-                res[tax]['tax_amount'] = res[tax]['tax_amount'] * -1
         return res
 
     def _get_query_get_clause(self, data):
@@ -101,17 +100,23 @@ class ReportJournal(models.AbstractModel):
         target_move = data['form'].get('target_move', 'all')
         sort_selection = data['form'].get('sort_selection', 'date')
 
-        res = {}
-        for journal in data['form']['journal_ids']:
-            res[journal] = self.with_context(data['form'].get('used_context', {})).lines(target_move, journal, sort_selection, data)
+        journals = self.env['account.journal'].browse(data['form']['journal_ids'])
+        move_lines = self.with_context(data['form'].get('used_context', {})).lines(target_move, journals.ids, sort_selection, data)
+        # Load every field used by the template at once instead of record by
+        # record while rendering.
+        move_lines.fetch(['journal_id', 'move_id', 'date', 'account_id', 'partner_id', 'name', 'debit', 'credit', 'amount_currency', 'currency_id'])
+        move_lines.move_id.fetch(['name'])
+        move_lines.account_id.fetch(['code'])
+        move_lines.sudo().partner_id.fetch(['name'])
+        lines_by_journal = move_lines.grouped('journal_id')
+        res = {journal.id: lines_by_journal.get(journal, move_lines.browse()) for journal in journals}
         return {
             'doc_ids': data['form']['journal_ids'],
             'doc_model': self.env['account.journal'],
             'data': data,
-            'docs': self.env['account.journal'].browse(data['form']['journal_ids']),
+            'docs': journals,
             'time': time,
             'lines': res,
-            'sum_credit': self._sum_credit,
-            'sum_debit': self._sum_debit,
-            'get_taxes': self._get_taxes,
+            'journal_totals': self._get_journal_totals(data, journals.ids),
+            'journal_taxes': self._get_journal_taxes(data, journals),
         }
@@ -7,63 +7,58 @@ class ReportPartnerLedger(models.AbstractModel):
     _name = 'report.accounting_pdf_reports.report_partnerledger'
     _description = 'Partner Ledger Report'
 
-    def _lines(self, data, partner):
-        full_account = []
+    def _get_partner_lines(self, data, partner_ids):
+        full_account = {partner_id: [] for partner_id in partner_ids}
+        if not partner_ids:
+            return full_account
         currency = self.env['res.currency']
         query_get_data = self.env['account.move.line'].with_context(data['form'].get('used_context', {}))._query_get()
         reconcile_clause = "" if data['form']['reconciled'] else ' AND "account_move_line".full_reconcile_id IS NULL '
-        params = [partner.id, tuple(data['computed']['move_state']), tuple(data['computed']['account_ids'])] + query_get_data[2]
+        params = [tuple(partner_ids), tuple(data['computed']['move_state']), tuple(data['computed']['account_ids'])] + query_get_data[2]
         query = """
-            SELECT "account_move_line".id, "account_move_line".date, j.code, acc.name->>'en_US' as a_name, "account_move_line".ref, m.name as move_name, "account_move_line".name, "account_move_line".debit, "account_move_line".credit, "account_move_line".amount_currency,"account_move_line".currency_id, c.symbol AS currency_code
+            SELECT "account_move_line".id, "account_move_line".partner_id, "account_move_line".date, j.code, acc.name->>'en_US' as a_name, "account_move_line".ref, m.name as move_name, "account_move_line".name, "account_move_line".debit, "account_move_line".credit, "account_move_line".amount_currency,"account_move_line".currency_id, c.symbol AS currency_code
             FROM """ + query_get_data[0] + """
             LEFT JOIN account_journal j ON ("account_move_line".journal_id = j.id)
             LEFT JOIN account_account acc ON ("account_move_line".account_id = acc.id)
             LEFT JOIN res_currency c ON ("account_move_line".currency_id=c.id)
             LEFT JOIN account_move m ON (m.id="account_move_line".move_id)
-            WHERE "account_move_line".partner_id = %s
+            WHERE "account_move_line".partner_id IN %s
                 AND m.state IN %s
                 AND "account_move_line".account_id IN %s AND """ + query_get_data[1] + reconcile_clause + """
-                ORDER BY "account_move_line".date"""
+                ORDER BY "account_move_line".partner_id, "account_move_line".date, "account_move_line".id"""
         self.env.cr.execute(query, tuple(params))
-        res = self.env.cr.dictfetchall()
-        sum = 0.0
-        lang_code = self.env.context.get('lang') or 'en_US'
-        lang = self.env['res.lang']
-        lang_id = lang._lang_get(lang_code)
-        date_format = lang_id.date_format
-        for r in res:
-            r['date'] = r['date']
+        progress = {}
+        for r in self.env.cr.dictfetchall():
             r['displayed_name'] = '-'.join(
                 r[field_name] for field_name in ('move_name', 'ref', 'name')
                 if r[field_name] not in (None, '', '/')
             )
-            sum += r['debit'] - r['credit']
-            r['progress'] = sum
+            progress[r['partner_id']] = progress.get(r['partner_id'], 0.0) + r['debit'] - r['credit']
+            r['progress'] = progress[r['partner_id']]
             r['currency_id'] = currency.browse(r.get('currency_id'))
-            full_account.append(r)
+            full_account[r['partner_id']].append(r)
         return full_account
 
-    def _sum_partner(self, data, partner, field):
-        if field not in ['debit', 'credit', 'debit - credit']:
-            return
-        result = 0.0
+    def _get_partner_sums(self, data, partner_ids=None):
         query_get_data = self.env['account.move.line'].with_context(data['form'].get('used_context', {}))._query_get()
         reconcile_clause = "" if data['form']['reconciled'] else ' AND "account_move_line".full_reconcile_id IS NULL '
-
-        params = [partner.id, tuple(data['computed']['move_state']), tuple(data['computed']['account_ids'])] + query_get_data[2]
-        query = """SELECT sum(""" + field + """)
+        partner_clause = ' AND "account_move_line".partner_id IN %s ' if partner_ids else ''
+        params = [tuple(data['computed']['move_state']), tuple(data['computed']['account_ids'])] + query_get_data[2]
+        if partner_ids:
+            params.append(tuple(partner_ids))
+        query = """SELECT "account_move_line".partner_id, sum(debit), sum(credit), sum(debit - credit)
                 FROM """ + query_get_data[0] + """, account_move AS m
-                WHERE "account_move_line".partner_id = %s
+                WHERE "account_move_line".partner_id IS NOT NULL
                     AND m.id = "account_move_line".move_id
                     AND m.state IN %s
                     AND account_id IN %s
-                    AND """ + query_get_data[1] + reconcile_clause
+                    AND """ + query_get_data[1] + reconcile_clause + partner_clause + """
+                GROUP BY "account_move_line".partner_id"""
         self.env.cr.execute(query, tuple(params))
-
-        contemp = self.env.cr.fetchone()
-        if contemp is not None:
-            result = contemp[0] or 0.0
-        return result
+        return {
+            partner_id: {'debit': debit, 'credit': credit, 'debit - credit': balance}
+            for partner_id, debit, credit, balance in self.env.cr.fetchall()
+        }
 
     @api.model
     def _get_report_values(self, docids, data=None):
@@ -72,7 +67,6 @@ class ReportPartnerLedger(models.AbstractModel):
         data['computed'] = {}
 
         obj_partner = self.env['res.partner']
-        query_get_data = self.env['account.move.line'].with_context(data['form'].get('used_context', {}))._query_get()
         data['computed']['move_state'] = ['draft', 'posted']
         if data['form'].get('target_move', 'all') == 'posted':
             data['computed']['move_state'] = ['posted']
@@ -90,24 +84,13 @@ class ReportPartnerLedger(models.AbstractModel):
             WHERE a.account_type IN %s
             AND NOT a.deprecated""", (tuple(data['computed']['ACCOUNT_TYPE']),))
         data['computed']['account_ids'] = [a for (a,) in self.env.cr.fetchall()]
-        params = [tuple(data['computed']['move_state']), tuple(data['computed']['account_ids'])] + query_get_data[2]
-        reconcile_clause = "" if data['form']['reconciled'] else ' AND "account_move_line".full_reconcile_id IS NULL '
-        query = """
-            SELECT DISTINCT "account_move_line".partner_id
-            FROM """ + query_get_data[0] + """, account_account AS account, account_move AS am
-            WHERE "account_move_line".partner_id IS NOT NULL
-                AND "account_move_line".account_id = account.id
-                AND am.id = "account_move_line".move_id
-                AND am.state IN %s
-                AND "account_move_line".account_id IN %s
-                AND NOT account.deprecated
-                AND """ + query_get_data[1] + reconcile_clause
-        self.env.cr.execute(query, tuple(params))
+        partner_sums = self._get_partner_sums(data, data['form']['partner_ids'])
         if data['form']['partner_ids']:
             partner_ids = data['form']['partner_ids']
         else:
-            partner_ids = [res['partner_id'] for res in
-                           self.env.cr.dictfetchall()]
+            partner_ids = list(partner_sums)
+        for partner_id in partner_ids:
+            partner_sums.setdefault(partner_id, dict.fromkeys(['debit', 'credit', 'debit - credit'], 0.0))
         partners = obj_partner.browse(partner_ids)
         partners = sorted(partners, key=lambda x: (x.ref or '', x.name or ''))
 
@@ -117,6 +100,6 @@ class ReportPartnerLedger(models.AbstractModel):
             'data': data,
             'docs': partners,
             'time': time,
-            'lines': self._lines,
-            'sum_partner': self._sum_partner,
+            'partner_lines': self._get_partner_lines(data, partner_ids),
+            'partner_sums': partner_sums,
         }
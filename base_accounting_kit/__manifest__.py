@@ -43,6 +43,7 @@
         'data/followup_levels.xml',
         'data/multiple_invoice_data.xml',
         'data/recurring_entry_cron.xml',
+        'data/account_asset_cron.xml',
         'data/account_pdc_data.xml',
         'views/reports_config_view.xml',
         'views/accounting_menu.xml',
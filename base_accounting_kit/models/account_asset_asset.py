@@ -27,6 +27,14 @@ from odoo.fields import Date
 from odoo.tools import DEFAULT_SERVER_DATE_FORMAT as DF, float_is_zero
 from odoo.exceptions import UserError, ValidationError
 
+# depreciation line fields computed by the depreciation board
+BOARD_LINE_FIELDS = ['amount', 'name', 'remaining_value', 'depreciated_value',
+                     'depreciation_date']
+
+# asset fields copied on the rows of the asset analysis report
+ASSET_REPORT_FIELDS = ['active', 'category_id', 'company_id', 'date',
+                       'partner_id', 'state', 'value']
+
 
 class AccountAssetAsset(models.Model):
     """
@@ -126,9 +134,14 @@ class AccountAssetAsset(models.Model):
         result = dict(self.env.cr.fetchall())
         return result
 
-    # @api.model
-    # def _cron_generate_entries(self):
-    #     self.compute_generated_entries(datetime.today())
+    @api.model
+    def _cron_generate_entries(self):
+        """Generate the depreciation entries due today, committing them by
+        batch so that an interrupted run resumes from the lines still
+        without entry."""
+        self.with_context(asset_batch_commit=True).compute_generated_entries(
+            fields.Date.context_today(self))
+
     @api.onchange('category_id')
     def gross_value(self):
         """Update the 'value' field based on the 'price' of the selected 'category_id'."""
@@ -149,13 +162,15 @@ class AccountAssetAsset(models.Model):
         created_move_ids += ungrouped_assets._compute_entries(date,
                                                               group_entries=False)
 
-        for grouped_category in self.env['account.asset.category'].search(
-                type_domain + [('group_entries', '=', True)]):
-            assets = self.env['account.asset.asset'].search(
-                [('state', '=', 'open'),
-                 ('category_id', '=', grouped_category.id)])
+        grouped_assets = self.env['account.asset.asset'].search(
+            [('category_id.' + leaf[0], leaf[1], leaf[2])
+             for leaf in type_domain] +
+            [('state', '=', 'open'), ('category_id.group_entries', '=', True)])
+        for assets in grouped_assets.grouped('category_id').values():
             created_move_ids += assets._compute_entries(date,
                                                         group_entries=True)
+            self.env[
+                'account.asset.depreciation.line']._commit_depreciation_batch()
         return created_move_ids
 
     def _compute_board_amount(self, sequence, residual_amount, amount_to_depr,
@@ -228,16 +243,78 @@ class AccountAssetAsset(models.Model):
             Compute the depreciation schedule for the asset based on its current state and parameters.
             This method calculates the depreciation amount for each period and generates depreciation entries accordingly.
         """
-        self.ensure_one()
-        posted_depreciation_line_ids = self.depreciation_line_ids.filtered(
-            lambda x: x.move_check).sorted(key=lambda l: l.depreciation_date)
-        unposted_depreciation_line_ids = self.depreciation_line_ids.filtered(
-            lambda x: not x.move_check)
-
-        # Remove old unposted depreciation lines. We cannot use unlink() with One2many field
-        commands = [(2, line_id.id, False) for line_id in
-                    unposted_depreciation_line_ids]
+        self.depreciation_line_ids.fetch(
+            BOARD_LINE_FIELDS + ['sequence', 'move_check'])
+        vals_to_create = []
+        lines_to_unlink = self.env['account.asset.depreciation.line']
+        # the lines getting the same changes are written together, the other
+        # changed lines are replaced, so that no line is written on its own
+        lines_by_changes = {}
+        for asset in self:
+            posted_depreciation_line_ids = asset.depreciation_line_ids.filtered(
+                lambda x: x.move_check).sorted(
+                key=lambda l: l.depreciation_date)
+            unposted_lines = {}
+            for line in (asset.depreciation_line_ids -
+                         posted_depreciation_line_ids):
+                if line.sequence in unposted_lines:
+                    lines_to_unlink |= line
+                else:
+                    unposted_lines[line.sequence] = line
+            for vals in asset._compute_board_lines(
+                    posted_depreciation_line_ids):
+                line = unposted_lines.pop(vals['sequence'], None)
+                if not line:
+                    vals_to_create.append(vals)
+                    continue
+                changes = dict(
+                    (field_name, vals[field_name])
+                    for field_name in BOARD_LINE_FIELDS
+                    if asset._is_board_value_changed(line, field_name,
+                                                     vals[field_name]))
+                if changes:
+                    lines_by_changes.setdefault(
+                        tuple(changes.items()), []).append((line, vals))
+            for line in unposted_lines.values():
+                lines_to_unlink |= line
+        for changes, lines_vals in lines_by_changes.items():
+            if len(lines_vals) > 1:
+                lines_to_unlink.browse(
+                    [line.id for line, vals in lines_vals]).write(
+                    dict(changes))
+            else:
+                line, vals = lines_vals[0]
+                lines_to_unlink |= line
+                vals_to_create.append(vals)
+        lines_to_unlink.unlink()
+        self.env['account.asset.depreciation.line'].create(vals_to_create)
+        depreciation_dates = [
+            depreciation_date for depreciation_date in
+            self.depreciation_line_ids.mapped('depreciation_date')
+            if depreciation_date]
+        if depreciation_dates:
+            # every line of an asset is dated at the latest on its own last
+            # depreciation date, so the latest date of all the assets
+            # selects the same lines
+            self._compute_entries(date=max(depreciation_dates))
+        return True
 
+    def _is_board_value_changed(self, line, field_name, value):
+        """Return whether value differs from the value of field_name on the
+        depreciation line."""
+        field_type = line._fields[field_name].type
+        if field_type in ('float', 'monetary'):
+            return bool(self.currency_id.compare_amounts(line[field_name],
+                                                         value))
+        if field_type == 'date':
+            value = fields.Date.to_date(value)
+        return line[field_name] != value
+
+    def _compute_board_lines(self, posted_depreciation_line_ids):
+        """Return the values of the unposted depreciation lines of the
+        asset, by sequence."""
+        self.ensure_one()
+        board = []
         if self.value_residual != 0.0:
             amount_to_depr = residual_amount = self.value_residual
             if self.prorata:
@@ -315,7 +392,7 @@ class AccountAssetAsset(models.Model):
                             self.salvage_value + residual_amount),
                     'depreciation_date': depreciation_date.strftime(DF),
                 }
-                commands.append((0, False, vals))
+                board.append(vals)
                 # Considering Depr. Period as months
                 depreciation_date = date(year, month, day) + relativedelta(
                     months=+self.method_period)
@@ -323,13 +400,7 @@ class AccountAssetAsset(models.Model):
                 month = depreciation_date.month
                 year = depreciation_date.year
 
-        self.write({'depreciation_line_ids': commands})
-        last_depr_date = None
-        if self.depreciation_line_ids:
-            last_depr_date = max(self.depreciation_line_ids.mapped('depreciation_date'))
-        if last_depr_date:
-            self._compute_entries(date=last_depr_date)
-        return True
+        return board
 
     def validate(self):
         """Update the state to 'open' and track specific fields based on the asset's method."""
@@ -529,20 +600,23 @@ class AccountAssetAsset(models.Model):
             return depreciation_ids.create_grouped_move()
         return depreciation_ids.create_move()
 
-    @api.model
-    def create(self, vals):
-        """Create a new asset record using the provided values and compute its depreciation schedule."""
-        asset = super(AccountAssetAsset,
-                      self.with_context(mail_create_nolog=True)).create(vals)
-        asset.sudo().compute_depreciation_board()
-        return asset
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Create new asset records using the provided values and compute
+        their depreciation schedules together."""
+        assets = super(AccountAssetAsset,
+                       self.with_context(mail_create_nolog=True)).create(
+            vals_list)
+        assets.sudo().compute_depreciation_board()
+        return assets
 
     def write(self, vals):
         """Updates the records with the provided values and computes the depreciation board if necessary."""
         res = super(AccountAssetAsset, self).write(vals)
         if 'depreciation_line_ids' not in vals and 'state' not in vals:
-            for rec in self:
-                rec.compute_depreciation_board()
+            self.compute_depreciation_board()
+        if any(field_name in vals for field_name in ASSET_REPORT_FIELDS):
+            self.env['asset.asset.report']._mark_assets_to_refresh(self.ids)
         return res
 
     def open_entries(self):
@@ -21,7 +21,10 @@
 #############################################################################
 from odoo import api, fields, models, _
 from odoo.exceptions import UserError
-from odoo.tools import float_compare
+from odoo.tools import float_compare, split_every
+
+# default number of depreciation entries created and posted together
+DEPRECIATION_BATCH_SIZE = 500
 
 
 class AccountAssetDepreciationLine(models.Model):
@@ -62,84 +65,80 @@ class AccountAssetDepreciationLine(models.Model):
         for line in self:
             line.move_posted_check = True if line.move_id and line.move_id.state == 'posted' else False
 
+    @api.model
+    def _get_depreciation_batch_size(self):
+        """Return the number of depreciation entries created and posted
+        together, set by the base_accounting_kit.depreciation_batch_size
+        system parameter."""
+        return int(self.env['ir.config_parameter'].sudo().get_param(
+            'base_accounting_kit.depreciation_batch_size',
+            DEPRECIATION_BATCH_SIZE))
+
+    @api.model
+    def _commit_depreciation_batch(self):
+        """Commit the entries generated so far when running with the
+        asset_batch_commit context key, so that an interrupted run resumes
+        from the lines still without entry."""
+        if self.env.context.get('asset_batch_commit'):
+            self.env.cr.commit()
+
+    def _prepare_move(self, line, prec):
+        """Return the values of the depreciation entry of line."""
+        category_id = line.asset_id.category_id
+        depreciation_date = self.env.context.get(
+            'depreciation_date') or line.depreciation_date or fields.Date.context_today(
+            self)
+        company_currency = line.asset_id.company_id.currency_id
+        current_currency = line.asset_id.currency_id
+        amount = current_currency._convert(line.amount, company_currency,
+                                           line.asset_id.company_id,
+                                           depreciation_date)
+        asset_name = line.asset_id.name + ' (%s/%s)' % (
+            line.sequence, len(line.asset_id.depreciation_line_ids))
+        partner = self.env['res.partner']._find_accounting_partner(
+            line.asset_id.partner_id)
+        is_positive = float_compare(amount, 0.0, precision_digits=prec) > 0
+        move_line_1 = {
+            'name': asset_name,
+            'account_id': category_id.account_depreciation_id.id,
+            'debit': 0.0 if is_positive else -amount,
+            'credit': amount if is_positive else 0.0,
+            'partner_id': partner.id,
+        }
+        move_line_2 = {
+            'name': asset_name,
+            'account_id': category_id.account_depreciation_expense_id.id,
+            'credit': 0.0 if is_positive else -amount,
+            'debit': amount if is_positive else 0.0,
+            'partner_id': partner.id,
+        }
+        return {
+            'ref': line.asset_id.code,
+            'date': depreciation_date or False,
+            'journal_id': category_id.journal_id.id,
+            'line_ids': [(0, 0, move_line_1), (0, 0, move_line_2)],
+            'asset_depreciation_ids': [(4, line.id)],
+        }
+
     def create_move(self, post_move=True):
-        """Create accounting moves for asset depreciation lines."""
+        """Create accounting moves for asset depreciation lines.
+        The moves are created and posted by batches of
+        _get_depreciation_batch_size() lines."""
         created_moves = self.env['account.move']
         prec = self.env['decimal.precision'].precision_get('Account')
         if self.mapped('move_id'):
             raise UserError(_(
                 'This depreciation is already linked to a journal entry! Please post or delete it.'))
-        for line in self:
-            category_id = line.asset_id.category_id
-            depreciation_date = self.env.context.get(
-                'depreciation_date') or line.depreciation_date or fields.Date.context_today(
-                self)
-            company_currency = line.asset_id.company_id.currency_id
-            current_currency = line.asset_id.currency_id
-            amount = current_currency._convert(line.amount, company_currency,
-                                      line.asset_id.company_id,
-                                      depreciation_date)
-            asset_name = line.asset_id.name + ' (%s/%s)' % (line.sequence, len(line.asset_id.depreciation_line_ids))
-            partner = self.env['res.partner']._find_accounting_partner(line.asset_id.partner_id)
-            move_line_1 = {
-                'name': asset_name,
-                'account_id': category_id.account_depreciation_id.id,
-                'debit': 0.0 if float_compare(amount, 0.0,
-                                              precision_digits=prec) > 0 else -amount,
-                'credit': amount if float_compare(amount, 0.0,
-                                                  precision_digits=prec) > 0 else 0.0,
-                'journal_id': category_id.journal_id.id,
-                'partner_id': partner.id,
-                'currency_id': company_currency != current_currency and current_currency.id or company_currency.id,
-                'amount_currency': company_currency != current_currency and - 1.0 * line.amount or 0.0,
-            }
-            move_line_2 = {
-                'name': asset_name,
-                'account_id': category_id.account_depreciation_expense_id.id,
-                'credit': 0.0 if float_compare(amount, 0.0,
-                                               precision_digits=prec) > 0 else -amount,
-                'debit': amount if float_compare(amount, 0.0,
-                                                 precision_digits=prec) > 0 else 0.0,
-                'journal_id': category_id.journal_id.id,
-                'partner_id': partner.id,
-                'currency_id': company_currency != current_currency and current_currency.id or company_currency.id,
-                'amount_currency': company_currency != current_currency and line.amount or 0.0,
-            }
-            line_ids = [(0, 0, {
-                'account_id': category_id.account_depreciation_id.id,
-                'partner_id': partner.id,
-                'credit': amount if float_compare(amount, 0.0,
-                                                  precision_digits=prec) > 0 else 0.0,
-            }), (0, 0, {
-                'account_id': category_id.account_depreciation_expense_id.id,
-                'partner_id': partner.id,
-                'debit': amount if float_compare(amount, 0.0,
-                                                 precision_digits=prec) > 0 else 0.0,
-            })]
-            move = self.env['account.move'].create({
-                'ref': line.asset_id.code,
-                'date': depreciation_date or False,
-                'journal_id': category_id.journal_id.id,
-                'line_ids': line_ids,
-            })
-            for move_line in move.line_ids:
-                if move_line.account_id.id == move_line_1['account_id']:
-                    move_line.write({'credit': move_line_1['credit'],
-                                     'debit': move_line_1['debit']})
-                elif move_line.account_id.id == move_line_2['account_id']:
-                    move_line.write({'debit': move_line_2['debit'],
-                                     'credit': move_line_2['credit']})
-            if move.line_ids.filtered(
-                    lambda x: x.name == 'Automatic Balancing Line'):
-                move.line_ids.filtered(
-                    lambda x: x.name == 'Automatic Balancing Line').unlink()
-            line.write({'move_id': move.id, 'move_check': True})
-            created_moves |= move
-
-        if post_move and created_moves:
-            created_moves.filtered(lambda m: any(
-                m.asset_depreciation_ids.mapped(
-                    'asset_id.category_id.open_asset'))).post()
+        for lines in split_every(self._get_depreciation_batch_size(),
+                                 self.ids, self.browse):
+            moves = self.env['account.move'].create(
+                [self._prepare_move(line, prec) for line in lines])
+            created_moves |= moves
+            if post_move:
+                moves.filtered(lambda m: any(
+                    m.asset_depreciation_ids.mapped(
+                        'asset_id.category_id.open_asset'))).post()
+            self._commit_depreciation_batch()
         return [x.id for x in created_moves]
 
     def create_grouped_move(self, post_move=True):
@@ -235,8 +234,27 @@ class AccountAssetDepreciationLine(models.Model):
             for msg in messages:
                 asset.message_post(body=msg)
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Mark the rows of the assets of the new lines in the asset analysis
+        report as out of date."""
+        lines = super(AccountAssetDepreciationLine, self).create(vals_list)
+        self.env['asset.asset.report']._mark_assets_to_refresh(
+            lines.asset_id.ids)
+        return lines
+
+    def write(self, vals):
+        """Mark the rows of the assets of the lines in the asset analysis
+        report as out of date."""
+        res = super(AccountAssetDepreciationLine, self).write(vals)
+        self.env['asset.asset.report']._mark_assets_to_refresh(
+            self.asset_id.ids)
+        return res
+
     def unlink(self):
         """Check if the depreciation line is linked to a posted move before deletion."""
+        self.env['asset.asset.report']._mark_assets_to_refresh(
+            self.asset_id.ids)
         for record in self:
             if record.move_check:
                 if record.asset_id.category_id.type == 'purchase':
@@ -32,7 +32,8 @@ class AccountMove(models.Model):
     is_warning = fields.Boolean(string='Is warning')
     due_amount = fields.Float(string="Due Amount",
                               related='partner_id.due_amount')
-    recurring_ref = fields.Char(string='Recurring Ref')
+    recurring_ref = fields.Char(string='Recurring Ref',
+                                index='btree_not_null')
     asset_depreciation_ids = fields.One2many('account.asset.depreciation.line',
                                              'move_id',
                                              string='Assets Depreciation Lines')
@@ -49,6 +50,24 @@ class AccountMove(models.Model):
                 line.move_posted_check = False
         return super(AccountMove, self).button_cancel()
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Mark the assets of the depreciation lines linked to the new moves
+        as out of date in the asset analysis report, the lines are not
+        written one by one."""
+        moves = super(AccountMove, self).create(vals_list)
+        self.env['asset.asset.report']._mark_assets_to_refresh(
+            moves.asset_depreciation_ids.asset_id.ids)
+        return moves
+
+    def unlink(self):
+        """Mark the assets of the depreciation lines of the moves as out of
+        date in the asset analysis report, the lines are unlinked from the
+        moves in SQL."""
+        self.env['asset.asset.report']._mark_assets_to_refresh(
+            self.asset_depreciation_ids.asset_id.ids)
+        return super(AccountMove, self).unlink()
+
     def post(self):
         """Supering the post method to mapped the asset depreciation records"""
         self.mapped('asset_depreciation_ids').post_lines_and_close_asset()
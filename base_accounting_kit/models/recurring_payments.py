@@ -19,9 +19,14 @@
 #    If not, see <http://www.gnu.org/licenses/>.
 #
 #############################################################################
-from datetime import datetime, date
+from collections import defaultdict
+from datetime import date
 from dateutil.relativedelta import relativedelta
 from odoo import api, models, fields
+from odoo.tools import split_every
+
+# number of recurring entries created together
+RECURRING_BATCH_SIZE = 500
 
 
 class RecurringPayments(models.Model):
@@ -31,21 +36,12 @@ class RecurringPayments(models.Model):
 
     def _get_next_schedule(self):
         """Function for adding the schedule process"""
-        if self.date:
-            recurr_dates = []
-            today = datetime.today()
-            start_date = datetime.strptime(str(self.date), '%Y-%m-%d')
-            while start_date <= today:
-                recurr_dates.append(str(start_date.date()))
-                if self.recurring_period == 'days':
-                    start_date += relativedelta(days=self.recurring_interval)
-                elif self.recurring_period == 'weeks':
-                    start_date += relativedelta(weeks=self.recurring_interval)
-                elif self.recurring_period == 'months':
-                    start_date += relativedelta(months=self.recurring_interval)
-                else:
-                    start_date += relativedelta(years=self.recurring_interval)
-            self.next_date = start_date.date()
+        today = fields.Date.today()
+        for rec in self:
+            next_date = rec.next_run_date or rec.date
+            while next_date and next_date <= today:
+                next_date = rec._get_next_occurrence(next_date)
+            rec.next_date = next_date
 
     name = fields.Char(string='Name')
     debit_account = fields.Many2one('account.account', 'Debit Account',
@@ -58,6 +54,12 @@ class RecurringPayments(models.Model):
     date = fields.Date('Starting Date', required=True, default=date.today())
     next_date = fields.Date('Next Schedule', compute=_get_next_schedule,
                             readonly=True, copy=False)
+    next_run_date = fields.Date('Next Entry Date',
+                                compute='_compute_next_run_date', store=True,
+                                index=True, copy=False,
+                                help="Date of the first entry not generated "
+                                     "yet, the scheduler only generates the "
+                                     "entries from this date.")
     recurring_period = fields.Selection(selection=[('days', 'Days'),
                                                    ('weeks', 'Weeks'),
                                                    ('months', 'Months'),
@@ -87,50 +89,64 @@ class RecurringPayments(models.Model):
         if self.partner_id.property_account_receivable_id:
             self.credit_account = self.partner_id.property_account_payable_id
 
+    @api.depends('date', 'recurring_period', 'recurring_interval')
+    def _compute_next_run_date(self):
+        """Restart the schedule from the starting date when it changes, the
+        entries already generated are skipped by their recurring reference."""
+        for rec in self:
+            rec.next_run_date = rec.date
+
+    def _get_next_occurrence(self, occurrence):
+        """Return the date of the entry following the one of occurrence."""
+        self.ensure_one()
+        if self.recurring_period == 'days':
+            return occurrence + relativedelta(days=self.recurring_interval)
+        if self.recurring_period == 'weeks':
+            return occurrence + relativedelta(weeks=self.recurring_interval)
+        if self.recurring_period == 'months':
+            return occurrence + relativedelta(months=self.recurring_interval)
+        return occurrence + relativedelta(years=self.recurring_interval)
+
     @api.model
     def _cron_generate_entries(self):
         """Generate recurring entries based on the defined schedule
         and create corresponding accounting moves."""
+        today = fields.Date.today()
         data = self.env['account.recurring.payments'].search(
-            [('state', '=', 'running')])
-        entries = self.env['account.move'].search(
-            [('recurring_ref', '!=', False)])
-        journal_dates = []
-        journal_codes = []
-        remaining_dates = []
-        for entry in entries:
-            journal_dates.append(str(entry.date))
-            if entry.recurring_ref:
-                journal_codes.append(str(entry.recurring_ref))
-        today = datetime.today()
+            [('state', '=', 'running'), ('next_run_date', '<=', today)])
+        due_occurrences = []
+        next_run_dates = defaultdict(list)
         for line in data:
-            if line.date:
-                recurr_dates = []
-                start_date = datetime.strptime(str(line.date), '%Y-%m-%d')
-                while start_date <= today:
-                    recurr_dates.append(str(start_date.date()))
-                    if line.recurring_period == 'days':
-                        start_date += relativedelta(
-                            days=line.recurring_interval)
-                    elif line.recurring_period == 'weeks':
-                        start_date += relativedelta(
-                            weeks=line.recurring_interval)
-                    elif line.recurring_period == 'months':
-                        start_date += relativedelta(
-                            months=line.recurring_interval)
-                    else:
-                        start_date += relativedelta(
-                            years=line.recurring_interval)
-                for rec in recurr_dates:
-                    recurr_code = str(line.id) + '/' + str(rec)
-                    if recurr_code not in journal_codes:
-                        remaining_dates.append({
-                            'date': rec,
-                            'template_name': line.name,
-                            'amount': line.amount,
-                            'tmpl_id': line.id,
-                        })
-        child_ids = self.recurring_lines.create(remaining_dates)
+            occurrence = line.next_run_date
+            while occurrence <= today:
+                due_occurrences.append((line, occurrence))
+                occurrence = line._get_next_occurrence(occurrence)
+            next_run_dates[occurrence].append(line.id)
+        if not due_occurrences:
+            return
+        # only the references of the due occurrences are looked up, in a set
+        journal_codes = set(self.env['account.move'].search_fetch(
+            [('recurring_ref', 'in', [
+                '%s/%s' % (line.id, occurrence)
+                for line, occurrence in due_occurrences])],
+            ['recurring_ref']).mapped('recurring_ref'))
+        remaining_dates = [{
+            'date': occurrence,
+            'template_name': line.name,
+            'amount': line.amount,
+            'tmpl_id': line.id,
+        } for line, occurrence in due_occurrences
+            if '%s/%s' % (line.id, occurrence) not in journal_codes]
+        for lines in split_every(RECURRING_BATCH_SIZE, remaining_dates,
+                                 list):
+            self._create_recurring_moves(self.recurring_lines.create(lines))
+        for next_run_date, template_ids in next_run_dates.items():
+            self.browse(template_ids).write({'next_run_date': next_run_date})
+
+    def _create_recurring_moves(self, child_ids):
+        """Create the moves of the recurring entries lines at once and post
+        the ones of the templates generating posted entries."""
+        vals_list = []
         for line in child_ids:
             tmpl_id = line.tmpl_id
             recurr_code = str(tmpl_id.id) + '/' + str(line.date)
@@ -145,7 +161,7 @@ class RecurringPayments(models.Model):
                 'debit': line.amount,
                 # 'analytic_account_id': tmpl_id.analytic_account_id.id,
             })]
-            vals = {
+            vals_list.append({
                 'date': line.date,
                 'recurring_ref': recurr_code,
                 'company_id': self.env.company.id,
@@ -153,7 +169,10 @@ class RecurringPayments(models.Model):
                 'ref': line.template_name,
                 'narration': 'Recurring entry',
                 'line_ids': line_ids
-            }
-            move_id = self.env['account.move'].create(vals)
-            if tmpl_id.journal_state == 'posted':
-                move_id.post()
+            })
+        moves = self.env['account.move'].create(vals_list)
+        moves_to_post = moves.browse([
+            move.id for move, line in zip(moves, child_ids)
+            if line.tmpl_id.journal_state == 'posted'])
+        if moves_to_post:
+            moves_to_post.post()
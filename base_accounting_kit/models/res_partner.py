@@ -19,6 +19,7 @@
 #    If not, see <http://www.gnu.org/licenses/>.
 #
 #############################################################################
+from collections import defaultdict
 from datetime import date, timedelta
 from odoo import api, fields, models, _
 from odoo.exceptions import UserError
@@ -67,28 +68,35 @@ class ResPartner(models.Model):
     def _compute_for_followup(self):
         """
         Compute the fields 'total_due', 'total_overdue' , 'next_reminder_date' and 'followup_status'
+        The open invoices of the whole batch are summed with grouped reads
+        and the follow-up delay is looked up once, instead of per partner.
         """
+        today = fields.Date.today()
+        invoice_domain = [('partner_id', 'in', self.ids),
+                          ('payment_state', '=', 'not_paid'),
+                          ('move_type', '=', 'out_invoice')]
+        min_dates = {
+            partner.id: min_date for partner, min_date in
+            self.env['account.move']._read_group(
+                invoice_domain, ['partner_id'], ['invoice_date_due:min'])}
+        amounts = defaultdict(lambda: [0.0, 0.0])
+        for partner, date_due, move_date, amount in self.env[
+                'account.move']._read_group(
+                invoice_domain + [('company_id', '=', self.env.company.id)],
+                ['partner_id', 'invoice_date_due:day', 'date:day'],
+                ['amount_residual:sum']):
+            amounts[partner.id][0] += amount
+            is_overdue = today > date_due if date_due else today > move_date
+            if is_overdue:
+                amounts[partner.id][1] += amount or 0
+        action = self.action_after() or 0
         for record in self:
-            total_due = 0
-            total_overdue = 0
-            today = fields.Date.today()
-            for am in record.invoice_list:
-                if am.company_id == self.env.company:
-                    amount = am.amount_residual
-                    total_due += amount
-
-                    is_overdue = today > am.invoice_date_due if am.invoice_date_due else today > am.date
-                    if is_overdue:
-                        total_overdue += amount or 0
-            min_date = record.get_min_date()
-            action = record.action_after()
-            if min_date:
-                date_reminder = min_date + timedelta(days=action)
-                if date_reminder:
-                    record.next_reminder_date = date_reminder
-            else:
-                date_reminder = today
-                record.next_reminder_date = date_reminder
+            total_due, total_overdue = amounts[record.id]
+            min_date = min_dates.get(record.id)
+            # the partners without due date are reminded today, with no delay
+            date_reminder = min_date + timedelta(
+                days=action) if min_date else today
+            record.next_reminder_date = date_reminder
             if total_overdue > 0 and date_reminder > today:
                 followup_status = "with_overdue_invoices"
             elif total_due > 0 and date_reminder <= today:
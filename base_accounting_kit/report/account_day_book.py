@@ -20,22 +20,24 @@
 #
 #############################################################################
 import time
-from datetime import timedelta, datetime
+from datetime import datetime
+from itertools import groupby
+from operator import itemgetter
 from odoo import api, models, _
 from odoo.exceptions import UserError
 
+DAY_BOOK_FETCH_SIZE = 1000
+
 
 class DayBookPdfReport(models.AbstractModel):
     _name = 'report.base_accounting_kit.day_book_report_template'
     _description = 'Day Book Report'
 
-    def _get_account_move_entry(self, accounts, form_data, pass_date):
+    def _get_account_move_entries(self, accounts, form_data, date_from,
+                                  date_to):
+        # All the lines of the period are read by one query ordered by date,
+        # and grouped into days while the cursor is consumed.
         cr = self.env.cr
-        move_line = self.env['account.move.line']
-        tables, where_clause, where_params = move_line._query_get()
-        wheres = [""]
-        if where_clause.strip():
-            wheres.append(where_clause.strip())
         if form_data['target_move'] == 'posted':
             target_move = "AND m.state = 'posted'"
         else:
@@ -45,8 +47,7 @@ class DayBookPdfReport(models.AbstractModel):
                 account_id, l.date AS ldate, j.code AS lcode, l.currency_id, 
                 l.amount_currency, l.ref AS lref, l.name AS lname,
                  COALESCE(l.debit,0) AS debit, COALESCE(l.credit,0) AS credit, 
-                COALESCE(SUM(l.debit),0) - COALESCE(SUM(l.credit), 0) AS 
-                balance,
+                COALESCE(l.debit,0) - COALESCE(l.credit, 0) AS balance,
                 m.name AS move_name, c.symbol AS currency_code, p.name 
                 AS partner_name
                 FROM account_move_line l
@@ -56,27 +57,28 @@ class DayBookPdfReport(models.AbstractModel):
                 JOIN account_journal j ON (l.journal_id=j.id)
                 JOIN account_account acc ON (l.account_id = acc.id) 
                 WHERE l.account_id IN %s AND l.journal_id IN %s '''
-               + target_move + ''' AND l.date = %s
-                GROUP BY l.id, l.account_id, l.date,
-                     j.code, l.currency_id, l.amount_currency, l.ref, 
-                     l.name, m.name, c.symbol, p.name , acc.name
-                     ORDER BY l.date DESC
+               + target_move + ''' AND l.date BETWEEN %s AND %s
+                     ORDER BY l.date, l.id
         ''')
-        params = (
-        tuple(accounts.ids), tuple(form_data['journal_ids']), pass_date)
+        params = (tuple(accounts.ids), tuple(form_data['journal_ids']),
+                  date_from, date_to)
         cr.execute(sql, params)
-        data = cr.dictfetchall()
-        res = {}
-        debit = credit = balance = 0.00
-        for line in data:
-            debit += line['debit']
-            credit += line['credit']
-            balance += line['balance']
-        res['debit'] = debit
-        res['credit'] = credit
-        res['balance'] = balance
-        res['lines'] = data
-        return res
+        for date, lines in groupby(self._fetch_lines(cr),
+                                   key=itemgetter('ldate')):
+            res = {'date': date, 'debit': 0.0, 'credit': 0.0,
+                   'balance': 0.0, 'lines': []}
+            for line in lines:
+                res['debit'] += line['debit']
+                res['credit'] += line['credit']
+                res['balance'] += line['balance']
+                res['lines'].append(line)
+            yield res
+
+    def _fetch_lines(self, cr):
+        rows = cr.dictfetchmany(DAY_BOOK_FETCH_SIZE)
+        while rows:
+            yield from rows
+            rows = cr.dictfetchmany(DAY_BOOK_FETCH_SIZE)
 
     @api.model
     def _get_report_values(self, docids, data=None):
@@ -101,24 +103,17 @@ class DayBookPdfReport(models.AbstractModel):
         date_start = datetime.strptime(form_data['date_from'],
                                        '%Y-%m-%d').date()
         date_end = datetime.strptime(form_data['date_to'], '%Y-%m-%d').date()
-        days = date_end - date_start
-        dates = []
         record = []
-        for i in range(days.days + 1):
-            dates.append(date_start + timedelta(days=i))
-        for head in dates:
-            pass_date = str(head)
-            accounts_res = self.with_context(
-                data['form'].get('used_context', {}))._get_account_move_entry(
-                accounts, form_data, pass_date)
-            if accounts_res['lines']:
-                record.append({
-                    'date': head,
-                    'debit': accounts_res['debit'],
-                    'credit': accounts_res['credit'],
-                    'balance': accounts_res['balance'],
-                    'child_lines': accounts_res['lines']
-                })
+        day_book = self.with_context(data['form'].get('used_context', {}))
+        for accounts_res in day_book._get_account_move_entries(
+                accounts, form_data, date_start, date_end):
+            record.append({
+                'date': accounts_res['date'],
+                'debit': accounts_res['debit'],
+                'credit': accounts_res['credit'],
+                'balance': accounts_res['balance'],
+                'child_lines': accounts_res['lines']
+            })
         return {
             'doc_ids': docids,
             'doc_model': model,
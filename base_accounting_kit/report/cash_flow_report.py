@@ -58,60 +58,68 @@ class ReportFinancial(models.AbstractModel):
                 res[row['id']] = row
         return res
 
+    def _get_report_accounts(self, report):
+        if report.type == 'account_type':
+            # it's the leaf accounts with such an account type
+            return self.env['account.account'].search(
+                [('account_type', 'in', report.account_type_ids)])
+        if report.type == 'sum' or (report.type == 'account_report' and
+                                    report.account_report_id):
+            # it's the linked accounts
+            return report.account_ids
+        return self.env['account.account']
+
     def _compute_report_balance(self, reports):
-        res = {}
+        # The balances of the accounts used anywhere in the tree are fetched
+        # with one query, then each report is evaluated once and memoized.
         fields = ['credit', 'debit', 'balance']
-        for report in reports:
-            if report.id in res:
-                continue
-            res[report.id] = dict((fn, 0.0) for fn in fields)
+        nodes = self.env['account.financial.report']
+        todo = reports
+        while todo:
+            nodes |= todo
+            todo = todo.filtered(
+                lambda r: r.type == 'accounts').parent_id - nodes
+
+        report_accounts = {}
+        for node in nodes:
+            report_accounts[node.id] = self._get_report_accounts(node)
+        account_balances = self._compute_account_balance(
+            self.env['account.account'].union(*report_accounts.values()))
+        cash_in = (
+            self.env.ref('base_accounting_kit.cash_in_from_operation0') |
+            self.env.ref('base_accounting_kit.cash_in_financial0') |
+            self.env.ref('base_accounting_kit.cash_in_investing0'))
+        cash_out = (
+            self.env.ref('base_accounting_kit.cash_out_operation1') |
+            self.env.ref('base_accounting_kit.cash_out_financial1') |
+            self.env.ref('base_accounting_kit.cash_out_investing1'))
+
+        memo = {}
+
+        def evaluate(report):
+            if report.id in memo:
+                return memo[report.id]
+            value = memo[report.id] = dict((fn, 0.0) for fn in fields)
             if report.type == 'accounts':
                 # it's the sum of credit or debit
-                res2 = self._compute_report_balance(report.parent_id)
-                for key, value in res2.items():
-                    cash_in_operation = self.env.ref(
-                        'base_accounting_kit.cash_in_from_operation0')
-                    cash_out_operation = self.env.ref(
-                        'base_accounting_kit.cash_out_operation1')
-                    cash_in_financial = self.env.ref(
-                        'base_accounting_kit.cash_in_financial0')
-                    cash_out_financial = self.env.ref(
-                        'base_accounting_kit.cash_out_financial1')
-                    cash_in_investing = self.env.ref(
-                        'base_accounting_kit.cash_in_investing0')
-                    cash_out_investing = self.env.ref(
-                        'base_accounting_kit.cash_out_investing1')
-                    if report == cash_in_operation or report == cash_in_financial or report == cash_in_investing:
-                        res[report.id]['debit'] += value['debit']
-                        res[report.id]['balance'] += value['debit']
-                    elif report == cash_out_operation or report == cash_out_financial or report == cash_out_investing:
-                        res[report.id]['credit'] += value['credit']
-                        res[report.id]['balance'] += -(value['credit'])
-            elif report.type == 'account_type':
-                # it's the sum the leaf accounts with such an account type
-                accounts = self.env['account.account'].search(
-                    [('account_type', 'in', report.account_type_ids)])
-                res[report.id]['account'] = self._compute_account_balance(
-                    accounts)
-                for value in res[report.id]['account'].values():
-                    for field in fields:
-                        res[report.id][field] += value.get(field)
-            elif report.type == 'account_report' and report.account_report_id:
-                # it's the amount of the linked
-                res[report.id]['account'] = self._compute_account_balance(
-                    report.account_ids)
-                for value in res[report.id]['account'].values():
+                if report.parent_id:
+                    parent_value = evaluate(report.parent_id)
+                    if report in cash_in:
+                        value['debit'] += parent_value['debit']
+                        value['balance'] += parent_value['debit']
+                    elif report in cash_out:
+                        value['credit'] += parent_value['credit']
+                        value['balance'] += -(parent_value['credit'])
+            elif report_accounts[report.id]:
+                value['account'] = dict(
+                    (account.id, account_balances[account.id])
+                    for account in report_accounts[report.id])
+                for account_value in value['account'].values():
                     for field in fields:
-                        res[report.id][field] += value.get(field)
+                        value[field] += account_value.get(field)
+            return value
 
-            elif report.type == 'sum':
-                # it's the sum of the linked accounts
-                res[report.id]['account'] = self._compute_account_balance(
-                    report.account_ids)
-                for values in res[report.id]['account'].values():
-                    for field in fields:
-                        res[report.id][field] += values.get(field)
-        return res
+        return dict((report.id, evaluate(report)) for report in reports)
 
     def get_account_lines(self, data):
         lines = []
@@ -20,6 +20,7 @@
 #
 #############################################################################
 import time
+from bisect import bisect_right
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
 from odoo import api, models, _
@@ -71,148 +72,90 @@ class ReportAgedPartnerBalance(models.AbstractModel):
         move_state = ['draft', 'posted']
         if target_move == 'posted':
             move_state = ['posted']
-        arg_list = (tuple(move_state), tuple(account_type))
-        # build the reconciliation clause to see what partner needs to be printed
-        reconciliation_clause = '(l.reconciled IS FALSE)'
-        cr.execute(
-            'SELECT debit_move_id, credit_move_id FROM account_partial_reconcile where max_date > %s',
-            (date_from,))
-        reconciled_after_date = []
-
-        for row in cr.fetchall():
-            reconciled_after_date += [row[0], row[1]]
-
-        if reconciled_after_date:
-            reconciliation_clause = '(l.reconciled IS FALSE OR l.id IN %s)'
-            arg_list += (tuple(reconciled_after_date),)
-        arg_list += (date_from, tuple(company_ids))
+        params = {
+            'move_state': tuple(move_state),
+            'account_type': tuple(account_type),
+            'date_from': date_from,
+            'company_ids': tuple(company_ids),
+        }
+        # Residual of every line still open at date_from: the balance plus the
+        # partials matched up to that date (matched_debit_ids add,
+        # matched_credit_ids subtract). Lines only reconciled after date_from
+        # are kept through the same lateral join, so the partials never have
+        # to be loaded in Python.
         query = '''
-            SELECT DISTINCT l.partner_id, UPPER(res_partner.name)
-            FROM account_move_line AS l left join res_partner on l.partner_id = res_partner.id, account_account, account_move am
-            WHERE (l.account_id = account_account.id)
-                AND (l.move_id = am.id)
-                AND (am.state IN %s)
-                AND (account_account.account_type IN %s)
-                AND ''' + reconciliation_clause + '''
-                AND (l.date <= %s)
-                AND l.company_id IN %s
-            ORDER BY UPPER(res_partner.name)'''
-        cr.execute(query, arg_list)
-
-        partners = cr.dictfetchall()
+            SELECT l.id, l.partner_id, company.currency_id,
+                COALESCE(l.date_maturity, l.date) AS date_due,
+                l.balance + COALESCE(partial.amount, 0) AS residual
+            FROM account_move_line AS l
+            JOIN account_move am ON (l.move_id = am.id)
+            JOIN account_account ON (l.account_id = account_account.id)
+            JOIN res_company company ON (l.company_id = company.id)
+            LEFT JOIN res_partner ON (l.partner_id = res_partner.id)
+            LEFT JOIN LATERAL (
+                SELECT SUM(CASE WHEN apr.max_date > %(date_from)s THEN 0
+                                WHEN apr.credit_move_id = l.id THEN apr.amount
+                                ELSE -apr.amount END) AS amount,
+                       BOOL_OR(apr.max_date > %(date_from)s) AS reconciled_after_date
+                FROM account_partial_reconcile apr
+                WHERE apr.debit_move_id = l.id OR apr.credit_move_id = l.id
+            ) partial ON TRUE
+            WHERE (am.state IN %(move_state)s)
+                AND (account_account.account_type IN %(account_type)s)
+                AND (l.reconciled IS FALSE OR partial.reconciled_after_date)
+                AND (l.date <= %(date_from)s)
+                AND l.company_id IN %(company_ids)s
+            ORDER BY UPPER(res_partner.name), l.partner_id, l.id'''
+        cr.execute(query, params)
+        rows = cr.dictfetchall()
+        partners = []
+        for row in rows:
+            if not partners or partners[-1]['partner_id'] != row['partner_id']:
+                partners.append({'partner_id': row['partner_id']})
         # put a total of 0
         for i in range(7):
             total.append(0)
 
-        # Build a string like (1,2,3) for easy use in SQL query
-        partner_ids = [partner['partner_id'] for partner in partners if
-                       partner['partner_id']]
+        if not any(partner['partner_id'] for partner in partners):
+            return [], [], {}
         lines = dict(
             (partner['partner_id'] or False, []) for partner in partners)
-        if not partner_ids:
-            return [], [], {}
 
-        # This dictionary will store the not due amount of all partners
+        # One conversion rate per company currency rather than a conversion
+        # per line and per partial.
+        rates = dict(
+            (currency_id, ResCurrency._get_conversion_rate(
+                ResCurrency.browse(currency_id), user_currency,
+                user_company, date_from))
+            for currency_id in set(row['currency_id'] for row in rows))
+        period_starts = [
+            datetime.strptime(periods[str(i)]['start'], "%Y-%m-%d").date()
+            for i in range(1, 5)]
+        # This dictionary will store the not due amount of all partners and
+        # history the amount per period: history[1] = {'<partner_id>': <partner_debit-credit>}
         undue_amounts = {}
-        query = '''SELECT l.id
-                FROM account_move_line AS l, account_account, account_move am
-                WHERE (l.account_id = account_account.id) AND (l.move_id = am.id)
-                    AND (am.state IN %s)
-                    AND (account_account.account_type IN %s)
-                    AND (COALESCE(l.date_maturity,l.date) >= %s)\
-                    AND ((l.partner_id IN %s) OR (l.partner_id IS NULL))
-                AND (l.date <= %s)
-                AND l.company_id IN %s'''
-        cr.execute(query, (
-            tuple(move_state), tuple(account_type), date_from,
-            tuple(partner_ids), date_from, tuple(company_ids)))
-        aml_ids = cr.fetchall()
-        aml_ids = aml_ids and [x[0] for x in aml_ids] or []
-        for line in self.env['account.move.line'].browse(aml_ids):
-            partner_id = line.partner_id.id or False
-            if partner_id not in undue_amounts:
-                undue_amounts[partner_id] = 0.0
-            line_amount = ResCurrency._get_conversion_rate(line.company_id.currency_id,
-                                               user_currency, line.balance)
+        history = [{} for i in range(5)]
+        move_lines = self.env['account.move.line'].browse(
+            [row['id'] for row in rows])
+        for row, line in zip(rows, move_lines):
+            line_amount = user_currency.round(
+                row['residual'] * rates[row['currency_id']])
             if user_currency.is_zero(line_amount):
                 continue
-            for partial_line in line.matched_debit_ids:
-                if partial_line.max_date <= date_from:
-                    line_amount += ResCurrency._get_conversion_rate(
-                        partial_line.company_id.currency_id, user_currency,
-                        partial_line.amount)
-            for partial_line in line.matched_credit_ids:
-                if partial_line.max_date <= date_from:
-                    line_amount -= ResCurrency._get_conversion_rate(
-                        partial_line.company_id.currency_id, user_currency,
-                        partial_line.amount)
-            if not self.env.company.currency_id.is_zero(line_amount):
-                undue_amounts[partner_id] += line_amount
-                lines[partner_id].append({
-                    'line': line,
-                    'amount': line_amount,
-                    'period': 6,
-                })
-        # Use one query per period and store results in history (a list variable)
-        # Each history will contain: history[1] = {'<partner_id>': <partner_debit-credit>}
-        history = []
-        for i in range(5):
-            args_list = (
-            tuple(move_state), tuple(account_type), tuple(partner_ids),)
-            dates_query = '(COALESCE(l.date_maturity,l.date)'
-
-            if periods[str(i)]['start'] and periods[str(i)]['stop']:
-                dates_query += ' BETWEEN %s AND %s)'
-                args_list += (
-                periods[str(i)]['start'], periods[str(i)]['stop'])
-            elif periods[str(i)]['start']:
-                dates_query += ' >= %s)'
-                args_list += (periods[str(i)]['start'],)
+            partner_id = row['partner_id'] or False
+            if row['date_due'] >= date_from:
+                period = 6
+                partners_amount = undue_amounts
             else:
-                dates_query += ' <= %s)'
-                args_list += (periods[str(i)]['stop'],)
-            args_list += (date_from, tuple(company_ids))
-            query = '''SELECT l.id
-                    FROM account_move_line AS l, account_account, account_move am
-                    WHERE (l.account_id = account_account.id) AND (l.move_id = am.id)
-                        AND (am.state IN %s)
-                        AND (account_account.account_type IN %s)
-                        AND ((l.partner_id IN %s) OR (l.partner_id IS NULL))
-                        AND ''' + dates_query + '''
-                    AND (l.date <= %s)
-                    AND l.company_id IN %s'''
-            cr.execute(query, args_list)
-            partners_amount = {}
-            aml_ids = cr.fetchall()
-            aml_ids = aml_ids and [x[0] for x in aml_ids] or []
-            for line in self.env['account.move.line'].browse(aml_ids):
-                partner_id = line.partner_id.id or False
-                if partner_id not in partners_amount:
-                    partners_amount[partner_id] = 0.0
-                line_amount = ResCurrency._get_conversion_rate(line.company_id.currency_id,
-                                                   user_currency, line.balance)
-                if user_currency.is_zero(line_amount):
-                    continue
-                for partial_line in line.matched_debit_ids:
-                    if partial_line.max_date <= date_from:
-                        line_amount += ResCurrency._get_conversion_rate(
-                            partial_line.company_id.currency_id, user_currency,
-                            partial_line.amount)
-                for partial_line in line.matched_credit_ids:
-                    if partial_line.max_date <= date_from:
-                        line_amount -= ResCurrency._get_conversion_rate(
-                            partial_line.company_id.currency_id, user_currency,
-                            partial_line.amount)
-
-                if not self.env.company.currency_id.is_zero(
-                        line_amount):
-                    partners_amount[partner_id] += line_amount
-                    lines[partner_id].append({
-                        'line': line,
-                        'amount': line_amount,
-                        'period': i + 1,
-                    })
-            history.append(partners_amount)
+                period = bisect_right(period_starts, row['date_due']) + 1
+                partners_amount = history[period - 1]
+            partners_amount[partner_id] = partners_amount.get(
+                partner_id, 0.0) + line_amount
+            lines[partner_id].append({
+                'line': line,
+                'amount': line_amount,
+                'period': period,
+            })
         for partner in partners:
             if partner['partner_id'] is None:
                 partner['partner_id'] = False
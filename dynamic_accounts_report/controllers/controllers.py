@@ -29,7 +29,7 @@ class XLSXReportController(http.Controller):
     @http.route('/xlsx_report', type='http', auth='user', methods=['POST'],
                 csrf=False)
     def get_report_xlsx(self, model, data, output_format, report_name,
-                        report_action):
+                        report_action, options=None):
         """Generate an XLSX report based on the provided data and return it as
         a response.
             Args:
@@ -39,6 +39,10 @@ class XLSXReportController(http.Controller):
                 (e.g., 'xlsx').
                 report_name (str): The name to be given to the generated report
                 file.
+                options (str): The filter options of the report in JSON, when
+                given to a report supporting it, the data is queried again
+                from them and the file is streamed instead of being built
+                from the posted data.
             Returns:
                 Response: The generated report file as a response.
             Raises:
@@ -47,16 +51,21 @@ class XLSXReportController(http.Controller):
         uid = request.session.uid
         report_obj = request.env[model].with_user(uid)
         token = 'dummy-because-api-expects-one'
+        headers = [
+            ('Content-Type', 'application/vnd.ms-excel'),
+            ('Content-Disposition',
+             content_disposition(report_name + '.xlsx'))
+        ]
         try:
-            if output_format == 'xlsx':
+            if output_format == 'xlsx' and options and hasattr(
+                    report_obj, 'get_xlsx_stream'):
                 response = request.make_response(
-                    None,
-                    headers=[
-                        ('Content-Type', 'application/vnd.ms-excel'),
-                        ('Content-Disposition',
-                         content_disposition(report_name + '.xlsx'))
-                    ]
+                    report_obj.get_xlsx_stream(json.loads(options),
+                                               report_name, report_action),
+                    headers=headers
                 )
+            elif output_format == 'xlsx':
+                response = request.make_response(None, headers=headers)
                 report_obj.get_xlsx_report(data, response, report_name,
                                            report_action)
             response.set_cookie('fileToken', token)
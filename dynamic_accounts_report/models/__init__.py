@@ -19,6 +19,9 @@
 #    If not, see <http://www.gnu.org/licenses/>.
 #
 ################################################################################
+from . import dynamic_report_mixin
+from . import journal_book_mixin
+from . import ledger_changes
 from . import account_general_ledger
 from . import account_partner_ledger
 from . import account_trial_balance
@@ -22,20 +22,28 @@
 import io
 import json
 import calendar
+from collections import defaultdict
 from dateutil.relativedelta import relativedelta
 import xlsxwriter
 from odoo import api, fields, models
 from datetime import datetime
 from odoo.tools import date_utils
+from .dynamic_report_mixin import XLSX_PAGE_SIZE
+
+LEDGER_LINE_FIELDS = ['date', 'name', 'move_name', 'debit', 'credit',
+                      'partner_id', 'account_id', 'journal_id', 'move_id',
+                      'analytic_line_ids']
+LEDGER_PAGE_SIZE = 80
 
 
 class AccountGeneralLedger(models.TransientModel):
     """For creating General Ledger report"""
     _name = 'account.general.ledger'
+    _inherit = 'dynamic.report.mixin'
     _description = 'General Ledger Report'
 
     @api.model
-    def view_report(self, option, tag):
+    def view_report(self, option, tag, lazy=False):
         """
         Retrieve partner ledger report data based on options and tags.
 
@@ -45,42 +53,32 @@ class AccountGeneralLedger(models.TransientModel):
         :param tag: The tag to filter the report data.
         :type tag: str
 
+        :param lazy: Return only the account totals, the lines of each account
+        are then fetched page by page with get_account_lines.
+        :type lazy: bool
+
         :return: A dictionary containing the partner ledger report data.
         :rtype: dict
         """
+        return self._get_cached_values('_get_report_values', option, tag, lazy,
+                                       cache=lazy)
+
+    @api.model
+    def _get_report_values(self, option, tag, lazy=False):
+        """Compute the result of view_report, see there."""
         account_dict = {}
-        account_totals = {}
-        move_line_ids = self.env['account.move.line'].search(
-            [('parent_state', '=', 'posted')])
-        account_ids = move_line_ids.mapped('account_id')
         account_dict['journal_ids'] = self.env['account.journal'].search_read(
             [], ['name'])
         account_dict['analytic_ids'] = self.env[
             'account.analytic.account'].search_read(
             [], ['name'])
-        for account in account_ids:
-            move_line_id = move_line_ids.filtered(
-                lambda x: x.account_id == account)
-            move_line_list = []
-            for move_line in move_line_id:
-                move_line_data = move_line.read(
-                    ['date', 'name', 'move_name', 'debit', 'credit',
-                     'partner_id', 'account_id', 'journal_id', 'move_id',
-                     'analytic_line_ids'])
-                move_line_list.append(move_line_data)
-            account_dict[account.display_name] = move_line_list
-            currency_id = self.env.company.currency_id.symbol
-            account_totals[account.display_name] = {
-                'total_debit': round(sum(move_line_id.mapped('debit')), 2),
-                'total_credit': round(sum(move_line_id.mapped('credit')), 2),
-                'currency_id': currency_id,
-                'account_id': account.id}
-            account_dict['account_totals'] = account_totals
+        account_dict.update(
+            self._get_ledger_data([('parent_state', '=', 'posted')], lazy))
         return account_dict
 
     @api.model
     def get_filter_values(self, journal_id, date_range, options, analytic,
-                          method):
+                          method, lazy=False):
         """
         Retrieve filtered values for the partner ledger report.
 
@@ -99,12 +97,118 @@ class AccountGeneralLedger(models.TransientModel):
         :param analytic: The analytic IDs to filter the report data.
         :type analytic: list
 
+        :param lazy: Return only the account totals, the lines of each account
+        are then fetched page by page with get_account_lines.
+        :type lazy: bool
+
         :return: A dictionary containing the filtered values for the partner
         ledger report.
         :rtype: dict
         """
+        return self._get_cached_values('_get_filter_values', journal_id,
+                                       date_range, options, analytic, method,
+                                       lazy, cache=lazy)
+
+    @api.model
+    def _get_filter_values(self, journal_id, date_range, options, analytic,
+                           method, lazy=False):
+        """Compute the result of get_filter_values, see there."""
         account_dict = {}
-        account_totals = {}
+        domain = self._get_filter_domain(journal_id, date_range, options,
+                                         analytic, method)
+        account_dict['journal_ids'] = self.env['account.journal'].search_read(
+            [], ['name'])
+        account_dict['analytic_ids'] = self.env[
+            'account.analytic.account'].search_read(
+            [], ['name'])
+        account_dict.update(self._get_ledger_data(domain, lazy))
+        return account_dict
+
+    @api.model
+    def get_account_lines(self, account_id, journal_id, date_range, options,
+                          analytic, method, last_key=None,
+                          limit=LEDGER_PAGE_SIZE):
+        """
+        Retrieve one page of the move lines of an account, used to unfold an
+        account of a report loaded lazily.
+
+        Pages are ordered by date and id descending and paginated on that
+        key, so fetching a page does not depend on the number of lines before
+        it.
+
+        :param account_id: The ID of the account to unfold.
+        :type account_id: int
+
+        :param journal_id: The journal IDs to filter the report data.
+        :type journal_id: list
+
+        :param date_range: The date range option to filter the report data.
+        :type date_range: str or dict
+
+        :param options: The additional options to filter the report data.
+        :type options: dict
+
+        :param analytic: The analytic IDs to filter the report data.
+        :type analytic: list
+
+        :param method: Find the method
+        :type method: dict
+
+        :param last_key: The [date, id] key of the last line of the previous
+        page, None for the first page.
+        :type last_key: list
+
+        :param limit: The maximum number of lines of the page.
+        :type limit: int
+
+        :return: A dictionary with the 'lines' of the page and the
+        'next_key' to pass for the following page, False on the last page.
+        :rtype: dict
+        """
+        domain = self._get_filter_domain(journal_id, date_range, options,
+                                         analytic, method)
+        domain += [('account_id', '=', account_id)]
+        if last_key:
+            last_date, last_id = last_key
+            domain += ['|', ('date', '<', last_date),
+                       '&', ('date', '=', last_date), ('id', '<', last_id)]
+        move_lines = self.env['account.move.line'].search_read(
+            domain, LEDGER_LINE_FIELDS, order='date desc, id desc',
+            limit=limit + 1)
+        next_key = False
+        if len(move_lines) > limit:
+            move_lines = move_lines[:limit]
+            next_key = [fields.Date.to_string(move_lines[-1]['date']),
+                        move_lines[-1]['id']]
+        return {
+            'lines': [[move_line] for move_line in move_lines],
+            'next_key': next_key,
+        }
+
+    @api.model
+    def _get_filter_domain(self, journal_id, date_range, options, analytic,
+                           method):
+        """
+        Build the account.move.line domain of the report filters.
+
+        :param journal_id: The journal IDs to filter the report data.
+        :type journal_id: list
+
+        :param date_range: The date range option to filter the report data.
+        :type date_range: str or dict
+
+        :param options: The additional options to filter the report data.
+        :type options: dict
+
+        :param analytic: The analytic IDs to filter the report data.
+        :type analytic: list
+
+        :param method: Find the method
+        :type method: dict
+
+        :return: The domain selecting the move lines of the report.
+        :rtype: list
+        """
         today = fields.Date.today()
         quarter_start, quarter_end = date_utils.get_quarter(today)
         previous_quarter_start = quarter_start - relativedelta(months=3)
@@ -170,30 +274,52 @@ class AccountGeneralLedger(models.TransientModel):
                 end_date = datetime.strptime(date_range['end_date'],
                                              '%Y-%m-%d').date()
                 domain += [('date', '<=', end_date)]
-        move_line_ids = self.env['account.move.line'].search(domain)
-        account_ids = move_line_ids.mapped('account_id')
-        account_dict['journal_ids'] = self.env['account.journal'].search_read(
-            [], ['name'])
-        account_dict['analytic_ids'] = self.env[
-            'account.analytic.account'].search_read(
-            [], ['name'])
-        for account in account_ids:
-            move_line_id = move_line_ids.filtered(
-                lambda x: x.account_id == account)
-            move_line_list = []
-            for move_line in move_line_id:
-                move_line_data = move_line.read(
-                    ['date', 'name', 'move_name', 'debit', 'credit',
-                     'partner_id', 'account_id', 'journal_id', 'move_id',
-                     'analytic_line_ids'])
-                move_line_list.append(move_line_data)
-            account_dict[account.display_name] = move_line_list
-            currency_id = self.env.company.currency_id.symbol
+        return domain
+
+    @api.model
+    def _get_ledger_data(self, domain, lazy=False):
+        """
+        Compute the general ledger lines and account totals of the move lines
+        matching the domain.
+
+        Totals are aggregated by a single grouped query and the lines are
+        fetched with one batched read ordered by account, then partitioned
+        per account in memory.
+
+        :param domain: Domain on account.move.line selecting the lines.
+        :type domain: list
+
+        :param lazy: Skip the lines and return empty lists for the accounts,
+        along with the number of lines of each account in its totals.
+        :type lazy: bool
+
+        :return: A dictionary with the lines of each account keyed by the
+        account display name and the per-account totals under
+        'account_totals'.
+        :rtype: dict
+        """
+        account_dict = {}
+        account_totals = {}
+        move_line_obj = self.env['account.move.line']
+        groups = move_line_obj._read_group(
+            domain, ['account_id'], ['debit:sum', 'credit:sum', '__count'])
+        lines_by_account = defaultdict(list)
+        if not lazy:
+            for move_line in move_line_obj.search_read(
+                    domain, LEDGER_LINE_FIELDS,
+                    order='account_id, date desc, id desc'):
+                lines_by_account[move_line['account_id'][0]].append(
+                    [move_line])
+        currency_id = self.env.company.currency_id.symbol
+        for account, debit, credit, count in groups:
+            account_dict[account.display_name] = lines_by_account[account.id]
             account_totals[account.display_name] = {
-                'total_debit': round(sum(move_line_id.mapped('debit')), 2),
-                'total_credit': round(sum(move_line_id.mapped('credit')), 2),
+                'total_debit': round(debit, 2),
+                'total_credit': round(credit, 2),
                 'currency_id': currency_id,
-                'account_id': account.id}
+                'account_id': account.id,
+                'line_count': count}
+        if account_totals:
             account_dict['account_totals'] = account_totals
         return account_dict
 
@@ -327,3 +453,155 @@ class AccountGeneralLedger(models.TransientModel):
         output.seek(0)
         response.stream.write(output.read())
         output.close()
+
+    @api.model
+    def get_xlsx_stream(self, options, report_name, report_action):
+        """
+        Generate the XLSX report from the filter options and return its
+        content as a stream, for ledgers too large to be posted back by the
+        browser and built in memory.
+
+        The lines are queried again account by account, page by page, and
+        written to a workbook in constant memory mode.
+
+        :param options: The filter arguments of get_filter_values under the
+        keys 'journal_id', 'date_range', 'options', 'analytic' and 'method',
+        and the labels of the filters displayed in the header under
+        'filters'.
+        :type options: dict
+
+        :param report_name: The name of the report.
+        :type report_name: str
+
+        :param report_action: The XML ID of the report action.
+        :type report_action: str
+
+        :return: An iterator on the chunks of the xlsx file.
+        :rtype: iterator
+        """
+        return self._get_xlsx_stream(self._write_xlsx_ledger, options,
+                                     report_name, report_action)
+
+    @api.model
+    def _write_xlsx_ledger(self, workbook, options, report_name,
+                           report_action):
+        """
+        Write the general ledger sheet of get_xlsx_stream, row after row.
+
+        :param workbook: The workbook to fill, in constant memory mode.
+        :type workbook: xlsxwriter.Workbook
+
+        :param options: See get_xlsx_stream.
+        :type options: dict
+
+        :param report_name: The name of the report.
+        :type report_name: str
+
+        :param report_action: The XML ID of the report action.
+        :type report_action: str
+        """
+        filters = options.get('filters') or {}
+        filter_args = (options.get('journal_id') or [],
+                       options.get('date_range'), options.get('options'),
+                       options.get('analytic') or [], options.get('method'))
+        sheet = workbook.add_worksheet()
+        head = workbook.add_format(
+            {'align': 'center', 'bold': True, 'font_size': '15px'})
+        sub_heading = workbook.add_format(
+            {'align': 'center', 'bold': True, 'font_size': '10px',
+             'border': 1, 'bg_color': '#D3D3D3',
+             'border_color': 'black'})
+        filter_head = workbook.add_format(
+            {'align': 'center', 'bold': True, 'font_size': '10px',
+             'border': 1, 'bg_color': '#D3D3D3',
+             'border_color': 'black'})
+        filter_body = workbook.add_format(
+            {'align': 'center', 'bold': True, 'font_size': '10px'})
+        txt_name = workbook.add_format({'font_size': '10px', 'border': 1})
+        txt_name.set_indent(2)
+        sheet.set_column(0, 0, 30)
+        sheet.set_column(1, 1, 20)
+        sheet.set_column(2, 2, 15)
+        sheet.set_column(3, 3, 15)
+        col = 0
+        sheet.write(0, col, report_name, head)
+        start_date = filters.get('start_date') or ''
+        end_date = filters.get('end_date') or ''
+        filter_rows = [
+            ('Date Range', f"{start_date} to {end_date}"
+             if start_date or end_date else ''),
+            ('Journals', ', '.join(filters.get('journal') or [])),
+            ('Analytic', ', '.join(filters.get('analytic') or [])),
+            ('Options', ', '.join(filters.get('options') or {})),
+        ]
+        for row, (label, value) in enumerate(filter_rows, start=2):
+            sheet.write(row, col + 1, label, filter_head)
+            if value:
+                sheet.merge_range(row, col + 2, row, col + 6, value,
+                                  filter_body)
+        if report_action != 'dynamic_accounts_report.action_general_ledger':
+            return
+        row = 8
+        sheet.write(row, col, ' ', sub_heading)
+        sheet.write(row, col + 1, 'Date', sub_heading)
+        sheet.merge_range(row, col + 2, row, col + 4, 'Communication',
+                          sub_heading)
+        sheet.merge_range(row, col + 5, row, col + 6, 'Partner', sub_heading)
+        sheet.merge_range(row, col + 7, row, col + 8, 'Debit', sub_heading)
+        sheet.merge_range(row, col + 9, row, col + 10, 'Credit', sub_heading)
+        sheet.merge_range(row, col + 11, row, col + 12, 'Balance',
+                          sub_heading)
+        domain = self._get_filter_domain(*filter_args)
+        groups = self.env['account.move.line']._read_group(
+            domain, ['account_id'], ['debit:sum', 'credit:sum'])
+        if not groups:
+            return
+        total_debit = total_credit = 0.0
+        for account, debit, credit in groups:
+            total_debit += debit
+            total_credit += credit
+            row += 1
+            sheet.write(row, col, account.display_name, txt_name)
+            sheet.write(row, col + 1, ' ', txt_name)
+            sheet.merge_range(row, col + 2, row, col + 4, ' ', txt_name)
+            sheet.merge_range(row, col + 5, row, col + 6, ' ', txt_name)
+            sheet.merge_range(row, col + 7, row, col + 8, round(debit, 2),
+                              txt_name)
+            sheet.merge_range(row, col + 9, row, col + 10, round(credit, 2),
+                              txt_name)
+            sheet.merge_range(row, col + 11, row, col + 12,
+                              round(debit - credit, 2), txt_name)
+            next_key = None
+            while next_key is not False:
+                page = self.get_account_lines(account.id, *filter_args,
+                                              last_key=next_key,
+                                              limit=XLSX_PAGE_SIZE)
+                for rec in page['lines']:
+                    row += 1
+                    partner = rec[0]['partner_id']
+                    name = partner[1] if partner else None
+                    sheet.write(row, col, rec[0]['move_name'], txt_name)
+                    sheet.write(row, col + 1,
+                                fields.Date.to_string(rec[0]['date']),
+                                txt_name)
+                    sheet.merge_range(row, col + 2, row, col + 4,
+                                      rec[0]['name'], txt_name)
+                    sheet.merge_range(row, col + 5, row, col + 6, name,
+                                      txt_name)
+                    sheet.merge_range(row, col + 7, row, col + 8,
+                                      rec[0]['debit'], txt_name)
+                    sheet.merge_range(row, col + 9, row, col + 10,
+                                      rec[0]['credit'], txt_name)
+                    sheet.merge_range(row, col + 11, row, col + 12, ' ',
+                                      txt_name)
+                next_key = page['next_key']
+                # Each page is already in the sheet file, drop its records.
+                self.env.invalidate_all()
+        row += 1
+        sheet.merge_range(row, col, row, col + 6, 'Total', filter_head)
+        sheet.merge_range(row, col + 7, row, col + 8, round(total_debit, 2),
+                          filter_head)
+        sheet.merge_range(row, col + 9, row, col + 10,
+                          round(total_credit, 2), filter_head)
+        sheet.merge_range(row, col + 11, row, col + 12,
+                          round(total_debit - total_credit, 2), filter_head)
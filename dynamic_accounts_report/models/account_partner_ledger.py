@@ -21,20 +21,24 @@
 ################################################################################
 import io
 import json
-from dateutil.relativedelta import relativedelta
+from collections import defaultdict
+from datetime import timedelta
 import xlsxwriter
 from odoo import api, fields, models
-from datetime import datetime
-from odoo.tools import date_utils
+from odoo.tools import split_every
+
+# number of partners whose lines are read together by the streamed export
+XLSX_PARTNER_BATCH_SIZE = 100
 
 
 class AccountPartnerLedger(models.TransientModel):
     """For creating Partner Ledger report"""
     _name = 'account.partner.ledger'
+    _inherit = 'dynamic.report.mixin'
     _description = 'Partner Ledger Report'
 
     @api.model
-    def view_report(self, option, tag):
+    def view_report(self, option, tag, lazy=False):
         """
         Retrieve partner-related data for generating a report.
 
@@ -44,61 +48,24 @@ class AccountPartnerLedger(models.TransientModel):
         :param tag: The tag used for filtering the data.
         :type tag: str
 
+        :param lazy: Return only the partner totals, the lines of each
+        partner are then fetched with get_partner_lines.
+        :type lazy: bool
+
         :return: A dictionary containing the partner data for the report.
         :rtype: dict
         """
-        fiscal_year = self.env['res.company'].search([]).mapped('account_opening_date')[0].strftime('%Y-%m-%d')
-        fiscal_year_start = datetime.strptime(fiscal_year,
-                                              '%Y-%m-%d').date()
-        partner_dict = {}
-        partner_totals = {}
-        move_line_ids = self.env['account.move.line'].search(
-            [('account_type', 'in',
-              ['liability_payable', 'asset_receivable']),
-             ('parent_state', '=', 'posted')])
-        partner_ids = move_line_ids.mapped('partner_id')
-        for partner in partner_ids:
-            total_debit_balance = 0
-            total_credit_balance = 0
-            balance = 0
-            move_line_id = move_line_ids.filtered(
-                lambda x: x.partner_id == partner)
-            move_line_list = []
-            for move_line in move_line_id:
-                if move_line.invoice_date:
-                    if move_line.invoice_date < fiscal_year_start:
-                        total_debit_balance += move_line.debit
-                        total_credit_balance += move_line.credit
-                        balance = total_debit_balance - total_credit_balance
-                move_line_data = move_line.read(
-                    ['date', 'move_name', 'account_type', 'debit', 'credit',
-                     'date_maturity', 'account_id', 'journal_id', 'move_id',
-                     'matching_number', 'amount_currency'])
-                account_code = self.env['account.account'].browse(
-                    move_line.account_id.id).code
-                journal_code = self.env['account.journal'].browse(
-                    move_line.journal_id.id).code
-                if account_code:
-                    move_line_data[0]['jrnl'] = journal_code
-                    move_line_data[0]['code'] = account_code
-                move_line_list.append(move_line_data)
-            partner_dict[partner.name] = move_line_list
-            currency_id = self.env.company.currency_id.symbol
-            partner_totals[partner.name] = {
-                'total_debit': round(sum(move_line_id.mapped('debit')), 2),
-                'total_credit': round(sum(move_line_id.mapped('credit')), 2),
-                'currency_id': currency_id,
-                'initial_balance': balance,
-                'partner_id': partner.id,
-                'move_name': 'Initial Balance',
-                'initial_debit': total_debit_balance,
-                'initial_credit': total_credit_balance,
-            }
-            partner_dict['partner_totals'] = partner_totals
-        return partner_dict
+        return self._get_cached_values('_get_report_values', option, tag,
+                                       lazy, cache=lazy)
 
     @api.model
-    def get_filter_values(self, partner_id, data_range, account, options):
+    def _get_report_values(self, option, tag, lazy=False):
+        """Compute the result of view_report, see there."""
+        return self._get_ledger_values(None, None, None, lazy)
+
+    @api.model
+    def get_filter_values(self, partner_id, data_range, account, options,
+                          lazy=False):
         """
         Retrieve filtered partner-related data for generating a report.
 
@@ -114,234 +81,438 @@ class AccountPartnerLedger(models.TransientModel):
         :param options: Additional options for filtering the data.
         :type options: dict
 
+        :param lazy: Return only the partner totals, the lines of each
+        partner are then fetched with get_partner_lines.
+        :type lazy: bool
+
         :return: A dictionary containing the filtered partner data.
         :rtype: dict
         """
-        if options == {}:
-            options = None
-        if account == {}:
-            account = None
-        account_type_domain = []
-        if options is None:
-            option_domain = ['posted']
-        elif 'draft' in options:
-            option_domain = ['posted', 'draft']
-        if account is None or (
-                'Receivable' in account and 'Payable' in account):
-            account_type_domain.append('liability_payable')
-            account_type_domain.append('asset_receivable')
-        elif 'Receivable' in account:
-            account_type_domain.append('asset_receivable')
-        elif 'Payable' in account:
-            account_type_domain.append('liability_payable')
+        return self._get_cached_values('_get_filter_values', partner_id,
+                                       data_range, account, options, lazy,
+                                       cache=lazy)
+
+    @api.model
+    def _get_filter_values(self, partner_id, data_range, account, options,
+                           lazy=False):
+        """Compute the result of get_filter_values, see there."""
+        domain = self._get_partner_domain(partner_id, account, options)
+        date_from, date_to = self._get_date_range_bounds(data_range)
+        return self._get_ledger_values(domain, date_from, date_to, lazy)
+
+    @api.model
+    def get_partner_lines(self, partner_id, data_range=None, account=None,
+                          options=None):
+        """
+        Retrieve the move lines of a partner, used to unfold a partner of a
+        report loaded lazily.
+
+        :param partner_id: The ID of the partner to unfold.
+        :type partner_id: int
+
+        :param data_range: The date range option for filtering the data.
+        :type data_range: str or dict
+
+        :param account: The account type(s) to filter by.
+        :type account: list or str
+
+        :param options: Additional options for filtering the data.
+        :type options: dict
+
+        :return: The move lines of the partner, with their running balance.
+        :rtype: list
+        """
+        domain = self._get_partner_domain([partner_id], account, options)
+        date_from, date_to = self._get_date_range_bounds(data_range)
+        initial = self._get_partner_balances(domain, date_from, date_to)
+        initial_balance = initial.get(partner_id, {}).get('initial_balance', 0)
+        return self._get_partner_move_lines(
+            domain, date_from, date_to,
+            {partner_id: initial_balance}).get(partner_id, [])
+
+    @api.model
+    def _get_partner_domain(self, partner_id, account, options):
+        """
+        Build the account.move.line domain of the report filters, the dates
+        apart.
+
+        :param partner_id: The IDs of the partners, all of them if empty.
+        :type partner_id: list
+
+        :param account: The account types, both 'Receivable' and 'Payable'
+        if empty.
+        :type account: dict
+
+        :param options: Additional options, 'draft' to include draft entries.
+        :type options: dict
+
+        :return: The domain selecting the move lines of the report.
+        :rtype: list
+        """
+        account_types = []
+        if not account or 'Receivable' in account:
+            account_types.append('asset_receivable')
+        if not account or 'Payable' in account:
+            account_types.append('liability_payable')
+        states = ['posted', 'draft'] if options and 'draft' in options else [
+            'posted']
+        domain = [('account_type', 'in', account_types),
+                  ('parent_state', 'in', states)]
+        if partner_id:
+            domain.append(('partner_id', 'in', partner_id))
+        return domain
+
+    @api.model
+    def _get_period_start(self, date_from, date_to):
+        """
+        Return the first date of the period, the opening date of the company
+        when the period has no start. The lines before it make the opening
+        balance, so that they are not counted in the period as well.
+
+        The opening date is capped to the day after the end of the period,
+        so that a period ending before it keeps no line after its end in
+        the opening balance.
+
+        :param date_from: The start of the period, or None.
+        :type date_from: date
+
+        :param date_to: The end of the period, or None.
+        :type date_to: date
+
+        :return: The start of the period, or None.
+        :rtype: date
+        """
+        if date_from:
+            return date_from
+        opening_date = self.env.company.account_opening_date
+        if opening_date and date_to:
+            return min(opening_date, date_to + timedelta(days=1))
+        return opening_date
+
+    @api.model
+    def _get_partner_balances(self, domain, date_from, date_to):
+        """
+        Compute the opening balance, the debit and credit of the period and
+        the closing balance of every partner in one grouped query.
+
+        The opening balance sums the lines before date_from, or before the
+        opening date of the company when the period has no start, see
+        _get_period_start.
+
+        :param domain: The domain of the report filters, the dates apart.
+        :type domain: list
+
+        :param date_from: The start of the period, or None.
+        :type date_from: date
+
+        :param date_to: The end of the period, or None.
+        :type date_to: date
+
+        :return: The balances keyed by partner ID.
+        :rtype: dict
+        """
+        opening_date = self._get_period_start(date_from, date_to)
+        periods = {'period': (opening_date, date_to)}
+        if opening_date:
+            periods['initial'] = (None, opening_date - timedelta(days=1))
+        balances = self._get_period_balances(
+            domain + [('partner_id', '!=', False),
+                      ('company_id', 'in', self.env.companies.ids)],
+            periods, groupby='partner_id')
+        partner_balances = {}
+        for partner_id, values in balances.items():
+            debit, credit = values['period']
+            initial_debit, initial_credit = values.get('initial', (0.0, 0.0))
+            partner_balances[partner_id] = {
+                'initial_debit': initial_debit,
+                'initial_credit': initial_credit,
+                'initial_balance': initial_debit - initial_credit,
+                'debit': debit,
+                'credit': credit,
+                'balance': initial_debit - initial_credit + debit - credit,
+            }
+        return partner_balances
+
+    @api.model
+    def _get_partner_move_lines(self, domain, date_from, date_to,
+                                initial_balances):
+        """
+        Read the move lines of the period of several partners in one batch,
+        with the journal and account codes and the running balance of each
+        partner.
+
+        :param domain: The domain of the report filters, the dates apart.
+        :type domain: list
+
+        :param date_from: The start of the period, or None.
+        :type date_from: date
+
+        :param date_to: The end of the period, or None.
+        :type date_to: date
+
+        :param initial_balances: The opening balance keyed by partner ID, the
+        lines of these partners only are read.
+        :type initial_balances: dict
+
+        :return: The lines, each wrapped in a list, keyed by partner ID.
+        :rtype: dict
+        """
+        domain = domain + [('partner_id', 'in', list(initial_balances))]
+        date_from = self._get_period_start(date_from, date_to)
+        if date_from:
+            domain.append(('date', '>=', date_from))
+        if date_to:
+            domain.append(('date', '<=', date_to))
+        move_lines = self.env['account.move.line'].search_read(
+            domain, ['date', 'move_name', 'account_type', 'debit', 'credit',
+                     'date_maturity', 'account_id', 'journal_id', 'move_id',
+                     'matching_number', 'amount_currency', 'partner_id'],
+            order='partner_id, date, id')
+        journals = self.env['account.journal'].browse(
+            {line['journal_id'][0] for line in move_lines})
+        journal_codes = {journal.id: journal.code for journal in journals}
+        accounts = self.env['account.account'].browse(
+            {line['account_id'][0] for line in move_lines})
+        account_codes = {account.id: account.code for account in accounts}
+        lines_by_partner = defaultdict(list)
+        balance = 0.0
+        for move_line in move_lines:
+            partner_id = move_line['partner_id'][0]
+            if not lines_by_partner[partner_id]:
+                balance = initial_balances[partner_id]
+            balance += move_line['debit'] - move_line['credit']
+            move_line['balance'] = balance
+            account_code = account_codes[move_line['account_id'][0]]
+            if account_code:
+                move_line['jrnl'] = journal_codes[move_line['journal_id'][0]]
+                move_line['code'] = account_code
+            lines_by_partner[partner_id].append([move_line])
+        return lines_by_partner
+
+    @api.model
+    def _get_ledger_values(self, domain, date_from, date_to, lazy=False):
+        """
+        Compute the partner ledger of the move lines matching the domain.
+
+        :param domain: The domain of the report filters, the dates apart,
+        None for the default posted receivable and payable lines.
+        :type domain: list
+
+        :param date_from: The start of the period, or None.
+        :type date_from: date
+
+        :param date_to: The end of the period, or None.
+        :type date_to: date
+
+        :param lazy: Skip the lines and return empty lists for the partners.
+        :type lazy: bool
+
+        :return: A dictionary with the lines of each partner keyed by the
+        partner name and the per-partner totals under 'partner_totals'.
+        :rtype: dict
+        """
+        if domain is None:
+            domain = self._get_partner_domain([], None, None)
+        balances = self._get_partner_balances(domain, date_from, date_to)
+        lines_by_partner = {}
+        if not lazy and balances:
+            lines_by_partner = self._get_partner_move_lines(
+                domain, date_from, date_to,
+                {partner_id: values['initial_balance']
+                 for partner_id, values in balances.items()})
+        partners = self.env['res.partner'].browse(balances).sorted(
+            key=lambda partner: partner.name or '')
+        currency_id = self.env.company.currency_id.symbol
         partner_dict = {}
         partner_totals = {}
-        today = fields.Date.today()
-        quarter_start, quarter_end = date_utils.get_quarter(today)
-        previous_quarter_start = quarter_start - relativedelta(months=3)
-        previous_quarter_end = quarter_start - relativedelta(days=1)
-        if not partner_id:
-            partner_id = self.env['account.move.line'].search([(
-                'account_type', 'in', account_type_domain),
-                ('parent_state', 'in', option_domain)]).mapped(
-                'partner_id').ids
-        balance_move_line_ids = []
-        for partners in partner_id:
-            partner = self.env['res.partner'].browse(partners).name
-            if data_range:
-                if data_range == 'month':
-                    move_line_ids = self.env['account.move.line'].search(
-                        [('partner_id', '=', partners), (
-                            'account_type', 'in',
-                            account_type_domain),
-                         ('parent_state', 'in', option_domain)]).filtered(
-                        lambda x: x.date.month == fields.Date.today().month)
-                    date_start = fields.Date.today().replace(day=1)
-                    balance_move_line_ids = self.env[
-                        'account.move.line'].search(
-                        [('partner_id', '=', partners), (
-                            'account_type', 'in',
-                            account_type_domain),
-                         ('parent_state', 'in', option_domain),
-                         ('invoice_date', '<', date_start)])
-                elif data_range == 'year':
-                    move_line_ids = self.env['account.move.line'].search(
-                        [('partner_id', '=', partners), (
-                            'account_type', 'in',
-                            account_type_domain),
-                         ('parent_state', 'in', option_domain)]).filtered(
-                        lambda x: x.date.year == fields.Date.today().year)
-                    date_start = fields.Date.today().replace(month=1, day=1)
-                    balance_move_line_ids = self.env[
-                        'account.move.line'].search(
-                        [('partner_id', '=', partners), (
-                            'account_type', 'in',
-                            account_type_domain),
-                         ('parent_state', 'in', option_domain),
-                         ('invoice_date', '<', date_start)])
-                elif data_range == 'quarter':
-                    move_line_ids = self.env['account.move.line'].search(
-                        [('partner_id', '=', partners), (
-                            'account_type', 'in',
-                            account_type_domain),
-                         ('date', '>=', quarter_start),
-                         ('date', '<=', quarter_end),
-                         ('parent_state', 'in', option_domain)])
-                    date_start = quarter_start
-                    balance_move_line_ids = self.env[
-                        'account.move.line'].search(
-                        [('partner_id', '=', partners), (
-                            'account_type', 'in',
-                            account_type_domain),
-                         ('parent_state', 'in', option_domain),
-                         ('invoice_date', '<', date_start)])
-                elif data_range == 'last-month':
-                    move_line_ids = self.env['account.move.line'].search(
-                        [('partner_id', '=', partners), (
-                            'account_type', 'in',
-                            account_type_domain),
-                         ('parent_state', 'in', option_domain)]).filtered(
-                        lambda x: x.date.month == fields.Date.today().month - 1)
-                    date_start = fields.Date.today().replace(day=1,month=fields.Date.today().month - 1)
-                    balance_move_line_ids = self.env[
-                        'account.move.line'].search(
-                        [('partner_id', '=', partners), (
-                            'account_type', 'in',
-                            account_type_domain),
-                         ('parent_state', 'in', option_domain),
-                         ('invoice_date', '<', date_start)])
-                elif data_range == 'last-year':
-                    move_line_ids = self.env['account.move.line'].search(
-                        [('partner_id', '=', partners), (
-                            'account_type', 'in',
-                            account_type_domain),
-                         ('parent_state', 'in', option_domain)]).filtered(
-                        lambda x: x.date.year == fields.Date.today().year - 1)
-                    date_start = fields.Date.today().replace(day=1,month=1,)
-                    balance_move_line_ids = self.env[
-                        'account.move.line'].search(
-                        [('partner_id', '=', partners), (
-                            'account_type', 'in',
-                            account_type_domain),
-                         ('parent_state', 'in', option_domain),
-                         ('invoice_date', '<', date_start)])
-                elif data_range == 'last-quarter':
-                    move_line_ids = self.env['account.move.line'].search(
-                        [('partner_id', '=', partners), (
-                            'account_type', 'in',
-                            account_type_domain),
-                         ('date', '>=', previous_quarter_start),
-                         ('date', '<=', previous_quarter_end),
-                         ('parent_state', 'in', option_domain)])
-                    date_start = previous_quarter_start
-                    balance_move_line_ids = self.env[
-                        'account.move.line'].search(
-                        [('partner_id', '=', partners), (
-                            'account_type', 'in',
-                            account_type_domain),
-                         ('parent_state', 'in', option_domain),
-                         ('invoice_date', '<', date_start)])
-                elif 'start_date' in data_range and 'end_date' in data_range:
-                    start_date = datetime.strptime(data_range['start_date'],
-                                                   '%Y-%m-%d').date()
-                    end_date = datetime.strptime(data_range['end_date'],
-                                                 '%Y-%m-%d').date()
-                    move_line_ids = self.env['account.move.line'].search(
-                        [('partner_id', '=', partners), (
-                            'account_type', 'in',
-                            account_type_domain),
-                         ('date', '>=', start_date),
-                         ('date', '<=', end_date),
-                         ('parent_state', 'in', option_domain)])
-                    date_start = start_date
-                    balance_move_line_ids = self.env[
-                        'account.move.line'].search(
-                        [('partner_id', '=', partners), (
-                            'account_type', 'in',
-                            account_type_domain),
-                         ('parent_state', 'in', option_domain),
-                         ('invoice_date', '<', date_start)])
-                elif 'start_date' in data_range:
-                    start_date = datetime.strptime(data_range['start_date'],
-                                                   '%Y-%m-%d').date()
-                    move_line_ids = self.env['account.move.line'].search(
-                        [('partner_id', '=', partners), (
-                            'account_type', 'in',
-                            account_type_domain),
-                         ('date', '>=', start_date),
-                         ('parent_state', 'in', option_domain)])
-                    date_start = start_date
-                    balance_move_line_ids = self.env[
-                        'account.move.line'].search(
-                        [('partner_id', '=', partners), (
-                            'account_type', 'in',
-                            account_type_domain),
-                         ('parent_state', 'in', option_domain),
-                         ('invoice_date', '<', date_start)])
-                elif 'end_date' in data_range:
-                    end_date = datetime.strptime(data_range['end_date'],
-                                                 '%Y-%m-%d').date()
-                    move_line_ids = self.env['account.move.line'].search(
-                        [('partner_id', '=', partners), (
-                            'account_type', 'in',
-                            account_type_domain),
-                         ('date', '<=', end_date),
-                         ('parent_state', 'in', option_domain)])
-                    fiscal_year = self.env['res.company'].search([]).mapped(
-                        'account_opening_date')[0].strftime('%Y-%m-%d')
-                    date_start = datetime.strptime(fiscal_year,
-                                                          '%Y-%m-%d').date()
-                    balance_move_line_ids = self.env[
-                        'account.move.line'].search(
-                        [('partner_id', '=', partners), (
-                            'account_type', 'in',
-                            account_type_domain),
-                         ('parent_state', 'in', option_domain),
-                         ('invoice_date', '<', date_start)])
-            else:
-                move_line_ids = self.env['account.move.line'].search(
-                    [('partner_id', '=', partners), (
-                        'account_type', 'in',
-                        account_type_domain),
-                     ('parent_state', 'in', option_domain)])
-            total_debit_balance = 0
-            total_credit_balance = 0
-            balance = 0
-            move_line_list = []
-            for move_line in move_line_ids:
-                move_line_data = move_line.read(
-                    ['date', 'move_name', 'account_type', 'debit', 'credit',
-                     'date_maturity', 'account_id', 'journal_id', 'move_id',
-                     'matching_number', 'amount_currency'])
-                account_code = self.env['account.account'].browse(
-                    move_line.account_id.id).code
-                journal_code = self.env['account.journal'].browse(
-                    move_line.journal_id.id).code
-                if account_code:
-                    move_line_data[0]['jrnl'] = journal_code
-                    move_line_data[0]['code'] = account_code
-                move_line_list.append(move_line_data)
-            for remaining_move in balance_move_line_ids:
-                if remaining_move.invoice_date:
-                    if remaining_move.invoice_date < date_start:
-                        total_debit_balance += remaining_move.debit
-                        total_credit_balance += remaining_move.credit
-                        balance = total_debit_balance - total_credit_balance
-            partner_dict[partner] = move_line_list
-            currency_id = self.env.company.currency_id.symbol
-            partner_totals[partner] = {
-                'total_debit': round(sum(move_line_ids.mapped('debit')), 2),
-                'total_credit': round(sum(move_line_ids.mapped('credit')), 2),
+        for partner in partners:
+            values = balances[partner.id]
+            partner_dict[partner.name] = lines_by_partner.get(partner.id, [])
+            partner_totals[partner.name] = {
+                'total_debit': round(values['debit'], 2),
+                'total_credit': round(values['credit'], 2),
                 'currency_id': currency_id,
-                'partner_id': partners,
-                'initial_balance': balance,
+                'partner_id': partner.id,
+                'initial_balance': values['initial_balance'],
                 'move_name': 'Initial Balance',
-                'initial_debit': total_debit_balance,
-                'initial_credit': total_credit_balance,
+                'initial_debit': values['initial_debit'],
+                'initial_credit': values['initial_credit'],
+                'balance': round(values['balance'], 2),
             }
+        if partner_totals:
             partner_dict['partner_totals'] = partner_totals
         return partner_dict
 
+    @api.model
+    def get_xlsx_stream(self, options, report_name, report_action):
+        """
+        Generate the XLSX partner ledger from the filter options and return
+        its content as a stream, for ledgers too large to be posted back by
+        the browser and built in memory.
+
+        The lines are queried again by batches of partners and written to a
+        workbook in constant memory mode.
+
+        :param options: The filter arguments of get_filter_values under the
+        keys 'partner_id', 'data_range', 'account' and 'options', and the
+        labels of the filters displayed in the header under 'filters'.
+        :type options: dict
+
+        :param report_name: The name of the report.
+        :type report_name: str
+
+        :param report_action: The XML ID of the report action.
+        :type report_action: str
+
+        :return: An iterator on the chunks of the xlsx file.
+        :rtype: iterator
+        """
+        return self._get_xlsx_stream(self._write_xlsx_ledger, options,
+                                     report_name)
+
+    @api.model
+    def _write_xlsx_ledger(self, workbook, options, report_name):
+        """
+        Write the partner ledger sheet of get_xlsx_stream, row after row.
+
+        :param workbook: The workbook to fill, in constant memory mode.
+        :type workbook: xlsxwriter.Workbook
+
+        :param options: See get_xlsx_stream.
+        :type options: dict
+
+        :param report_name: The name of the report.
+        :type report_name: str
+        """
+        filters = options.get('filters') or {}
+        sheet = workbook.add_worksheet()
+        head = workbook.add_format(
+            {'font_size': 15, 'align': 'center', 'bold': True})
+        head_highlight = workbook.add_format(
+            {'font_size': 10, 'align': 'center', 'bold': True})
+        sub_heading = workbook.add_format(
+            {'align': 'center', 'bold': True, 'font_size': '10px',
+             'border': 1, 'bg_color': '#D3D3D3', 'border_color': 'black'})
+        filter_head = workbook.add_format(
+            {'align': 'center', 'bold': True, 'font_size': '10px',
+             'border': 1, 'bg_color': '#D3D3D3', 'border_color': 'black'})
+        filter_body = workbook.add_format(
+            {'align': 'center', 'bold': True, 'font_size': '10px'})
+        txt_name = workbook.add_format({'font_size': '10px', 'border': 1})
+        txt_name.set_indent(2)
+        sheet.set_column(0, 0, 30)
+        sheet.set_column(1, 1, 20)
+        sheet.set_column(2, 2, 15)
+        sheet.set_column(3, 3, 15)
+        col = 0
+        sheet.write(0, col, report_name, head)
+        start_date = filters.get('start_date') or ''
+        end_date = filters.get('end_date') or ''
+        filter_rows = [
+            ('Date Range', f"{start_date} to {end_date}"
+             if start_date or end_date else ''),
+            ('Partners', ', '.join(
+                partner.get('display_name', 'undefined')
+                for partner in filters.get('partner') or [])),
+            ('Accounts', ', '.join(filters.get('account') or {})),
+            ('Options', ', '.join(filters.get('options') or {})),
+        ]
+        for row, (label, value) in enumerate(filter_rows, start=2):
+            sheet.write(row, col + 1, label, filter_head)
+            if value:
+                sheet.merge_range(row, col + 2, row, col + 6, value,
+                                  filter_body)
+        row = 8
+        sheet.write(row, col, ' ', sub_heading)
+        sheet.write(row, col + 1, 'JNRL', sub_heading)
+        sheet.write(row, col + 2, 'Account', sub_heading)
+        for offset, label in enumerate(
+                ['Ref', 'Due Date', 'Debit', 'Credit', 'Balance']):
+            sheet.merge_range(row, col + 3 + 2 * offset, row,
+                              col + 4 + 2 * offset, label, sub_heading)
+        domain = self._get_partner_domain(options.get('partner_id') or [],
+                                          options.get('account'),
+                                          options.get('options'))
+        date_from, date_to = self._get_date_range_bounds(
+            options.get('data_range'))
+        balances = self._get_partner_balances(domain, date_from, date_to)
+        partner_ids = self.env['res.partner'].browse(balances).sorted(
+            key=lambda partner: partner.name or '').ids
+        total_debit = total_credit = 0.0
+        for batch_ids in split_every(XLSX_PARTNER_BATCH_SIZE, partner_ids):
+            partners = self.env['res.partner'].browse(batch_ids)
+            lines_by_partner = self._get_partner_move_lines(
+                domain, date_from, date_to,
+                {partner_id: balances[partner_id]['initial_balance']
+                 for partner_id in batch_ids})
+            for partner in partners:
+                values = balances[partner.id]
+                debit = round(values['debit'], 2)
+                credit = round(values['credit'], 2)
+                total_debit += debit
+                total_credit += credit
+                row += 1
+                sheet.write(row, col, partner.name, txt_name)
+                sheet.write(row, col + 1, ' ', txt_name)
+                sheet.write(row, col + 2, ' ', txt_name)
+                sheet.merge_range(row, col + 3, row, col + 4, ' ', txt_name)
+                sheet.merge_range(row, col + 5, row, col + 6, ' ', txt_name)
+                sheet.merge_range(row, col + 7, row, col + 8, debit,
+                                  txt_name)
+                sheet.merge_range(row, col + 9, row, col + 10, credit,
+                                  txt_name)
+                sheet.merge_range(row, col + 11, row, col + 12,
+                                  round(debit - credit, 2), txt_name)
+                if values['initial_balance']:
+                    row += 1
+                    sheet.write(row, col, '', txt_name)
+                    sheet.write(row, col + 1, ' ', txt_name)
+                    sheet.write(row, col + 2, ' ', txt_name)
+                    sheet.merge_range(row, col + 3, row, col + 4,
+                                      'Initial Balance', head_highlight)
+                    sheet.merge_range(row, col + 5, row, col + 6, ' ',
+                                      txt_name)
+                    sheet.merge_range(row, col + 7, row, col + 8,
+                                      round(values['initial_debit'], 2),
+                                      txt_name)
+                    sheet.merge_range(row, col + 9, row, col + 10,
+                                      round(values['initial_credit'], 2),
+                                      txt_name)
+                    sheet.merge_range(row, col + 11, row, col + 12,
+                                      round(values['initial_balance'], 2),
+                                      txt_name)
+                for rec in lines_by_partner.get(partner.id, []):
+                    row += 1
+                    sheet.write(row, col,
+                                fields.Date.to_string(rec[0]['date']),
+                                txt_name)
+                    sheet.write(row, col + 1, rec[0].get('jrnl', ' '),
+                                txt_name)
+                    sheet.write(row, col + 2, rec[0].get('code', ' '),
+                                txt_name)
+                    sheet.merge_range(row, col + 3, row, col + 4,
+                                      rec[0]['move_name'], txt_name)
+                    sheet.merge_range(row, col + 5, row, col + 6,
+                                      fields.Date.to_string(
+                                          rec[0]['date_maturity']) or '',
+                                      txt_name)
+                    sheet.merge_range(row, col + 7, row, col + 8,
+                                      rec[0]['debit'], txt_name)
+                    sheet.merge_range(row, col + 9, row, col + 10,
+                                      rec[0]['credit'], txt_name)
+                    sheet.merge_range(row, col + 11, row, col + 12, ' ',
+                                      txt_name)
+            # Each batch is already in the sheet file, drop its records.
+            self.env.invalidate_all()
+        row += 1
+        sheet.merge_range(row, col, row, col + 6, 'Total', filter_head)
+        sheet.merge_range(row, col + 7, row, col + 8, round(total_debit, 2),
+                          filter_head)
+        sheet.merge_range(row, col + 9, row, col + 10,
+                          round(total_credit, 2), filter_head)
+        sheet.merge_range(row, col + 11, row, col + 12,
+                          round(total_debit - total_credit, 2), filter_head)
+
     @api.model
     def get_xlsx_report(self, data, response, report_name, report_action):
         """
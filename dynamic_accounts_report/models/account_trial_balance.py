@@ -22,7 +22,7 @@
 import calendar
 import io
 import json
-from datetime import datetime
+from datetime import datetime, timedelta
 import xlsxwriter
 from odoo import api, fields, models
 from odoo.tools.date_utils import get_month, get_fiscal_year, \
@@ -32,6 +32,7 @@ from odoo.tools.date_utils import get_month, get_fiscal_year, \
 class AccountTrialBalance(models.TransientModel):
     """For creating Trial Balance report"""
     _name = 'account.trial.balance'
+    _inherit = 'dynamic.report.mixin'
     _description = 'Trial Balance Report'
 
     @api.model
@@ -45,26 +46,29 @@ class AccountTrialBalance(models.TransientModel):
         :return: List of dictionaries representing the trial balance report.
         :rtype: list
         """
-        account_ids = self.env['account.move.line'].search([]).mapped(
-            'account_id')
+        return self._get_cached_values('_get_report_values')
+
+    @api.model
+    def _get_report_values(self):
+        """Compute the result of view_report, see there."""
+        account_ids = self._get_distinct_values('account_id')
         today = fields.Date.today()
+        month_start, month_end = get_month(today)
+        balances = self._get_period_balances(
+            [('parent_state', '=', 'posted')], {
+                'initial': (None, month_start - timedelta(days=1)),
+                'period': (month_start, month_end),
+            })
+        journal_ids = self.env['account.journal'].search_read([], ['name'])
         move_line_list = []
         for account_id in account_ids:
-            initial_move_line_ids = self.env['account.move.line'].search(
-                [('date', '<', get_month(today)[0]),
-                 ('account_id', '=', account_id.id),
-                 ('parent_state', '=', 'posted')])
-            initial_total_debit = round(
-                sum(initial_move_line_ids.mapped('debit')), 2)
-            initial_total_credit = round(
-                sum(initial_move_line_ids.mapped('credit')), 2)
-            move_line_ids = self.env['account.move.line'].search(
-                [('date', '>=', get_month(today)[0]),
-                 ('account_id', '=', account_id.id),
-                 ('date', '<=', get_month(today)[1]),
-                 ('parent_state', '=', 'posted')])
-            total_debit = round(sum(move_line_ids.mapped('debit')), 2)
-            total_credit = round(sum(move_line_ids.mapped('credit')), 2)
+            account_balance = balances.get(account_id.id, {})
+            initial_total_debit, initial_total_credit = (
+                round(amount, 2) for amount in
+                account_balance.get('initial', (0.0, 0.0)))
+            total_debit, total_credit = (
+                round(amount, 2) for amount in
+                account_balance.get('period', (0.0, 0.0)))
             sum_debit = initial_total_debit + total_debit
             sum_credit = initial_total_credit + total_credit
             diff_credit_debit = sum_debit - sum_credit
@@ -77,7 +81,7 @@ class AccountTrialBalance(models.TransientModel):
             data = {
                 'account': account_id.display_name,
                 'account_id': account_id.id,
-                'journal_ids': self.env['account.journal'].search_read([], ['name']),
+                'journal_ids': journal_ids,
                 'initial_total_debit': "{:,.2f}".format(initial_total_debit),
                 'initial_total_credit': "{:,.2f}".format(initial_total_credit),
                 'total_debit': total_debit,
@@ -115,6 +119,16 @@ class AccountTrialBalance(models.TransientModel):
         :return: List of dictionaries representing the financial report.
         :rtype: list
         """
+        return self._get_cached_values('_get_filter_values', start_date,
+                                       end_date, comparison_number,
+                                       comparison_type, journal_list, analytic,
+                                       options, method)
+
+    @api.model
+    def _get_filter_values(self, start_date, end_date, comparison_number,
+                           comparison_type, journal_list, analytic, options,
+                           method):
+        """Compute the result of get_filter_values, see there."""
         if options == {}:
             options = None
         if options is None:
@@ -123,165 +137,86 @@ class AccountTrialBalance(models.TransientModel):
             option_domain = ['posted', 'draft']
         if method == {}:
             method = None
-        dynamic_total_debit = {}
-        dynamic_date_num = {}
-        dynamic_total_credit = {}
-        account_ids = self.env['account.move.line'].search([]).mapped(
-            'account_id')
-        move_line_list = []
-        start_date_first = \
+        comparison_number = int(comparison_number or 0)
+        account_ids = self._get_distinct_values('account_id')
+        start_date = \
             get_fiscal_year(datetime.strptime(start_date, "%Y-%m-%d").date())[
                 0] if comparison_type == 'year' else datetime.strptime(
                 start_date, "%Y-%m-%d").date()
-        end_date_first = \
+        end_date = \
             get_fiscal_year(datetime.strptime(end_date, "%Y-%m-%d").date())[
                 1] if comparison_type == 'year' else datetime.strptime(end_date,
                                                                        "%Y-%m-%d").date()
-        for account_id in account_ids:
-            start_date = start_date_first
-            end_date = end_date_first
-            if comparison_number:
-                if comparison_type == 'month':
-                    initial_start_date = subtract(start_date, months=eval(
-                        comparison_number))
-                elif comparison_type == 'year':
-                    initial_start_date = subtract(start_date, years=eval(
-                        comparison_number))
-                else:
-                    initial_start_date = subtract(start_date, months=eval(
-                        comparison_number) * 3)
-            else:
-                initial_start_date = start_date
-            domain = [('date', '<', initial_start_date),
-                      ('account_id', '=', account_id.id),
-                      ('parent_state', 'in', option_domain), ]
-            if journal_list:
-                domain.append(
-                    ('journal_id', 'in', journal_list), )
-            if analytic:
-                domain.append(
-                    ('analytic_line_ids', 'in', analytic))
-            if method is not None and 'cash' in method:
-                domain.append(('journal_id', 'in',
-                               self.env.company.tax_cash_basis_journal_id.ids))
-            initial_move_line_ids = self.env['account.move.line'].search(
-                domain)
-            initial_total_debit = round(
-                sum(initial_move_line_ids.mapped('debit')), 2)
-            initial_total_credit = round(
-                sum(initial_move_line_ids.mapped('credit')), 2)
-            if comparison_number:
+        domain = [('parent_state', 'in', option_domain), ]
+        if journal_list:
+            domain.append(
+                ('journal_id', 'in', journal_list), )
+        if analytic:
+            domain.append(
+                ('analytic_line_ids', 'in', analytic))
+        if method is not None and 'cash' in method:
+            domain.append(('journal_id', 'in',
+                           self.env.company.tax_cash_basis_journal_id.ids))
+        dynamic_date_num = {}
+        periods = {}
+        if comparison_number:
+            if comparison_type == 'month':
+                dynamic_date_num[
+                    f"dynamic_date_num{0}"] = self.get_month_name(
+                    start_date) + ' ' + str(start_date.year)
+            elif comparison_type == 'quarter':
+                dynamic_date_num[
+                    f"dynamic_date_num{0}"] = 'Q' + ' ' + str(
+                    get_quarter_number(start_date)) + ' ' + str(
+                    start_date.year)
+            for i in range(1, comparison_number + 1):
                 if comparison_type == 'year':
-                    for i in range(1, eval(comparison_number) + 1):
-                        com_start_date = subtract(start_date, years=i)
-                        com_end_date = subtract(end_date, years=i)
-                        domain = [('date', '>=', com_start_date),
-                                  ('account_id', '=', account_id.id),
-                                  ('date', '<=', com_end_date),
-                                  ('parent_state', 'in', option_domain), ]
-                        if journal_list:
-                            domain.append(
-                                ('journal_id', 'in', journal_list), )
-                        if analytic:
-                            domain.append(
-                                ('analytic_line_ids', 'in', analytic))
-                        if method is not None and 'cash' in method:
-                            domain.append(('journal_id', 'in',
-                                           self.env.company.tax_cash_basis_journal_id.ids))
-                        move_lines = self.env['account.move.line'].search(
-                            domain)
-                        dynamic_total_debit[
-                            f"dynamic_total_debit_{i}"] = round(
-                            sum(move_lines.mapped('debit')), 2)
-                        dynamic_total_credit[
-                            f"dynamic_total_credit_{i}"] = round(
-                            sum(move_lines.mapped('credit')), 2)
-                if comparison_type == 'month':
+                    com_start_date = subtract(start_date, years=i)
+                    com_end_date = subtract(end_date, years=i)
+                elif comparison_type == 'month':
+                    com_start_date = subtract(start_date, months=i)
+                    com_end_date = subtract(end_date, months=i)
                     dynamic_date_num[
-                        f"dynamic_date_num{0}"] = self.get_month_name(
-                        start_date) + ' ' + str(
-                        start_date.year)
-                    for i in range(1, eval(comparison_number) + 1):
-                        com_start_date = subtract(start_date, months=i)
-                        com_end_date = subtract(end_date, months=i)
-                        domain = [('date', '>=', com_start_date),
-                                  ('account_id', '=', account_id.id),
-                                  ('date', '<=', com_end_date),
-                                  ('parent_state', 'in', option_domain), ]
-                        if journal_list:
-                            domain.append(
-                                ('journal_id', 'in', journal_list), )
-                        if analytic:
-                            domain.append(
-                                ('analytic_line_ids', 'in', analytic))
-                        if method is not None and 'cash' in method:
-                            domain.append(('journal_id', 'in',
-                                           self.env.company.tax_cash_basis_journal_id.ids), )
-                        move_lines = self.env['account.move.line'].search(
-                            domain)
-                        dynamic_date_num[
-                            f"dynamic_date_num{i}"] = self.get_month_name(
-                            com_start_date) + ' ' + str(
-                            com_start_date.year)
-                        dynamic_total_debit[
-                            f"dynamic_total_debit_{i}"] = round(
-                            sum(move_lines.mapped('debit')), 2)
-                        dynamic_total_credit[
-                            f"dynamic_total_credit_{i}"] = round(
-                            sum(move_lines.mapped('credit')), 2)
-                if comparison_type == 'quarter':
+                        f"dynamic_date_num{i}"] = self.get_month_name(
+                        com_start_date) + ' ' + str(com_start_date.year)
+                elif comparison_type == 'quarter':
+                    com_start_date = subtract(start_date, months=i * 3)
+                    com_end_date = subtract(end_date, months=i * 3)
                     dynamic_date_num[
-                        f"dynamic_date_num{0}"] = 'Q' + ' ' + str(
-                        get_quarter_number(start_date)) + ' ' + str(
-                        start_date.year)
-                    for i in range(1, eval(comparison_number) + 1):
-                        com_start_date = subtract(start_date, months=i * 3)
-                        com_end_date = subtract(end_date, months=i * 3)
-                        domain = [('date', '>=', com_start_date),
-                                  ('account_id', '=', account_id.id),
-                                  ('date', '<=', com_end_date),
-                                  ('parent_state', 'in', option_domain), ]
-                        if journal_list:
-                            domain.append(
-                                ('journal_id', 'in', journal_list), )
-                        if analytic:
-                            domain.append(
-                                ('analytic_line_ids', 'in', analytic))
-                        if method is not None and 'cash' in method:
-                            domain.append(('journal_id', 'in',
-                                           self.env.company.tax_cash_basis_journal_id.ids))
-                        move_lines = self.env['account.move.line'].search(
-                            domain)
-                        dynamic_date_num[
-                            f"dynamic_date_num{i}"] = 'Q' + ' ' + str(
-                            get_quarter_number(com_start_date)) + ' ' + str(
-                            com_start_date.year)
-                        dynamic_total_debit[
-                            f"dynamic_total_debit_{i}"] = round(
-                            sum(move_lines.mapped('debit')), 2)
-                        dynamic_total_credit[
-                            f"dynamic_total_credit_{i}"] = round(
-                            sum(move_lines.mapped('credit')), 2)
-            domain = [('date', '>=', start_date),
-                      ('account_id', '=', account_id.id),
-                      ('date', '<=', end_date),
-                      ('parent_state', 'in', option_domain), ]
-            if journal_list:
-                domain.append(
-                    ('journal_id', 'in', journal_list), )
-            if analytic:
-                domain.append(
-                    ('analytic_line_ids', 'in', analytic))
-            if method is not None and 'cash' in method:
-                domain.append(('journal_id', 'in',
-                               self.env.company.tax_cash_basis_journal_id.ids))
-            move_line_ids = self.env['account.move.line'].search(domain)
-            total_debit = round(sum(move_line_ids.mapped('debit')), 2)
-            total_credit = round(sum(move_line_ids.mapped('credit')), 2)
-            sum_debit = initial_total_debit + sum(
-                dynamic_total_debit.values()) + total_debit
-            sum_credit = initial_total_credit + sum(
-                dynamic_total_credit.values()) + total_credit
+                        f"dynamic_date_num{i}"] = 'Q' + ' ' + str(
+                        get_quarter_number(com_start_date)) + ' ' + str(
+                        com_start_date.year)
+                else:
+                    break
+                periods[i] = (com_start_date, com_end_date)
+            if comparison_type == 'month':
+                initial_start_date = subtract(start_date,
+                                              months=comparison_number)
+            elif comparison_type == 'year':
+                initial_start_date = subtract(start_date,
+                                              years=comparison_number)
+            else:
+                initial_start_date = subtract(start_date,
+                                              months=comparison_number * 3)
+        else:
+            initial_start_date = start_date
+        periods['initial'] = (None, initial_start_date - timedelta(days=1))
+        periods['period'] = (start_date, end_date)
+        balances = self._get_period_balances(domain, periods)
+        journal_ids = self.env['account.journal'].search_read([], ['name'])
+        move_line_list = []
+        for account_id in account_ids:
+            account_balance = {
+                period: tuple(round(amount, 2) for amount in amounts)
+                for period, amounts in balances.get(account_id.id, {}).items()
+            }
+            initial_total_debit, initial_total_credit = account_balance.get(
+                'initial', (0.0, 0.0))
+            total_debit, total_credit = account_balance.get(
+                'period', (0.0, 0.0))
+            sum_debit = sum(debit for debit, credit in account_balance.values())
+            sum_credit = sum(
+                credit for debit, credit in account_balance.values())
             diff_credit_debit = sum_debit - sum_credit
             if diff_credit_debit > 0:
                 end_total_debit = diff_credit_debit
@@ -292,8 +227,7 @@ class AccountTrialBalance(models.TransientModel):
             data = {
                 'account': account_id.display_name,
                 'account_id': account_id.id,
-                'journal_ids': self.env['account.journal'].search_read([], [
-                    'name']),
+                'journal_ids': journal_ids,
                 'initial_total_debit': initial_total_debit,
                 'initial_total_credit': initial_total_credit,
                 'total_debit': total_debit,
@@ -304,14 +238,10 @@ class AccountTrialBalance(models.TransientModel):
             if comparison_number:
                 if dynamic_date_num:
                     data['dynamic_date_num'] = dynamic_date_num
-                for i in range(1, eval(comparison_number) + 1):
-                    data[f'dynamic_total_debit_{i}'] = dynamic_total_debit.get(
-                        f"dynamic_total_debit_{eval(comparison_number) + 1 - i}",
-                        0.0)
-                    data[
-                        f'dynamic_total_credit_{i}'] = dynamic_total_credit.get(
-                        f"dynamic_total_credit_{eval(comparison_number) + 1 - i}",
-                        0.0)
+                for i in range(1, comparison_number + 1):
+                    data[f'dynamic_total_debit_{i}'], data[
+                        f'dynamic_total_credit_{i}'] = account_balance.get(
+                        comparison_number + 1 - i, (0.0, 0.0))
             move_line_list.append(data)
         return move_line_list
 
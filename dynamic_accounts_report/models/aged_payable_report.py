@@ -22,135 +22,87 @@
 import io
 import json
 import xlsxwriter
-from odoo import api, fields, models
+from odoo import api, models
 
 
 class AgePayableReport(models.TransientModel):
     """For creating Age Payable report"""
     _name = 'age.payable.report'
+    _inherit = 'dynamic.report.mixin'
     _description = 'Aged Payable Report'
 
     @api.model
-    def view_report(self):
+    def view_report(self, lazy=False, bucket_edges=None):
         """
         Generate a report with move line data categorized by partner and credit
         difference.
+        Parameters:
+            lazy (bool): Only return the partner totals, the lines of a
+                         partner are fetched with get_partner_lines.
+            bucket_edges (list): Day boundaries of the aging buckets.
         Returns:
             dict: Dictionary containing move line data categorized by partner
                   names. Each partner's data includes credit amounts and credit
                   differences based on days between maturity date and today. The
                   'partner_totals' key contains summary data for each partner.
         """
-        partner_total = {}
-        move_line_list = {}
-        paid = self.env['account.move.line'].search(
-            [('parent_state', '=', 'posted'),
-             ('account_type', '=', 'liability_payable'),
-             ('reconciled', '=', False)])
-        currency_id = self.env.company.currency_id.symbol
-        partner_ids = paid.mapped('partner_id')
-        today = fields.Date.today()
-        for partner_id in partner_ids:
-            move_line_ids = paid.filtered(
-                lambda rec: rec.partner_id in partner_id)
-            move_line_data = move_line_ids.read(
-                ['name', 'move_name', 'date', 'amount_currency', 'account_id',
-                 'date_maturity', 'currency_id', 'credit', 'move_id'])
-            for val in move_line_data:
-                diffrence = (today - val['date_maturity']).days
-                val['diff0'] = val['credit'] if diffrence <= 0 else 0.0
-                val['diff1'] = val['credit'] if 0 < diffrence <= 30 else 0.0
-                val['diff2'] = val['credit'] if 30 < diffrence <= 60 else 0.0
-                val['diff3'] = val['credit'] if 60 < diffrence <= 90 else 0.0
-                val['diff4'] = val['credit'] if 90 < diffrence <= 120 else 0.0
-                val['diff5'] = val['credit'] if diffrence > 120 else 0.0
-            move_line_list[partner_id.name] = move_line_data
-            partner_total[partner_id.name] = {
-                'credit_sum': sum(val['credit'] for val in move_line_data),
-                'diff0_sum': round(sum(val['diff0'] for val in move_line_data),
-                                   2),
-                'diff1_sum': round(sum(val['diff1'] for val in move_line_data),
-                                   2),
-                'diff2_sum': round(sum(val['diff2'] for val in move_line_data),
-                                   2),
-                'diff3_sum': round(sum(val['diff3'] for val in move_line_data),
-                                   2),
-                'diff4_sum': round(sum(val['diff4'] for val in move_line_data),
-                                   2),
-                'diff5_sum': round(sum(val['diff5'] for val in move_line_data),
-                                   2),
-                'currency_id': currency_id,
-                'partner_id': partner_id.id
-            }
-        move_line_list['partner_totals'] = partner_total
-        return move_line_list
+        return self._get_aged_report_values(
+            self._get_payable_domain(), 'credit', lazy=lazy,
+            bucket_edges=bucket_edges)
 
     @api.model
-    def get_filter_values(self, date, partner):
+    def get_filter_values(self, date, partner, lazy=False, bucket_edges=None):
         """
         Retrieve filtered move line data based on date and partner(s).
         Parameters:
             date (str): Date for filtering move lines (format: 'YYYY-MM-DD').
             partner (list): List of partner IDs to filter move lines for.
+            lazy (bool): Only return the partner totals, the lines of a
+                         partner are fetched with get_partner_lines.
+            bucket_edges (list): Day boundaries of the aging buckets.
         Returns:
             dict: Dictionary with filtered move line data organized by partner
                   names. Includes credit amount categorization based on days
                   difference. Contains partner-wise summary under
                   'partner_totals' key.
         """
-        partner_total = {}
-        move_line_list = {}
+        return self._get_aged_report_values(
+            self._get_payable_domain(date), 'credit', partner, lazy,
+            bucket_edges)
+
+    @api.model
+    def get_partner_lines(self, partner_id, date=None, bucket_edges=None):
+        """
+        Retrieve the open payable lines of one partner, used to unfold a
+        partner of a report loaded lazily.
+        Parameters:
+            partner_id (int): ID of the partner to unfold.
+            date (str): Date for filtering move lines (format: 'YYYY-MM-DD').
+            bucket_edges (list): Day boundaries of the aging buckets.
+        Returns:
+            list: The move lines of the partner with their aging buckets.
+        """
+        domain = self._get_payable_domain(date) + [
+            ('partner_id', '=', partner_id)]
+        return self._get_aged_lines(
+            domain, self._get_aged_line_fields('credit'), 'credit',
+            bucket_edges).get(partner_id, [])
+
+    @api.model
+    def _get_payable_domain(self, date=None):
+        """
+        Return the domain of the open payable lines of the report.
+        Parameters:
+            date (str): Only keep the lines up to this date.
+        Returns:
+            list: Domain on account.move.line.
+        """
+        domain = [('parent_state', '=', 'posted'),
+                  ('account_type', '=', 'liability_payable'),
+                  ('reconciled', '=', False)]
         if date:
-            paid = self.env['account.move.line'].search(
-                [('parent_state', '=', 'posted'),
-                 ('account_type', '=', 'liability_payable'),
-                 ('reconciled', '=', False), ('date', '<=', date)])
-        else:
-            paid = self.env['account.move.line'].search(
-                [('parent_state', '=', 'posted'),
-                 ('account_type', '=', 'liability_payable'),
-                 ('reconciled', '=', False)])
-        currency_id = self.env.company.currency_id.symbol
-        if partner:
-            partner_ids = self.env['res.partner'].search(
-                [('id', 'in', partner)])
-        else:
-            partner_ids = paid.mapped('partner_id')
-        today = fields.Date.today()
-        for partner_id in partner_ids:
-            move_line_ids = paid.filtered(
-                lambda rec: rec.partner_id in partner_id)
-            move_line_data = move_line_ids.read(
-                ['name', 'move_name', 'date', 'amount_currency', 'account_id',
-                 'date_maturity', 'currency_id', 'credit', 'move_id'])
-            for val in move_line_data:
-                diffrence = (today - val['date_maturity']).days
-                val['diff0'] = val['credit'] if diffrence <= 0 else 0.0
-                val['diff1'] = val['credit'] if 0 < diffrence <= 30 else 0.0
-                val['diff2'] = val['credit'] if 30 < diffrence <= 60 else 0.0
-                val['diff3'] = val['credit'] if 60 < diffrence <= 90 else 0.0
-                val['diff4'] = val['credit'] if 90 < diffrence <= 120 else 0.0
-                val['diff5'] = val['credit'] if diffrence > 120 else 0.0
-            move_line_list[partner_id.name] = move_line_data
-            partner_total[partner_id.name] = {
-                'credit_sum': sum(val['credit'] for val in move_line_data),
-                'diff0_sum': round(sum(val['diff0'] for val in move_line_data),
-                                   2),
-                'diff1_sum': round(sum(val['diff1'] for val in move_line_data),
-                                   2),
-                'diff2_sum': round(sum(val['diff2'] for val in move_line_data),
-                                   2),
-                'diff3_sum': round(sum(val['diff3'] for val in move_line_data),
-                                   2),
-                'diff4_sum': round(sum(val['diff4'] for val in move_line_data),
-                                   2),
-                'diff5_sum': round(sum(val['diff5'] for val in move_line_data),
-                                   2),
-                'currency_id': currency_id,
-                'partner_id': partner_id.id
-            }
-        move_line_list['partner_totals'] = partner_total
-        return move_line_list
+            domain.append(('date', '<=', date))
+        return domain
 
     @api.model
     def get_xlsx_report(self, data, response, report_name, report_action):
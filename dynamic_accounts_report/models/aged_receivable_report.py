@@ -23,16 +23,17 @@ import io
 import json
 
 import xlsxwriter
-from odoo import models, fields, api
+from odoo import models, api
 
 
 class AgeReceivableReport(models.TransientModel):
     """For creating Age Receivable report"""
     _name = 'age.receivable.report'
+    _inherit = 'dynamic.report.mixin'
     _description = 'Aged Receivable Report'
 
     @api.model
-    def view_report(self):
+    def view_report(self, lazy=False, bucket_edges=None):
         """
         Generate a report with move line data categorized by partner and debit
         difference. This method retrieves move line data from the
@@ -41,92 +42,38 @@ class AgeReceivableReport(models.TransientModel):
         data by each partner's name. For each move line, it calculates the debit
         difference based on the number of days between today's date and the
         maturity date of the move line.
+        Parameters:
+            lazy (bool): Only return the partner totals, the lines of a
+                         partner are fetched with get_partner_lines.
+            bucket_edges (list): Day boundaries of the aging buckets.
         Returns:
         dict: Dictionary containing move line data categorized by partner names.
               Each partner's data includes debit amounts and debit differences
               based on days between maturity date and today.
               The 'partner_totals' key contains summary data for each partner.
         """
-        partner_total = {}
-        move_line_list = {}
-        paid = self.env['account.move.line'].search(
-            [('parent_state', '=', 'posted'),
-             ('account_type', '=', 'asset_receivable'),
-             ('reconciled', '=', False)])
-        currency_id = self.env.company.currency_id.symbol
-        partner_ids = paid.mapped('partner_id')
-        today = fields.Date.today()
-
-        # Define a helper function to format numbers with thousand separators
-        def format_number(value):
-            return "{:,.2f}".format(value)  # Adds thousand separator and 2 decimal places
-
-        for partner_id in partner_ids:
-            move_line_ids = paid.filtered(
-                lambda rec: rec.partner_id in partner_id)
-            move_line_data = move_line_ids.read(
-                ['name', 'move_name', 'date', 'amount_currency', 'account_id',
-                 'date_maturity', 'currency_id', 'debit', 'move_id'])
-            for val in move_line_data:
-                difference = 0  # Initialize difference to avoid undefined variable
-                if val['date_maturity']:
-                    difference = (today - val['date_maturity']).days
-                # Keep raw numeric values for calculations
-                val['raw_amount_currency'] = val['amount_currency']
-                val['raw_debit'] = val['debit']
-                val['diff0'] = val['debit'] if difference <= 0 else 0.0
-                val['diff1'] = val['debit'] if 0 < difference <= 30 else 0.0
-                val['diff2'] = val['debit'] if 30 < difference <= 60 else 0.0
-                val['diff3'] = val['debit'] if 60 < difference <= 90 else 0.0
-                val['diff4'] = val['debit'] if 90 < difference <= 120 else 0.0
-                val['diff5'] = val['debit'] if difference > 120 else 0.0
-                # Keep raw values for diff fields
-                val['raw_diff0'] = val['diff0']
-                val['raw_diff1'] = val['diff1']
-                val['raw_diff2'] = val['diff2']
-                val['raw_diff3'] = val['diff3']
-                val['raw_diff4'] = val['diff4']
-                val['raw_diff5'] = val['diff5']
-                # Format the numeric fields for display
-                val['amount_currency'] = format_number(val['amount_currency'])
-                val['debit'] = format_number(val['debit'])
-                val['diff0'] = format_number(val['diff0'])
-                val['diff1'] = format_number(val['diff1'])
-                val['diff2'] = format_number(val['diff2'])
-                val['diff3'] = format_number(val['diff3'])
-                val['diff4'] = format_number(val['diff4'])
-                val['diff5'] = format_number(val['diff5'])
-            move_line_list[partner_id.name] = move_line_data
-            partner_total[partner_id.name] = {
-                'debit_sum': sum(val['raw_debit'] for val in move_line_data),
-                'diff0_sum': round(sum(val['raw_diff0'] for val in move_line_data), 2),
-                'diff1_sum': round(sum(val['raw_diff1'] for val in move_line_data), 2),
-                'diff2_sum': round(sum(val['raw_diff2'] for val in move_line_data), 2),
-                'diff3_sum': round(sum(val['raw_diff3'] for val in move_line_data), 2),
-                'diff4_sum': round(sum(val['raw_diff4'] for val in move_line_data), 2),
-                'diff5_sum': round(sum(val['raw_diff5'] for val in move_line_data), 2),
-                # Format the summary fields for display
-                'debit_sum_display': format_number(sum(val['raw_debit'] for val in move_line_data)),
-                'diff0_sum_display': format_number(round(sum(val['raw_diff0'] for val in move_line_data), 2)),
-                'diff1_sum_display': format_number(round(sum(val['raw_diff1'] for val in move_line_data), 2)),
-                'diff2_sum_display': format_number(round(sum(val['raw_diff2'] for val in move_line_data), 2)),
-                'diff3_sum_display': format_number(round(sum(val['raw_diff3'] for val in move_line_data), 2)),
-                'diff4_sum_display': format_number(round(sum(val['raw_diff4'] for val in move_line_data), 2)),
-                'diff5_sum_display': format_number(round(sum(val['raw_diff5'] for val in move_line_data), 2)),
-                'currency_id': currency_id,
-                'partner_id': partner_id.id
-            }
-        move_line_list['partner_totals'] = partner_total
-        return move_line_list
+        values = self._get_aged_report_values(
+            self._get_receivable_domain(), 'debit', lazy=lazy,
+            bucket_edges=bucket_edges)
+        for partner_name, move_line_data in values.items():
+            if partner_name != 'partner_totals':
+                self._format_move_lines(move_line_data)
+        for total in values['partner_totals'].values():
+            for key in [key for key in total if key.endswith('_sum')]:
+                total[f'{key}_display'] = self._format_number(total[key])
+        return values
 
     @api.model
-    def get_filter_values(self, date, partner):
+    def get_filter_values(self, date, partner, lazy=False, bucket_edges=None):
         """
          Retrieve move line data categorized by partner and debit difference.
 
          Parameters:
              date (str): Date for filtering move lines (format: 'YYYY-MM-DD').
              partner (list): List of partner IDs to filter move lines for.
+             lazy (bool): Only return the partner totals, the lines of a
+                          partner are fetched with get_partner_lines.
+             bucket_edges (list): Day boundaries of the aging buckets.
 
          Returns:
              dict: Dictionary containing move line data categorized by partner
@@ -134,61 +81,81 @@ class AgeReceivableReport(models.TransientModel):
                    difference.Contains partner-wise summary under
                    'partner_totals' key.
          """
-        partner_total = {}
-        move_line_list = {}
+        return self._get_aged_report_values(
+            self._get_receivable_domain(date), 'debit', partner, lazy,
+            bucket_edges)
+
+    @api.model
+    def get_partner_lines(self, partner_id, date=None, bucket_edges=None,
+                          formatted=False):
+        """
+        Retrieve the open receivable lines of one partner, used to unfold a
+        partner of a report loaded lazily.
+
+        Parameters:
+            partner_id (int): ID of the partner to unfold.
+            date (str): Date for filtering move lines (format: 'YYYY-MM-DD').
+            bucket_edges (list): Day boundaries of the aging buckets.
+            formatted (bool): Format the amounts with thousand separators,
+                              keeping the raw values under 'raw_' keys.
+
+        Returns:
+            list: The move lines of the partner with their aging buckets.
+        """
+        domain = self._get_receivable_domain(date) + [
+            ('partner_id', '=', partner_id)]
+        move_line_data = self._get_aged_lines(
+            domain, self._get_aged_line_fields('debit'), 'debit',
+            bucket_edges).get(partner_id, [])
+        if formatted:
+            self._format_move_lines(move_line_data)
+        return move_line_data
+
+    @api.model
+    def _get_receivable_domain(self, date=None):
+        """
+        Return the domain of the open receivable lines of the report.
+
+        Parameters:
+            date (str): Only keep the lines up to this date.
+
+        Returns:
+            list: Domain on account.move.line.
+        """
+        domain = [('parent_state', '=', 'posted'),
+                  ('account_type', '=', 'asset_receivable'),
+                  ('reconciled', '=', False)]
         if date:
-            paid = self.env['account.move.line'].search(
-                [('parent_state', '=', 'posted'),
-                 ('account_type', '=', 'asset_receivable'),
-                 ('reconciled', '=', False), ('date', '<=', date)])
-        else:
-            paid = self.env['account.move.line'].search(
-                [('parent_state', '=', 'posted'),
-                 ('account_type', '=', 'asset_receivable'),
-                 ('reconciled', '=', False)])
-        currency_id = self.env.company.currency_id.symbol
-        if partner:
-            partner_ids = self.env['res.partner'].search(
-                [('id', 'in', partner)])
-        else:
-            partner_ids = paid.mapped('partner_id')
-        today = fields.Date.today()
-        for partner_id in partner_ids:
-            move_line_ids = paid.filtered(
-                lambda rec: rec.partner_id in partner_id)
-            move_line_data = move_line_ids.read(
-                ['name', 'move_name', 'date', 'amount_currency', 'account_id',
-                 'date_maturity', 'currency_id', 'debit', 'move_id'])
-            for val in move_line_data:
-                diffrence = 0
-                if val['date_maturity']:
-                    diffrence = (today - val['date_maturity']).days
-                val['diff0'] = val['debit'] if diffrence <= 0 else 0.0
-                val['diff1'] = val['debit'] if 0 < diffrence <= 30 else 0.0
-                val['diff2'] = val['debit'] if 30 < diffrence <= 60 else 0.0
-                val['diff3'] = val['debit'] if 60 < diffrence <= 90 else 0.0
-                val['diff4'] = val['debit'] if 90 < diffrence <= 120 else 0.0
-                val['diff5'] = val['debit'] if diffrence > 120 else 0.0
-            move_line_list[partner_id.name] = move_line_data
-            partner_total[partner_id.name] = {
-                'debit_sum': sum(val['debit'] for val in move_line_data),
-                'diff0_sum': round(sum(val['diff0'] for val in move_line_data),
-                                   2),
-                'diff1_sum': round(sum(val['diff1'] for val in move_line_data),
-                                   2),
-                'diff2_sum': round(sum(val['diff2'] for val in move_line_data),
-                                   2),
-                'diff3_sum': round(sum(val['diff3'] for val in move_line_data),
-                                   2),
-                'diff4_sum': round(sum(val['diff4'] for val in move_line_data),
-                                   2),
-                'diff5_sum': round(sum(val['diff5'] for val in move_line_data),
-                                   2),
-                'currency_id': currency_id,
-                'partner_id': partner_id.id
-            }
-        move_line_list['partner_totals'] = partner_total
-        return move_line_list
+            domain.append(('date', '<=', date))
+        return domain
+
+    @api.model
+    def _format_move_lines(self, move_line_data):
+        """
+        Format the amounts of the move lines for display, keeping the raw
+        numeric values under 'raw_' keys for calculations.
+
+        Parameters:
+            move_line_data (list): The move lines to format in place.
+        """
+        for val in move_line_data:
+            for key in ['amount_currency', 'debit'] + [
+                    key for key in val if key.startswith('diff')]:
+                val[f'raw_{key}'] = val[key]
+                val[key] = self._format_number(val[key])
+
+    @api.model
+    def _format_number(self, value):
+        """
+        Format a number with thousand separators and 2 decimal places.
+
+        Parameters:
+            value (float): The number to format.
+
+        Returns:
+            str: The formatted number.
+        """
+        return "{:,.2f}".format(value)
 
     @api.model
     def get_xlsx_report(self, data, response, report_name, report_action):
@@ -21,20 +21,20 @@
 ################################################################################
 import io
 import json
-from dateutil.relativedelta import relativedelta
 import xlsxwriter
-from datetime import datetime
-from odoo.tools import date_utils
-from odoo import api, fields, models
+from odoo import api, models
 
 
 class BankBookReport(models.TransientModel):
     """For creating Bank Book report"""
     _name = 'bank.book.report'
+    _inherit = 'journal.book.mixin'
     _description = 'Account Bank Book Report'
 
+    _journal_type = 'bank'
+
     @api.model
-    def view_report(self):
+    def view_report(self, lazy=False):
         """
         This method retrieves and returns the necessary data for the partner
         ledger report.It fetches account move lines, grouped by accounts, and
@@ -42,34 +42,22 @@ class BankBookReport(models.TransientModel):
         move lines for each account and the total debit and credit amounts for
         each account.
         """
-        data = {}
-        move_lines_total = {}
-        journals = self.env['account.journal'].search(
-            [('type', '=', 'bank')])
-        account_move_lines = self.env['account.move.line'].search(
-            [('parent_state', '=', 'posted'),
-             ('journal_id', 'in', journals.ids)])
-        accounts = account_move_lines.mapped('account_id').read(
+        return self._get_cached_values('_get_report_values', lazy,
+                                       cache=lazy)
+
+    @api.model
+    def _get_report_values(self, lazy=False):
+        """Compute the result of view_report, see there."""
+        data = self._get_book_values(self._get_book_domain(), lazy=lazy)
+        data['accounts'] = self.env['account.account'].browse(
+            [values['account_id'] for values in
+             data['move_lines_total'].values()]).read(
             ['display_name', 'name'])
-        for account in accounts:
-            move_lines = account_move_lines.filtered(
-                lambda x: x.account_id.id == account['id'])
-            move_line_data = move_lines.read(
-                ['date', 'journal_id', 'partner_id', 'move_name', 'debit',
-                 'move_id',
-                 'credit', 'name', 'ref'])
-            data[move_lines.mapped('account_id').display_name] = move_line_data
-            currency_id = self.env.company.currency_id.symbol
-            move_lines_total[move_lines.mapped('account_id').display_name] = {
-                'total_debit': round(sum(move_lines.mapped('debit')), 2),
-                'total_credit': round(sum(move_lines.mapped('credit')), 2),
-                'currency_id': currency_id}
-        data['move_lines_total'] = move_lines_total
-        data['accounts'] = accounts
         return data
 
     @api.model
-    def get_filter_values(self, partner_id, data_range, account_list, options):
+    def get_filter_values(self, partner_id, data_range, account_list,
+                          options, lazy=False):
         """
         Retrieve filtered data for the partner ledger report.
         Args:
@@ -87,96 +75,25 @@ class BankBookReport(models.TransientModel):
             options (dict or None): Additional filtering options with 'draft'
                                     key (boolean) to include draft moves if
                                     True.
+            lazy (bool): Return only the account totals, the lines of each
+                         account are then fetched page by page with
+                         get_account_lines.
         Returns:
             dict: Filtered data for the partner ledger report, grouped by
                   accounts and summary of total debit and credit amounts.
         """
-        data = {}
-        move_lines_total = {}
-        today = fields.Date.today()
-        quarter_start, quarter_end = date_utils.get_quarter(today)
-        previous_quarter_start = quarter_start - relativedelta(months=3)
-        previous_quarter_end = quarter_start - relativedelta(days=1)
-        journals = self.env['account.journal'].search([('type', '=', 'bank')])
-        option_domain = ['posted']
-        if options is not None:
-            if 'draft' in options:
-                option_domain = ['posted', 'draft']
-        if partner_id:
-            domain = [('parent_state', 'in', option_domain),
-                      ('journal_id', 'in', journals.ids),
-                      ('partner_id', 'in', partner_id), ]
-        else:
-            domain = [('parent_state', 'in', option_domain),
-                      ('journal_id', 'in', journals.ids), ]
-        if account_list:
-            domain += ('account_id', 'in', account_list),
-        if data_range:
-            if data_range == 'month':
-                account_move_lines = self.env['account.move.line'].search(
-                    domain).filtered(
-                    lambda x: x.date.month == fields.Date.today().month)
-            elif data_range == 'year':
-                account_move_lines = self.env['account.move.line'].search(
-                    domain).filtered(
-                    lambda x: x.date.year == fields.Date.today().year)
-            elif data_range == 'quarter':
-                domain += ('date', '>=', quarter_start), (
-                    'date', '<=', quarter_end)
-                account_move_lines = self.env['account.move.line'].search(
-                    domain)
-            elif data_range == 'last-month':
-                account_move_lines = self.env['account.move.line'].search(
-                    domain).filtered(
-                    lambda x: x.date.month == fields.Date.today().month - 1)
-            elif data_range == 'last-year':
-                account_move_lines = self.env['account.move.line'].search(
-                    domain).filtered(
-                    lambda x: x.date.year == fields.Date.today().year - 1)
-            elif data_range == 'last-quarter':
-                domain += ('date', '>=', previous_quarter_start), (
-                    'date', '<=', previous_quarter_end)
-                account_move_lines = self.env['account.move.line'].search(
-                    domain)
-            elif 'start_date' in data_range and 'end_date' in data_range:
-                start_date = datetime.strptime(data_range['start_date'],
-                                               '%Y-%m-%d').date()
-                end_date = datetime.strptime(data_range['end_date'],
-                                             '%Y-%m-%d').date()
-                domain += ('date', '>=', start_date), ('date', '<=', end_date),
-                account_move_lines = self.env['account.move.line'].search(
-                    domain)
-            elif 'start_date' in data_range:
-                start_date = datetime.strptime(data_range['start_date'],
-                                               '%Y-%m-%d').date()
-                domain.append(('date', '>=', start_date))
-                account_move_lines = self.env['account.move.line'].search(
-                    domain)
-            elif 'end_date' in data_range:
-                end_date = datetime.strptime(data_range['end_date'],
-                                             '%Y-%m-%d').date()
-                domain.append(('date', '<=', end_date))
-                account_move_lines = self.env['account.move.line'].search(
-                    domain)
-        else:
-            account_move_lines = self.env['account.move.line'].search(domain)
-        accounts = account_move_lines.mapped('account_id').read(
-            ['display_name'])
-        for account in accounts:
-            move_lines = account_move_lines.filtered(
-                lambda x: x.account_id.id == account['id'])
-            move_line_data = move_lines.read(
-                ['date', 'journal_id', 'partner_id', 'move_name', 'debit',
-                 'move_id',
-                 'credit', 'name', 'ref'])
-            data[move_lines.mapped('account_id').display_name] = move_line_data
-            currency_id = self.env.company.currency_id.symbol
-            move_lines_total[move_lines.mapped('account_id').display_name] = {
-                'total_debit': round(sum(move_lines.mapped('debit')), 2),
-                'total_credit': round(sum(move_lines.mapped('credit')), 2),
-                'currency_id': currency_id}
-        data['move_lines_total'] = move_lines_total
-        return data
+        return self._get_cached_values('_get_filter_values', partner_id,
+                                       data_range, account_list, options,
+                                       lazy, cache=lazy)
+
+    @api.model
+    def _get_filter_values(self, partner_id, data_range, account_list,
+                           options, lazy=False):
+        """Compute the result of get_filter_values, see there."""
+        date_from, date_to = self._get_date_range_bounds(data_range)
+        return self._get_book_values(
+            self._get_book_domain(partner_id, account_list, options),
+            date_from, date_to, lazy)
 
     @api.model
     def get_xlsx_report(self, data, response, report_name, report_action):
@@ -32,6 +32,7 @@ from odoo.tools.date_utils import get_month, get_fiscal_year, get_quarter, \
 class ProfitLossReport(models.TransientModel):
     """For creating Profit and Loss and Balance sheet report."""
     _name = 'dynamic.balance.sheet.report'
+    _inherit = 'dynamic.report.mixin'
     _description = 'Profit Loss Report'
 
     company_id = fields.Many2one('res.company', required=True,
@@ -91,142 +92,51 @@ class ProfitLossReport(models.TransientModel):
             target_move = ['posted', 'draft']
         else:
             target_move = ['posted']
+        periods = {}
         if comparison:
             for count in range(0, int(comparison) + 1):
                 if comparison_type == "month":
-                    account_move_lines = self.env['account.move.line'].search(
-                        [(
-                            'parent_state', 'in', target_move),
-                            ('date', '>=', (current_date - datetime.timedelta(
-                                days=30 * count)).strftime('%Y-%m-01')),
-                            ('date', '<=', (current_date - datetime.timedelta(
-                                days=30 * count)).strftime('%Y-%m-12'))])
+                    periods[count] = (
+                        (current_date - datetime.timedelta(
+                            days=30 * count)).strftime('%Y-%m-01'),
+                        (current_date - datetime.timedelta(
+                            days=30 * count)).strftime('%Y-%m-12'))
                 elif comparison_type == "year":
-                    account_move_lines = self.env['account.move.line'].search(
-                        [(
-                            'parent_state', 'in', target_move),
-                            ('date', '>=', f'{current_year - count}-01-01'),
-                            ('date', '<=', f'{current_year - count}-12-31')])
-                lists = [{'id': rec.id, 'value': [eval(i) for i in
-                                                  rec.analytic_distribution.keys()]}
-                         for rec in account_move_lines if
-                         rec.analytic_distribution]
-                if financial_report_id.analytic_ids:
-                    account_move_lines = account_move_lines.filtered(lambda
-                                                                         rec: rec.id in [
-                        lst['id'] for lst in lists if lst['value'] and any(
-                            i in financial_report_id.analytic_ids.mapped('id')
-                            for i in lst['value'])])
-                account_move_lines = account_move_lines.filtered(lambda
-                                                                     a: not financial_report_id.journal_ids or a.journal_id in financial_report_id.journal_ids)
-                account_move_lines = account_move_lines.filtered(lambda
-                                                                     a: not financial_report_id.account_ids or a.account_id in financial_report_id.account_ids)
-                account_move_lines = account_move_lines.filtered(lambda
-                                                                     a: not financial_report_id.date_from or a.date >= financial_report_id.date_from)
-                account_move_lines = account_move_lines.filtered(lambda
-                                                                     a: not financial_report_id.date_to or a.date <= financial_report_id.date_to)
-                account_entries = {}
-                for account_type in account_types.values():
-                    account_entries[account_type] = self._get_entries(
-                        account_move_lines, self.env['account.account'].search(
-                            [('account_type', '=', account_type)]),
-                        account_type)
-                total_income = sum(
-                    float(entry['amount'].replace(',', '')) for account_type
-                    in
-                    ['income', 'income_other'] for entry in
-                    account_entries[account_type][0]) - sum(
-                    float(entry['amount'].replace(',', '')) for entry in
-                    account_entries['expense_direct_cost'][0])
-                total_expense = sum(
-                    float(entry['amount'].replace(',', '')) for account_type
-                    in
-                    ['expense', 'expense_depreciation'] for entry in
-                    account_entries[account_type][0])
-                total_current_asset = sum(
-                    float(entry['amount'].replace(',', '')) for account_type
-                    in
-                    ['asset_receivable', 'asset_current', 'asset_cash',
-                     'asset_prepayments'] for entry in
-                    account_entries[account_type][0])
-                total_assets = total_current_asset + sum(
-                    float(entry['amount'].replace(',', '')) for account_type
-                    in
-                    ['asset_fixed', 'asset_non_current'] for entry in
-                    account_entries[account_type][0])
-                total_current_liability = sum(
-                    float(entry['amount'].replace(',', '')) for account_type
-                    in
-                    ['liability_current', 'liability_payable'] for entry in
-                    account_entries[account_type][0])
-                total_liability = total_current_liability + sum(
-                    float(entry['amount'].replace(',', '')) for account_type
-                    in
-                    ['liability_non_current'] for entry in
-                    account_entries[account_type][0])
-                total_unallocated_earning = (
-                                                    total_income - total_expense) + sum(
-                    float(entry['amount'].replace(',', '')) for account_type
-                    in
-                    ['equity_unaffected'] for entry in
-                    account_entries[account_type][0])
-                total_equity = total_unallocated_earning + sum(
-                    float(entry['amount'].replace(',', '')) for account_type
-                    in
-                    ['equity'] for entry in
-                    account_entries[account_type][0])
-                total = total_liability + total_equity
-                data = {
-                    'total': total_income - total_expense,
-                    'total_expense': "{:,.2f}".format(total_expense),
-                    'total_income': "{:,.2f}".format(total_income),
-                    'total_current_asset': "{:,.2f}".format(
-                        total_current_asset),
-                    'total_assets': "{:,.2f}".format(total_assets),
-                    'total_current_liability': "{:,.2f}".format(
-                        total_current_liability),
-                    'total_liability': "{:,.2f}".format(total_liability),
-                    'total_earnings': "{:,.2f}".format(
-                        total_income - total_expense),
-                    'total_unallocated_earning': "{:,.2f}".format(
-                        total_unallocated_earning),
-                    'total_equity': "{:,.2f}".format(total_equity),
-                    'total_balance': "{:,.2f}".format(total),
-                    **account_entries}
-                datas.append(data)
+                    periods[count] = (f'{current_year - count}-01-01',
+                                      f'{current_year - count}-12-31')
         else:
-            current_year = fields.Date.today().year
-            date_from = financial_report_id.date_from or f'{current_year}-01-01'
-            date_to = financial_report_id.date_to or f'{current_year}-12-31'
-            account_move_lines = self.env['account.move.line'].search(
-                [('parent_state', 'in', target_move),
-                 ('date', '>=', date_from),
-                 ('date', '<=', date_to)])
-            lists = [{'id': rec.id,
-                      'value': [eval(i) for i in
-                                rec.analytic_distribution.keys()]}
-                     for rec in account_move_lines if
-                     rec.analytic_distribution]
-            if financial_report_id.analytic_ids:
-                account_move_lines = account_move_lines.filtered(
-                    lambda rec: rec.id in [lst['id'] for lst in lists if
-                                           lst['value'] and any(
-                                               i in financial_report_id.analytic_ids.mapped(
-                                                   'id') for i in
-                                               lst['value'])])
-            account_move_lines = account_move_lines.filtered(lambda
-                                                                 a: not financial_report_id.journal_ids or a.journal_id in financial_report_id.journal_ids)
-            account_move_lines = account_move_lines.filtered(lambda
-                                                                 a: not financial_report_id.account_ids or a.account_id in financial_report_id.account_ids)
-            account_move_lines = account_move_lines.filtered(lambda
-                                                                 a: not financial_report_id.date_from or a.date >= financial_report_id.date_from)
-            account_move_lines = account_move_lines.filtered(lambda
-                                                                 a: not financial_report_id.date_to or a.date <= financial_report_id.date_to)
+            periods[0] = (
+                financial_report_id.date_from or f'{current_year}-01-01',
+                financial_report_id.date_to or f'{current_year}-12-31')
+        for count, (date_from, date_to) in periods.items():
+            date_from = fields.Date.to_date(date_from)
+            date_to = fields.Date.to_date(date_to)
+            if financial_report_id.date_from:
+                date_from = max(date_from, financial_report_id.date_from)
+            if financial_report_id.date_to:
+                date_to = min(date_to, financial_report_id.date_to)
+            periods[count] = (date_from, date_to)
+        domain = [('parent_state', 'in', target_move)]
+        if financial_report_id.analytic_ids:
+            domain.append(('analytic_distribution', 'in',
+                           financial_report_id.analytic_ids.ids))
+        if financial_report_id.journal_ids:
+            domain.append(
+                ('journal_id', 'in', financial_report_id.journal_ids.ids))
+        if financial_report_id.account_ids:
+            domain.append(
+                ('account_id', 'in', financial_report_id.account_ids.ids))
+        balances = self._get_period_balances(domain, periods) if periods \
+            else {}
+        accounts = self.env['account.account'].search(
+            [('account_type', 'in', list(account_types.values()))])
+        for count in periods:
             account_entries = {}
             for account_type in account_types.values():
                 account_entries[account_type] = self._get_entries(
-                    account_move_lines, self.env['account.account'].search(
-                        [('account_type', '=', account_type)]), account_type)
+                    balances, count, accounts.filtered(
+                        lambda account: account.account_type == account_type),
+                    account_type)
             total_income = sum(
                 float(entry['amount'].replace(',', '')) for account_type in
                 ['income', 'income_other'] for entry in
@@ -282,10 +192,12 @@ class ProfitLossReport(models.TransientModel):
         filters = self._get_filter_data()
         return data, filters, datas
 
-    def _get_entries(self, account_move_lines, account_ids, account_type):
+    def _get_entries(self, balances, period, account_ids, account_type):
         """
             Get the entries for the specified account type.
-            :param account_move_lines: The account move lines to filter.
+            :param balances: The debit and credit of each account and period,
+                             as returned by _get_period_balances.
+            :param period: The period of the balances to use.
             :param account_ids: The account IDs to filter.
             :param account_type: The account type.
             :return: A tuple containing the entries and the total amount.
@@ -293,18 +205,15 @@ class ProfitLossReport(models.TransientModel):
         entries = []
         total = 0
         for account in account_ids:
-            filtered_lines = account_move_lines.filtered(
-                lambda line: line.account_id == account)
-            if filtered_lines:
+            if account.id in balances:
+                debit, credit = balances[account.id][period]
                 if account_type in ['income', 'income_other',
                                     'liability_payable', 'liability_current',
                                     'liability_non_current', 'equity',
                                     'equity_unaffected']:
-                    amount = -(sum(filtered_lines.mapped('debit')) - sum(
-                        filtered_lines.mapped('credit')))
+                    amount = -(debit - credit)
                 else:
-                    amount = sum(filtered_lines.mapped('debit')) - sum(
-                        filtered_lines.mapped('credit'))
+                    amount = debit - credit
                 entries.append({
                     'name': "{} - {}".format(account.code, account.name),
                     'amount': "{:,.2f}".format(amount),
@@ -0,0 +1,505 @@
+# -*- coding: utf-8 -*-
+################################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#    Author: Bhagyadev KP (<https://www.cybrosys.com>)
+#
+#    You can modify it under the terms of the GNU LESSER
+#    GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#    You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#    (LGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+################################################################################
+import copy
+import json
+import tempfile
+from bisect import bisect_left
+from dateutil.relativedelta import relativedelta
+import xlsxwriter
+from odoo import api, fields, models, tools
+from odoo.tools import SQL, date_utils
+
+AGING_BUCKETS = [0, 30, 60, 90, 120]
+XLSX_CHUNK_SIZE = 64 * 1024
+XLSX_PAGE_SIZE = 2000
+# sequence bumped by every change of the ledger not creating journal items
+LEDGER_VERSION_SEQUENCE = 'dynamic_report_ledger_version_seq'
+# key of the postcommit data set when the transaction changed the ledger
+LEDGER_CHANGED = 'dynamic.report.ledger.changed'
+
+
+class DynamicReportMixin(models.AbstractModel):
+    """Shared computations of the dynamic accounting reports"""
+    _name = 'dynamic.report.mixin'
+    _description = 'Dynamic Report Mixin'
+
+    def init(self):
+        """Create the sequence bumped whenever the ledger changes."""
+        self.env.cr.execute(
+            "CREATE SEQUENCE IF NOT EXISTS %s" % LEDGER_VERSION_SEQUENCE)
+
+    @api.model
+    def _get_cached_values(self, method, *args, cache=True):
+        """
+        Call a report method and cache its result until the ledger changes.
+
+        The result is shared by the calls of the same report with the same
+        filters, user, companies, language and day, as long as no journal
+        item or journal entry was created, modified or deleted and no
+        account, journal or partner was renamed in between.
+
+        :param method: The name of the report method computing the result.
+        :type method: str
+
+        :param args: The filter arguments passed to the method, they must be
+        JSON serializable.
+
+        :param cache: Whether the result may be cached. The callers only
+        cache the lazy results holding the totals, the cache being bounded
+        by its number of entries and not by their size. For the same reason
+        the XLSX exports are not cached, they are streamed from the filters
+        page by page, see _get_xlsx_stream.
+        :type cache: bool
+
+        :return: A copy of the result of the method.
+        """
+        if not cache or LEDGER_CHANGED in self.env.cr.postcommit.data:
+            # the changes of the current transaction are not in the
+            # watermark until they are committed
+            return getattr(self, method)(*args)
+        options_key = json.dumps(args, sort_keys=True, default=str)
+        return copy.deepcopy(self._get_cached_report(
+            method, options_key, fields.Date.today(),
+            self._get_ledger_watermark()))
+
+    @tools.ormcache('self._name', 'self.env.uid',
+                    'tuple(self.env.companies.ids)', 'self.env.lang',
+                    'method', 'options_key', 'today', 'watermark')
+    def _get_cached_report(self, method, options_key, today, watermark):
+        """
+        Compute the cached result of _get_cached_values.
+
+        :param method: The name of the report method computing the result.
+        :param options_key: The JSON encoded arguments of the method.
+        :param today: The current date, for the relative date filters.
+        :param watermark: The ledger watermark of _get_ledger_watermark.
+        :return: The result of the method.
+        """
+        return getattr(self, method)(*json.loads(options_key))
+
+    @api.model
+    def _get_ledger_watermark(self):
+        """
+        Return a value changing whenever the ledger changes: the ledger
+        version sequence, bumped after the commit of every transaction
+        creating, modifying or deleting journal items, see
+        _mark_ledger_changed. Ids are allocated before the commit, so the
+        last journal item id would miss the items committed late by a
+        concurrent transaction.
+
+        :return: The watermark of the ledger.
+        :rtype: tuple
+        """
+        self.env.cr.execute(
+            "SELECT last_value, is_called FROM %s" % LEDGER_VERSION_SEQUENCE)
+        return self.env.cr.fetchone()
+
+    @api.model
+    def _mark_ledger_changed(self):
+        """
+        Bump the ledger version once the current transaction is committed,
+        called when journal items are created, when journal entries or items
+        are modified or deleted and when accounts, journals or partners are
+        renamed. The version is bumped after the commit so that no other
+        worker caches a report computed before the changes under the new
+        version.
+        """
+        data = self.env.cr.postcommit.data
+        if LEDGER_CHANGED not in data:
+            data[LEDGER_CHANGED] = True
+            self.env.cr.postcommit.add(self._bump_ledger_version)
+
+    @api.model
+    def _bump_ledger_version(self):
+        """Bump the ledger version in a new transaction."""
+        with self.env.registry.cursor() as cr:
+            cr.execute("SELECT nextval('%s')" % LEDGER_VERSION_SEQUENCE)
+
+    @api.model
+    def _get_date_range_bounds(self, date_range):
+        """
+        Resolve the date range filter of a report into its bounds.
+
+        :param date_range: One of 'month', 'year', 'quarter', 'last-month',
+        'last-year' and 'last-quarter' for the calendar period, or a dict with
+        optional 'start_date' and 'end_date' strings, or None.
+        :type date_range: str or dict
+
+        :return: The (date_from, date_to) bounds, either may be None.
+        :rtype: tuple
+        """
+        today = fields.Date.today()
+        if not date_range:
+            return None, None
+        if date_range == 'month':
+            return date_utils.start_of(today, 'month'), date_utils.end_of(
+                today, 'month')
+        if date_range == 'year':
+            return date_utils.start_of(today, 'year'), date_utils.end_of(
+                today, 'year')
+        if date_range == 'quarter':
+            return date_utils.get_quarter(today)
+        if date_range == 'last-month':
+            last_month = today - relativedelta(months=1)
+            return date_utils.start_of(last_month, 'month'), \
+                date_utils.end_of(last_month, 'month')
+        if date_range == 'last-year':
+            last_year = today - relativedelta(years=1)
+            return date_utils.start_of(last_year, 'year'), \
+                date_utils.end_of(last_year, 'year')
+        if date_range == 'last-quarter':
+            return date_utils.get_quarter(today - relativedelta(months=3))
+        if isinstance(date_range, dict):
+            return (fields.Date.to_date(date_range.get('start_date') or None),
+                    fields.Date.to_date(date_range.get('end_date') or None))
+        return None, None
+
+    @api.model
+    def _get_distinct_values(self, field_name, domain=None, date_from=None,
+                             date_to=None, states=None):
+        """
+        Return the distinct records referenced by a relational field of the
+        move lines, without loading the move lines themselves.
+
+        The values are computed by a grouped query restricted to the allowed
+        companies, so the memory used does not depend on the size of the
+        journal.
+
+        :param field_name: The many2one or many2many field of
+        account.move.line to collect, e.g. 'account_id' or 'tax_ids'.
+        :type field_name: str
+
+        :param domain: Additional domain on account.move.line.
+        :type domain: list
+
+        :param date_from: Only consider the lines from this date.
+        :type date_from: date
+
+        :param date_to: Only consider the lines up to this date.
+        :type date_to: date
+
+        :param states: Only consider the lines of moves in these states.
+        :type states: list
+
+        :return: The distinct records, ordered by the comodel order.
+        :rtype: recordset
+        """
+        move_line_obj = self.env['account.move.line']
+        domain = list(domain or []) + [
+            ('company_id', 'in', self.env.companies.ids)]
+        if date_from:
+            domain.append(('date', '>=', date_from))
+        if date_to:
+            domain.append(('date', '<=', date_to))
+        if states:
+            domain.append(('parent_state', 'in', states))
+        comodel = self.env[move_line_obj._fields[field_name].comodel_name]
+        groups = move_line_obj._read_group(domain, [field_name])
+        return comodel.browse([record.id for record, in groups if record])
+
+    @api.model
+    def _get_period_balances(self, domain, periods, groupby='account_id'):
+        """
+        Compute the debit and credit of several date ranges in a single
+        grouped query.
+
+        Each period is summed with a conditional aggregate, so periods may
+        overlap and a move line is read once whatever the number of periods.
+
+        :param domain: Domain on account.move.line selecting the lines.
+        :type domain: list
+
+        :param periods: The (date_from, date_to) range of each period keyed by
+        the period name, either bound may be None.
+        :type periods: dict
+
+        :param groupby: The account.move.line field, or list of fields, to
+        group the lines by. Many2many fields such as 'tax_ids' are grouped
+        through their relation table.
+        :type groupby: str or list
+
+        :return: A dictionary keyed by the value of the groupby field, or by
+        the tuple of values when several fields are given, each value mapping
+        the period names to a (debit, credit) tuple.
+        :rtype: dict
+        """
+        move_line_obj = self.env['account.move.line']
+        groupby_list = [groupby] if isinstance(groupby, str) else groupby
+        date_from_list = [date_from for date_from, date_to in periods.values()]
+        if date_from_list and all(date_from_list):
+            domain = domain + [('date', '>=', min(date_from_list))]
+        date_to_list = [date_to for date_from, date_to in periods.values()]
+        if date_to_list and all(date_to_list):
+            domain = domain + [('date', '<=', max(date_to_list))]
+        query = move_line_obj._where_calc(domain)
+        move_line_obj._apply_ir_rules(query, 'read')
+        group_columns = []
+        for field_name in groupby_list:
+            field = move_line_obj._fields[field_name]
+            if field.type == 'many2many':
+                rel_alias = query.make_alias(query.table, field_name)
+                query.add_join('JOIN', rel_alias, field.relation, SQL(
+                    "%s = %s", SQL.identifier(rel_alias, field.column1),
+                    SQL.identifier(query.table, 'id')))
+                group_columns.append(
+                    SQL.identifier(rel_alias, field.column2))
+            else:
+                group_columns.append(
+                    SQL.identifier(query.table, field_name))
+        date_column = SQL.identifier(query.table, 'date')
+        columns = list(group_columns)
+        for date_from, date_to in periods.values():
+            conditions = [SQL("TRUE")]
+            if date_from:
+                conditions.append(SQL("%s >= %s", date_column, date_from))
+            if date_to:
+                conditions.append(SQL("%s <= %s", date_column, date_to))
+            condition = SQL(" AND ").join(conditions)
+            for column in ('debit', 'credit'):
+                columns.append(SQL(
+                    "COALESCE(SUM(CASE WHEN %s THEN %s END), 0)", condition,
+                    SQL.identifier(query.table, column)))
+        query.groupby = SQL(", ").join(group_columns)
+        self.env.cr.execute(query.select(*columns))
+        balances = {}
+        size = len(group_columns)
+        for row in self.env.cr.fetchall():
+            key = row[0] if isinstance(groupby, str) else row[:size]
+            balances[key] = {
+                period: (row[2 * index + size], row[2 * index + size + 1])
+                for index, period in enumerate(periods)}
+        return balances
+
+    @api.model
+    def _get_aged_totals(self, domain, amount_field, bucket_edges=None,
+                         date=None):
+        """
+        Compute the aged balance of each partner in one grouped query.
+
+        The lines are bucketed on the number of days between their maturity
+        date and the aging date: the first bucket holds the lines not yet
+        due, then one bucket per interval of the edges and a last one for
+        the lines older than the last edge.
+
+        :param domain: Domain on account.move.line selecting the lines.
+        :type domain: list
+
+        :param amount_field: The account.move.line column to sum, e.g.
+        'debit' or 'credit'.
+        :type amount_field: str
+
+        :param bucket_edges: The increasing day boundaries of the buckets,
+        AGING_BUCKETS by default.
+        :type bucket_edges: list
+
+        :param date: The aging date, today by default.
+        :type date: date
+
+        :return: A dictionary keyed by partner id, each value being the list
+        of the total followed by the amount of each bucket.
+        :rtype: dict
+        """
+        bucket_edges = bucket_edges or AGING_BUCKETS
+        date = date or fields.Date.today()
+        move_line_obj = self.env['account.move.line']
+        query = move_line_obj._where_calc(domain)
+        move_line_obj._apply_ir_rules(query, 'read')
+        partner_column = SQL.identifier(query.table, 'partner_id')
+        amount_column = SQL.identifier(query.table, amount_field)
+        days = SQL("(%s::date - COALESCE(%s, %s::date))", date,
+                   SQL.identifier(query.table, 'date_maturity'), date)
+        columns = [partner_column,
+                   SQL("COALESCE(SUM(%s), 0)", amount_column)]
+        lower_edges = [None] + list(bucket_edges)
+        upper_edges = list(bucket_edges) + [None]
+        for lower, upper in zip(lower_edges, upper_edges):
+            conditions = [SQL("TRUE")]
+            if lower is not None:
+                conditions.append(SQL("%s > %s", days, lower))
+            if upper is not None:
+                conditions.append(SQL("%s <= %s", days, upper))
+            columns.append(SQL(
+                "COALESCE(SUM(CASE WHEN %s THEN %s END), 0)",
+                SQL(" AND ").join(conditions), amount_column))
+        query.add_where(SQL("%s IS NOT NULL", partner_column))
+        query.groupby = partner_column
+        self.env.cr.execute(query.select(*columns))
+        return {row[0]: list(row[1:]) for row in self.env.cr.fetchall()}
+
+    @api.model
+    def _get_aged_lines(self, domain, field_names, amount_field,
+                        bucket_edges=None, date=None):
+        """
+        Read the move lines of an aged report with the amount of each line
+        set in its aging bucket, under the keys 'diff0', 'diff1', ...
+
+        :param domain: Domain on account.move.line selecting the lines.
+        :type domain: list
+
+        :param field_names: The account.move.line fields to read.
+        :type field_names: list
+
+        :param amount_field: The account.move.line field holding the amount.
+        :type amount_field: str
+
+        :param bucket_edges: The increasing day boundaries of the buckets,
+        AGING_BUCKETS by default.
+        :type bucket_edges: list
+
+        :param date: The aging date, today by default.
+        :type date: date
+
+        :return: The lines of each partner, keyed by partner id.
+        :rtype: dict
+        """
+        bucket_edges = bucket_edges or AGING_BUCKETS
+        date = date or fields.Date.today()
+        lines = {}
+        for val in self.env['account.move.line'].search_read(
+                domain + [('partner_id', '!=', False)],
+                ['partner_id'] + field_names):
+            difference = 0
+            if val['date_maturity']:
+                difference = (date - val['date_maturity']).days
+            bucket = bisect_left(bucket_edges, difference)
+            for index in range(len(bucket_edges) + 1):
+                val[f'diff{index}'] = val[amount_field] \
+                    if index == bucket else 0.0
+            lines.setdefault(val.pop('partner_id')[0], []).append(val)
+        return lines
+
+    @api.model
+    def _get_aged_report_values(self, domain, amount_field, partner=None,
+                                lazy=False, bucket_edges=None):
+        """
+        Build the data of an aged receivable or payable report: the aged
+        totals of each partner and, unless lazy, the lines of each partner.
+
+        :param domain: Domain on account.move.line selecting the open lines.
+        :type domain: list
+
+        :param amount_field: The account.move.line field holding the amount.
+        :type amount_field: str
+
+        :param partner: The IDs of the partners to report, all the partners
+        having open lines by default.
+        :type partner: list
+
+        :param lazy: Return empty line lists, the lines of a partner are then
+        fetched on demand.
+        :type lazy: bool
+
+        :param bucket_edges: The increasing day boundaries of the buckets,
+        AGING_BUCKETS by default.
+        :type bucket_edges: list
+
+        :return: A dictionary with the lines of each partner keyed by the
+        partner name and the partner totals under 'partner_totals'.
+        :rtype: dict
+        """
+        bucket_edges = bucket_edges or AGING_BUCKETS
+        partner_total = {}
+        move_line_list = {}
+        totals = self._get_aged_totals(domain, amount_field, bucket_edges)
+        partner_ids = self.env['res.partner'].search(
+            [('id', 'in', partner or list(totals))])
+        lines = {}
+        if not lazy:
+            lines = self._get_aged_lines(
+                domain + [('partner_id', 'in', partner_ids.ids)],
+                self._get_aged_line_fields(amount_field), amount_field,
+                bucket_edges)
+        currency_id = self.env.company.currency_id.symbol
+        for partner_id in partner_ids:
+            amounts = totals.get(partner_id.id, [0.0] * (len(bucket_edges) + 2))
+            move_line_list[partner_id.name] = lines.get(partner_id.id, [])
+            partner_total[partner_id.name] = {
+                f'{amount_field}_sum': amounts[0],
+                **{f'diff{index}_sum': round(amount, 2)
+                   for index, amount in enumerate(amounts[1:])},
+                'currency_id': currency_id,
+                'partner_id': partner_id.id
+            }
+        move_line_list['partner_totals'] = partner_total
+        return move_line_list
+
+    @api.model
+    def _get_aged_line_fields(self, amount_field):
+        """
+        Return the account.move.line fields read for the lines of an aged
+        report.
+
+        :param amount_field: The account.move.line field holding the amount.
+        :type amount_field: str
+
+        :return: The list of field names.
+        :rtype: list
+        """
+        return ['name', 'move_name', 'date', 'amount_currency', 'account_id',
+                'date_maturity', 'currency_id', amount_field, 'move_id']
+
+    @api.model
+    def _get_xlsx_stream(self, write_workbook, *args):
+        """
+        Build a workbook in a temporary file and return an iterator on its
+        content, to send large exports without holding them in memory.
+
+        The workbook is opened in constant memory mode, where every row is
+        flushed to disk as soon as the next one is started: write_workbook
+        must write the rows of a sheet in increasing order.
+
+        :param write_workbook: Callable receiving the workbook followed by
+        args, that adds and fills the sheets.
+        :type write_workbook: function
+
+        :return: An iterator on the chunks of the xlsx file, which removes
+        the file once exhausted.
+        :rtype: iterator
+        """
+        output = tempfile.TemporaryFile(suffix='.xlsx')
+        try:
+            workbook = xlsxwriter.Workbook(output, {'constant_memory': True})
+            write_workbook(workbook, *args)
+            workbook.close()
+            output.seek(0)
+        except Exception:
+            output.close()
+            raise
+        return self._iter_file_chunks(output)
+
+    @api.model
+    def _iter_file_chunks(self, output):
+        """
+        Yield the content of a file chunk by chunk and close it at the end.
+
+        :param output: The file to read, positioned at its start.
+        :type output: file
+
+        :return: An iterator on the chunks of the file.
+        :rtype: iterator
+        """
+        with output:
+            while True:
+                chunk = output.read(XLSX_CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
@@ -0,0 +1,413 @@
+# -*- coding: utf-8 -*-
+################################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#    Author: Bhagyadev KP (<https://www.cybrosys.com>)
+#
+#    You can modify it under the terms of the GNU LESSER
+#    GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#    You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#    (LGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+################################################################################
+from datetime import timedelta
+from odoo import api, fields, models
+from .dynamic_report_mixin import XLSX_PAGE_SIZE
+
+BOOK_LINE_FIELDS = ['date', 'journal_id', 'partner_id', 'move_name', 'debit',
+                    'move_id', 'credit', 'name', 'ref', 'account_id']
+BOOK_PAGE_SIZE = 80
+
+
+class JournalBookMixin(models.AbstractModel):
+    """Shared computations of the bank book and cash book reports"""
+    _name = 'journal.book.mixin'
+    _inherit = 'dynamic.report.mixin'
+    _description = 'Journal Book Mixin'
+
+    # Type of the journals listed by the book, 'bank' or 'cash'
+    _journal_type = None
+
+    @api.model
+    def get_account_lines(self, account_id, partner_id, data_range,
+                          account_list, options, last_key=None,
+                          limit=BOOK_PAGE_SIZE):
+        """
+        Retrieve one page of the move lines of an account, used to unfold an
+        account of a book loaded lazily.
+
+        Pages are ordered by date and id and paginated on that key, the
+        running balance of the last line of a page seeding the next one, so
+        fetching a page does not depend on the number of lines before it.
+
+        :param account_id: The ID of the account to unfold.
+        :type account_id: int
+
+        :param partner_id: The partner IDs to filter the lines by.
+        :type partner_id: list
+
+        :param data_range: The date range option to filter the lines by.
+        :type data_range: str or dict
+
+        :param account_list: The account IDs to filter the lines by.
+        :type account_list: list
+
+        :param options: Additional options, 'draft' to include draft entries.
+        :type options: dict
+
+        :param last_key: The [date, id, balance] key of the last line of the
+        previous page, None for the first page.
+        :type last_key: list
+
+        :param limit: The maximum number of lines of the page.
+        :type limit: int
+
+        :return: A dictionary with the 'lines' of the page, with their
+        running balance, and the 'next_key' to pass for the following page,
+        False on the last page.
+        :rtype: dict
+        """
+        domain = self._get_book_domain(partner_id, account_list, options)
+        domain += [('account_id', '=', account_id)]
+        date_from, date_to = self._get_date_range_bounds(data_range)
+        if last_key:
+            last_date, last_id, balance = last_key
+            lines = self._get_book_lines(
+                domain + ['|', ('date', '>', last_date),
+                          '&', ('date', '=', last_date),
+                          ('id', '>', last_id)],
+                date_from, date_to, {account_id: balance}, limit + 1)
+        else:
+            lines = self._get_book_lines(
+                domain, date_from, date_to,
+                self._get_opening_balances(domain, date_from), limit + 1)
+        next_key = False
+        if len(lines) > limit:
+            lines = lines[:limit]
+            next_key = [fields.Date.to_string(lines[-1]['date']),
+                        lines[-1]['id'], lines[-1]['balance']]
+        return {'lines': lines, 'next_key': next_key}
+
+    @api.model
+    def _get_book_domain(self, partner_id=None, account_list=None,
+                         options=None):
+        """
+        Build the account.move.line domain of the book filters, the dates
+        apart.
+
+        :param partner_id: The partner IDs, all of them if empty.
+        :type partner_id: list
+
+        :param account_list: The account IDs, all of them if empty.
+        :type account_list: list
+
+        :param options: Additional options, 'draft' to include draft entries.
+        :type options: dict
+
+        :return: The domain selecting the move lines of the book.
+        :rtype: list
+        """
+        journals = self.env['account.journal'].search(
+            [('type', '=', self._journal_type)])
+        states = ['posted', 'draft'] if options and 'draft' in options else [
+            'posted']
+        domain = [('parent_state', 'in', states),
+                  ('journal_id', 'in', journals.ids)]
+        if partner_id:
+            domain.append(('partner_id', 'in', partner_id))
+        if account_list:
+            domain.append(('account_id', 'in', account_list))
+        return domain
+
+    @api.model
+    def _get_book_values(self, domain, date_from=None, date_to=None,
+                         lazy=False):
+        """
+        Compute the book of the move lines matching the domain.
+
+        The opening balance and the totals of every account come from one
+        grouped query, the lines from one ordered query.
+
+        :param domain: The domain of the book filters, the dates apart.
+        :type domain: list
+
+        :param date_from: The start of the period, or None.
+        :type date_from: date
+
+        :param date_to: The end of the period, or None.
+        :type date_to: date
+
+        :param lazy: Skip the lines and return empty lists for the accounts.
+        :type lazy: bool
+
+        :return: A dictionary with the lines of each account keyed by the
+        account display name and the per-account totals under
+        'move_lines_total'.
+        :rtype: dict
+        """
+        periods = {'period': (date_from, date_to)}
+        if date_from:
+            periods['initial'] = (None, date_from - timedelta(days=1))
+        balances = {
+            account_id: values
+            for account_id, values in self._get_period_balances(
+                domain, periods).items()
+            if any(any(amounts) for amounts in values.values())}
+        lines_by_account = {}
+        if not lazy and balances:
+            initial_balances = {}
+            for account_id, values in balances.items():
+                initial_debit, initial_credit = values.get('initial',
+                                                           (0.0, 0.0))
+                initial_balances[account_id] = initial_debit - initial_credit
+            for line in self._get_book_lines(
+                    domain + [('account_id', 'in', list(balances))],
+                    date_from, date_to, initial_balances):
+                lines_by_account.setdefault(line['account_id'][0], []).append(
+                    line)
+        accounts = self.env['account.account'].browse(balances).sorted(
+            key=lambda account: account.display_name)
+        currency_id = self.env.company.currency_id.symbol
+        data = {}
+        move_lines_total = {}
+        for account in accounts:
+            debit, credit = balances[account.id]['period']
+            initial_debit, initial_credit = balances[account.id].get(
+                'initial', (0.0, 0.0))
+            data[account.display_name] = lines_by_account.get(account.id, [])
+            move_lines_total[account.display_name] = {
+                'total_debit': round(debit, 2),
+                'total_credit': round(credit, 2),
+                'currency_id': currency_id,
+                'account_id': account.id,
+                'initial_balance': round(initial_debit - initial_credit, 2),
+            }
+        data['move_lines_total'] = move_lines_total
+        return data
+
+    @api.model
+    def _get_opening_balances(self, domain, date_from):
+        """
+        Compute the balance of each account before the period.
+
+        :param domain: The domain of the book filters, the dates apart.
+        :type domain: list
+
+        :param date_from: The start of the period, or None.
+        :type date_from: date
+
+        :return: The opening balance keyed by account ID, empty when the
+        period has no start.
+        :rtype: dict
+        """
+        opening_balances = {}
+        if not date_from:
+            return opening_balances
+        for account_id, values in self._get_period_balances(
+                domain, {'initial': (None, date_from - timedelta(days=1))}
+        ).items():
+            debit, credit = values['initial']
+            opening_balances[account_id] = debit - credit
+        return opening_balances
+
+    @api.model
+    def _get_book_lines(self, domain, date_from=None, date_to=None,
+                        initial_balances=None, limit=None):
+        """
+        Read the move lines of the period ordered by date and id, with the
+        running balance of their account.
+
+        The running balance is accumulated from the given initial balances
+        while reading the lines, so no line before the period is read.
+
+        :param domain: The domain of the book filters, the dates apart.
+        :type domain: list
+
+        :param date_from: The start of the period, or None.
+        :type date_from: date
+
+        :param date_to: The end of the period, or None.
+        :type date_to: date
+
+        :param initial_balances: The balance before the first line read,
+        keyed by account ID, 0 for the missing accounts.
+        :type initial_balances: dict
+
+        :param limit: The maximum number of lines to read, None for all.
+        :type limit: int
+
+        :return: The values of the lines, with their 'balance'.
+        :rtype: list
+        """
+        if date_from:
+            domain = domain + [('date', '>=', date_from)]
+        if date_to:
+            domain = domain + [('date', '<=', date_to)]
+        lines = self.env['account.move.line'].search_read(
+            domain, BOOK_LINE_FIELDS, order='date, id', limit=limit)
+        balances = dict(initial_balances or {})
+        for line in lines:
+            account_id = line['account_id'][0]
+            balances[account_id] = balances.get(account_id, 0.0) + \
+                line['debit'] - line['credit']
+            line['balance'] = balances[account_id]
+        return lines
+
+    @api.model
+    def get_xlsx_stream(self, options, report_name, report_action):
+        """
+        Generate the XLSX book from the filter options and return its content
+        as a stream, for books too large to be posted back by the browser and
+        built in memory.
+
+        The lines are queried again account by account, page by page, and
+        written to a workbook in constant memory mode.
+
+        :param options: The filter arguments of get_filter_values under the
+        keys 'partner_id', 'data_range', 'account_list' and 'options', and
+        the labels of the filters displayed in the header under 'filters'.
+        :type options: dict
+
+        :param report_name: The name of the report.
+        :type report_name: str
+
+        :param report_action: The XML ID of the report action.
+        :type report_action: str
+
+        :return: An iterator on the chunks of the xlsx file.
+        :rtype: iterator
+        """
+        return self._get_xlsx_stream(self._write_xlsx_book, options,
+                                     report_name)
+
+    @api.model
+    def _write_xlsx_book(self, workbook, options, report_name):
+        """
+        Write the book sheet of get_xlsx_stream, row after row.
+
+        :param workbook: The workbook to fill, in constant memory mode.
+        :type workbook: xlsxwriter.Workbook
+
+        :param options: See get_xlsx_stream.
+        :type options: dict
+
+        :param report_name: The name of the report.
+        :type report_name: str
+        """
+        filters = options.get('filters') or {}
+        filter_args = (options.get('partner_id') or [],
+                       options.get('data_range'),
+                       options.get('account_list') or [],
+                       options.get('options'))
+        sheet = workbook.add_worksheet()
+        head = workbook.add_format(
+            {'align': 'center', 'bold': True, 'font_size': '15px'})
+        sub_heading = workbook.add_format(
+            {'align': 'center', 'bold': True, 'font_size': '10px',
+             'border': 1, 'bg_color': '#D3D3D3',
+             'border_color': 'black'})
+        filter_head = workbook.add_format(
+            {'align': 'center', 'bold': True, 'font_size': '10px',
+             'border': 1, 'bg_color': '#D3D3D3',
+             'border_color': 'black'})
+        filter_body = workbook.add_format(
+            {'align': 'center', 'bold': True, 'font_size': '10px'})
+        txt_name = workbook.add_format({'font_size': '10px', 'border': 1})
+        txt_name.set_indent(2)
+        sheet.set_column(0, 0, 30)
+        sheet.set_column(1, 1, 20)
+        sheet.set_column(2, 2, 15)
+        sheet.set_column(3, 3, 15)
+        col = 0
+        sheet.write(0, col, report_name, head)
+        start_date = filters.get('start_date') or ''
+        end_date = filters.get('end_date') or ''
+        filter_rows = [
+            ('Date Range', f"{start_date} to {end_date}"
+             if start_date or end_date else ''),
+            ('Partners', ', '.join(
+                partner.get('display_name', 'undefined')
+                for partner in filters.get('partner') or [])),
+            ('Accounts', ', '.join(filters.get('account') or [])),
+            ('Options', ', '.join(filters.get('options') or {})),
+        ]
+        for row, (label, value) in enumerate(filter_rows, start=2):
+            sheet.write(row, col + 1, label, filter_head)
+            if value:
+                sheet.merge_range(row, col + 2, row, col + 6, value,
+                                  filter_body)
+        row = 8
+        sheet.write(row, col, ' ', sub_heading)
+        for offset, label in enumerate(
+                ['Journal', 'Partner', 'Ref', 'Move', 'Entry Label',
+                 'Debit', 'Credit', 'Balance']):
+            sheet.merge_range(row, col + 1 + 2 * offset, row,
+                              col + 2 + 2 * offset, label, sub_heading)
+        date_from, date_to = self._get_date_range_bounds(filter_args[1])
+        totals = self._get_book_values(self._get_book_domain(
+            filter_args[0], filter_args[2], filter_args[3]),
+            date_from, date_to, lazy=True)['move_lines_total']
+        total_debit = total_credit = 0.0
+        for account_name, account_total in totals.items():
+            debit = account_total['total_debit']
+            credit = account_total['total_credit']
+            total_debit += debit
+            total_credit += credit
+            row += 1
+            sheet.write(row, col, account_name, txt_name)
+            for offset in range(5):
+                sheet.merge_range(row, col + 1 + 2 * offset, row,
+                                  col + 2 + 2 * offset, ' ', txt_name)
+            sheet.merge_range(row, col + 11, row, col + 12, debit, txt_name)
+            sheet.merge_range(row, col + 13, row, col + 14, credit,
+                              txt_name)
+            sheet.merge_range(row, col + 15, row, col + 16,
+                              round(debit - credit, 2), txt_name)
+            next_key = None
+            while next_key is not False:
+                page = self.get_account_lines(account_total['account_id'],
+                                              *filter_args,
+                                              last_key=next_key,
+                                              limit=XLSX_PAGE_SIZE)
+                for rec in page['lines']:
+                    row += 1
+                    partner = rec['partner_id']
+                    sheet.write(row, col, fields.Date.to_string(rec['date']),
+                                txt_name)
+                    sheet.merge_range(row, col + 1, row, col + 2,
+                                      rec['journal_id'][1], txt_name)
+                    sheet.merge_range(row, col + 3, row, col + 4,
+                                      partner[1] if partner else ' ',
+                                      txt_name)
+                    sheet.merge_range(row, col + 5, row, col + 6,
+                                      rec['ref'] or ' ', txt_name)
+                    sheet.merge_range(row, col + 7, row, col + 8,
+                                      rec['move_name'], txt_name)
+                    sheet.merge_range(row, col + 9, row, col + 10,
+                                      rec['name'] or ' ', txt_name)
+                    sheet.merge_range(row, col + 11, row, col + 12,
+                                      rec['debit'], txt_name)
+                    sheet.merge_range(row, col + 13, row, col + 14,
+                                      rec['credit'], txt_name)
+                    sheet.merge_range(row, col + 15, row, col + 16, ' ',
+                                      txt_name)
+                next_key = page['next_key']
+                # Each page is already in the sheet file, drop its records.
+                self.env.invalidate_all()
+        row += 1
+        sheet.merge_range(row, col, row, col + 10, 'Total', filter_head)
+        sheet.merge_range(row, col + 11, row, col + 12, round(total_debit, 2),
+                          filter_head)
+        sheet.merge_range(row, col + 13, row, col + 14,
+                          round(total_credit, 2), filter_head)
+        sheet.merge_range(row, col + 15, row, col + 16,
+                          round(total_debit - total_credit, 2), filter_head)
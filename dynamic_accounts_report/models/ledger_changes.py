@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+################################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#    Author: Bhagyadev KP (<https://www.cybrosys.com>)
+#
+#    You can modify it under the terms of the GNU LESSER
+#    GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#    You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#    (LGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+################################################################################
+from odoo import api, models
+
+# fields of the records whose values are displayed in the cached reports
+LABEL_FIELDS = ['name', 'code']
+
+
+class AccountMove(models.Model):
+    """Invalidate the cached reports when journal entries change"""
+    _inherit = 'account.move'
+
+    def write(self, vals):
+        """Mark the ledger as changed."""
+        self.env['dynamic.report.mixin']._mark_ledger_changed()
+        return super().write(vals)
+
+    def unlink(self):
+        """Mark the ledger as changed."""
+        self.env['dynamic.report.mixin']._mark_ledger_changed()
+        return super().unlink()
+
+
+class AccountMoveLine(models.Model):
+    """Invalidate the cached reports when journal items change"""
+    _inherit = 'account.move.line'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Mark the ledger as changed."""
+        self.env['dynamic.report.mixin']._mark_ledger_changed()
+        return super().create(vals_list)
+
+    def write(self, vals):
+        """Mark the ledger as changed."""
+        self.env['dynamic.report.mixin']._mark_ledger_changed()
+        return super().write(vals)
+
+    def unlink(self):
+        """Mark the ledger as changed."""
+        self.env['dynamic.report.mixin']._mark_ledger_changed()
+        return super().unlink()
+
+
+class AccountAccount(models.Model):
+    """Invalidate the cached reports when accounts are renamed"""
+    _inherit = 'account.account'
+
+    def write(self, vals):
+        """Mark the ledger as changed when the code or name changes."""
+        if any(field_name in vals for field_name in LABEL_FIELDS):
+            self.env['dynamic.report.mixin']._mark_ledger_changed()
+        return super().write(vals)
+
+
+class AccountJournal(models.Model):
+    """Invalidate the cached reports when journals are renamed"""
+    _inherit = 'account.journal'
+
+    def write(self, vals):
+        """Mark the ledger as changed when the code or name changes."""
+        if any(field_name in vals for field_name in LABEL_FIELDS):
+            self.env['dynamic.report.mixin']._mark_ledger_changed()
+        return super().write(vals)
+
+
+class ResPartner(models.Model):
+    """Invalidate the cached reports when partners are renamed"""
+    _inherit = 'res.partner'
+
+    def write(self, vals):
+        """Mark the ledger as changed when the name changes."""
+        if any(field_name in vals for field_name in LABEL_FIELDS):
+            self.env['dynamic.report.mixin']._mark_ledger_changed()
+        return super().write(vals)
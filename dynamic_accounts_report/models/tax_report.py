@@ -32,6 +32,7 @@ from odoo.tools.date_utils import get_month, get_fiscal_year, \
 class TaxReport(models.TransientModel):
     """For creating Tax report."""
     _name = 'tax.report'
+    _inherit = 'dynamic.report.mixin'
     _description = 'Tax Report'
 
     @api.model
@@ -46,33 +47,20 @@ class TaxReport(models.TransientModel):
         """
         sale = []
         purchase = []
-        tax_ids = self.env['account.move.line'].search([]).mapped(
-            'tax_ids')
+        tax_ids = self._get_distinct_values('tax_ids')
         today = fields.Date.today()
+        balances = self._get_tax_balances(
+            [('parent_state', '=', 'posted')],
+            {'period': get_month(today)})
         for tax in tax_ids:
-            tax_id = self.env['account.move.line'].search(
-                [('tax_ids', '=', tax.id), ('parent_state', '=', 'posted'),
-                 ('date', '>=', get_month(today)[0]),
-                 ('date', '<=', get_month(today)[1])]).read(
-                ['debit', 'credit'])
-            tax_debit_sums = sum(record['debit'] for record in tax_id)
-            tax_credit_sums = sum(record['credit'] for record in tax_id)
+            tax_debit_sums, tax_credit_sums = balances.get(tax.id, {}).get(
+                'period', (0.0, 0.0))
             if tax.type_tax_use == 'sale':
-                sale.append({
-                    'name': tax.name,
-                    'amount': tax.amount,
-                    'net': round(tax_debit_sums + tax_credit_sums, 2),
-                    'tax': round((tax_debit_sums + tax_credit_sums) * (
-                            tax.amount / 100), 2)
-                })
+                sale.append(self._get_tax_values(
+                    tax, tax_debit_sums, tax_credit_sums))
             elif tax.type_tax_use == 'purchase':
-                purchase.append({
-                    'name': tax.name,
-                    'amount': tax.amount,
-                    'net': round(tax_debit_sums + tax_credit_sums, 2),
-                    'tax': round((tax_debit_sums + tax_credit_sums) * (
-                            tax.amount / 100), 2)
-                })
+                purchase.append(self._get_tax_values(
+                    tax, tax_debit_sums, tax_credit_sums))
         return {
             'sale': sale,
             'purchase': purchase
@@ -102,498 +90,146 @@ class TaxReport(models.TransientModel):
             option_domain = ['posted']
         elif 'draft' in options:
             option_domain = ['posted', 'draft']
-        tax_ids = self.env['account.move.line'].search([]).mapped(
-            'tax_ids')
-        start_date_first = \
+        comparison_number = int(comparison_number or 0)
+        start_date = \
             get_fiscal_year(datetime.strptime(start_date, "%Y-%m-%d").date())[
                 0] if comparison_type == 'year' else datetime.strptime(
                 start_date, "%Y-%m-%d").date()
-        end_date_first = \
+        end_date = \
             get_fiscal_year(datetime.strptime(end_date, "%Y-%m-%d").date())[
                 1] if comparison_type == 'year' else datetime.strptime(
                 end_date, "%Y-%m-%d").date()
-        if report_type is not None and 'account' in report_type:
-            start_date = start_date_first
-            end_date = end_date_first
-            account_ids = self.env['account.move.line'].search([]).mapped(
-                'account_id')
-            for account in account_ids:
-                tax_ids = self.env['account.move.line'].search(
-                    [('account_id', '=', account.id)]).mapped('tax_ids')
-                if tax_ids:
-                    for tax in tax_ids:
-                        dynamic_total_tax_sum = {}
-                        dynamic_total_net_sum = {}
-                        if comparison_number:
-                            if comparison_type == 'year':
-                                start_date = start_date_first
-                                end_date = end_date_first
-                                for i in range(1, eval(comparison_number) + 1):
-                                    com_start_date = subtract(start_date,
-                                                              years=i)
-                                    com_end_date = subtract(end_date, years=i)
-                                    tax_id = self.env[
-                                        'account.move.line'].search(
-                                        [('tax_ids', '=', tax.id),
-                                         ('date', '>=', com_start_date),
-                                         ('date', '<=', com_end_date),
-                                         ('account_id', '=', account.id),
-                                         ('parent_state', 'in',
-                                          option_domain)]).read(
-                                        ['debit', 'credit'])
-                                    tax_debit_sums = sum(
-                                        record['debit'] for record in tax_id)
-                                    tax_credit_sums = sum(
-                                        record['credit'] for record in tax_id)
-                                    dynamic_total_net_sum[
-                                        f"dynamic_total_net_sum{i}"] = tax_debit_sums + tax_credit_sums
-                                    dynamic_total_tax_sum[
-                                        f"dynamic_total_tax_sum{i}"] = \
-                                        dynamic_total_net_sum[
-                                            f"dynamic_total_net_sum{i}"] * (
-                                                tax.amount / 100)
-                            elif comparison_type == 'month':
-                                dynamic_date_num[
-                                    f"dynamic_date_num{0}"] = self.get_month_name(
-                                    start_date) + ' ' + str(start_date.year)
-                                for i in range(1, eval(comparison_number) + 1):
-                                    com_start_date = subtract(start_date,
-                                                              months=i)
-                                    com_end_date = subtract(end_date, months=i)
-                                    tax_id = self.env[
-                                        'account.move.line'].search(
-                                        [('tax_ids', '=', tax.id),
-                                         ('date', '>=', com_start_date),
-                                         ('account_id', '=', account.id),
-                                         ('date', '<=', com_end_date),
-                                         ('parent_state', 'in',
-                                          option_domain)]).read(
-                                        ['debit', 'credit'])
-                                    tax_debit_sums = sum(
-                                        record['debit'] for record in tax_id)
-                                    tax_credit_sums = sum(
-                                        record['credit'] for record in tax_id)
-                                    dynamic_total_net_sum[
-                                        f"dynamic_total_net_sum{i}"] = tax_debit_sums + tax_credit_sums
-                                    dynamic_total_tax_sum[
-                                        f"dynamic_total_tax_sum{i}"] = \
-                                        dynamic_total_net_sum[
-                                            f"dynamic_total_net_sum{i}"] * (
-                                                tax.amount / 100)
-                                    dynamic_date_num[
-                                        f"dynamic_date_num{i}"] = self.get_month_name(
-                                        com_start_date) + ' ' + str(
-                                        com_start_date.year)
-                            elif comparison_type == 'quarter':
-                                dynamic_date_num[
-                                    f"dynamic_date_num{0}"] = 'Q' + ' ' + str(
-                                    get_quarter_number(
-                                        start_date)) + ' ' + str(
-                                    start_date.year)
-                                for i in range(1, eval(comparison_number) + 1):
-                                    com_start_date = subtract(start_date,
-                                                              months=i * 3)
-                                    com_end_date = subtract(end_date,
-                                                            months=i * 3)
-                                    tax_id = self.env[
-                                        'account.move.line'].search(
-                                        [('tax_ids', '=', tax.id),
-                                         ('date', '>=', com_start_date),
-                                         ('account_id', '=', account.id),
-                                         ('date', '<=', com_end_date),
-                                         ('parent_state', 'in',
-                                          option_domain)]).read(
-                                        ['debit', 'credit'])
-                                    tax_debit_sums = sum(
-                                        record['debit'] for record in tax_id)
-                                    tax_credit_sums = sum(
-                                        record['credit'] for record in tax_id)
-                                    dynamic_total_net_sum[
-                                        f"dynamic_total_net_sum{i}"] = tax_debit_sums + tax_credit_sums
-                                    dynamic_total_tax_sum[
-                                        f"dynamic_total_tax_sum{i}"] = \
-                                        dynamic_total_net_sum[
-                                            f"dynamic_total_net_sum{i}"] * (
-                                                tax.amount / 100)
-                                    dynamic_date_num[
-                                        f"dynamic_date_num{i}"] = 'Q' + ' ' + str(
-                                        get_quarter_number(
-                                            com_start_date)) + ' ' + str(
-                                        com_start_date.year)
-                        tax_id = self.env['account.move.line'].search(
-                            [('tax_ids', '=', tax.id),
-                             ('date', '>=', start_date_first),
-                             ('date', '<=', end_date_first),
-                             ('parent_state', 'in', option_domain),
-                             ('account_id', '=', account.id)]).read(
-                            ['debit', 'credit'])
-                        tax_debit_sums = sum(
-                            record['debit'] for record in tax_id)
-                        tax_credit_sums = sum(
-                            record['credit'] for record in tax_id)
-                        if tax_id and tax.type_tax_use == 'sale':
-                            if comparison_number:
-                                sale.append({
-                                    'name': tax.name,
-                                    'amount': tax.amount,
-                                    'net': round(
-                                        tax_debit_sums + tax_credit_sums,
-                                        2),
-                                    'tax': round(
-                                        (tax_debit_sums + tax_credit_sums) * (
-                                                tax.amount / 100), 2),
-                                    'dynamic net': dynamic_total_net_sum,
-                                    'dynamic tax': dynamic_total_tax_sum,
-                                    'account': account.display_name,
-                                })
-                            else:
-                                sale.append({
-                                    'name': tax.name,
-                                    'amount': tax.amount,
-                                    'net': round(
-                                        tax_debit_sums + tax_credit_sums,
-                                        2),
-                                    'tax': round(
-                                        (tax_debit_sums + tax_credit_sums) * (
-                                                tax.amount / 100), 2),
-                                    'account': account.display_name,
-                                })
-                        elif tax_id and tax.type_tax_use == 'purchase':
-                            if comparison_number:
-                                purchase.append({
-                                    'name': tax.name,
-                                    'amount': tax.amount,
-                                    'net': round(
-                                        tax_debit_sums + tax_credit_sums,
-                                        2),
-                                    'tax': round(
-                                        (tax_debit_sums + tax_credit_sums) * (
-                                                tax.amount / 100), 2),
-                                    'dynamic net': dynamic_total_net_sum,
-                                    'dynamic tax': dynamic_total_tax_sum,
-                                    'account': account.display_name,
-                                })
-                            else:
-                                purchase.append({
-                                    'name': tax.name,
-                                    'amount': tax.amount,
-                                    'net': round(
-                                        tax_debit_sums + tax_credit_sums,
-                                        2),
-                                    'tax': round(
-                                        (tax_debit_sums + tax_credit_sums) * (
-                                                tax.amount / 100), 2),
-                                    'account': account.display_name,
-                                })
-        elif report_type is not None and 'tax' in report_type:
-            start_date = start_date_first
-            end_date = end_date_first
-            for tax in tax_ids:
-                account_ids = self.env['account.move.line'].search(
-                    [('tax_ids', '=', tax.id)]).mapped('account_id')
-                for account in account_ids:
-                    dynamic_total_tax_sum = {}
-                    dynamic_total_net_sum = {}
-                    if comparison_number:
-                        if comparison_type == 'year':
-                            start_date = start_date_first
-                            end_date = end_date_first
-                            for i in range(1, eval(comparison_number) + 1):
-                                com_start_date = subtract(start_date,
-                                                          years=i)
-                                com_end_date = subtract(end_date, years=i)
-                                tax_id = self.env[
-                                    'account.move.line'].search(
-                                    [('tax_ids', '=', tax.id),
-                                     ('date', '>=', com_start_date),
-                                     ('date', '<=', com_end_date),
-                                     ('account_id', '=', account.id),
-                                     ('parent_state', 'in',
-                                      option_domain)]).read(
-                                    ['debit', 'credit'])
-                                tax_debit_sums = sum(
-                                    record['debit'] for record in tax_id)
-                                tax_credit_sums = sum(
-                                    record['credit'] for record in tax_id)
-                                dynamic_total_net_sum[
-                                    f"dynamic_total_net_sum{i}"] = tax_debit_sums + tax_credit_sums
-                                dynamic_total_tax_sum[
-                                    f"dynamic_total_tax_sum{i}"] = \
-                                    dynamic_total_net_sum[
-                                        f"dynamic_total_net_sum{i}"] * (
-                                            tax.amount / 100)
-                        elif comparison_type == 'month':
-                            dynamic_date_num[
-                                f"dynamic_date_num{0}"] = self.get_month_name(
-                                start_date) + ' ' + str(start_date.year)
-                            for i in range(1, eval(comparison_number) + 1):
-                                com_start_date = subtract(start_date, months=i)
-                                com_end_date = subtract(end_date, months=i)
-                                tax_id = self.env[
-                                    'account.move.line'].search(
-                                    [('tax_ids', '=', tax.id),
-                                     ('date', '>=', com_start_date),
-                                     ('date', '<=', com_end_date),
-                                     ('account_id', '=', account.id),
-                                     ('parent_state', 'in',
-                                      option_domain)]).read(
-                                    ['debit', 'credit'])
-                                tax_debit_sums = sum(
-                                    record['debit'] for record in tax_id)
-                                tax_credit_sums = sum(
-                                    record['credit'] for record in tax_id)
-                                dynamic_total_net_sum[
-                                    f"dynamic_total_net_sum{i}"] = tax_debit_sums + tax_credit_sums
-                                dynamic_total_tax_sum[
-                                    f"dynamic_total_tax_sum{i}"] = \
-                                    dynamic_total_net_sum[
-                                        f"dynamic_total_net_sum{i}"] * (
-                                            tax.amount / 100)
-                                dynamic_date_num[
-                                    f"dynamic_date_num{i}"] = self.get_month_name(
-                                    com_start_date) + ' ' + str(
-                                    com_start_date.year)
-                        elif comparison_type == 'quarter':
-                            dynamic_date_num[
-                                f"dynamic_date_num{0}"] = 'Q' + ' ' + str(
-                                get_quarter_number(start_date)) + ' ' + str(
-                                start_date.year)
-                            for i in range(1, eval(comparison_number) + 1):
-                                com_start_date = subtract(start_date,
-                                                          months=i * 3)
-                                com_end_date = subtract(end_date,
-                                                        months=i * 3)
-                                tax_id = self.env[
-                                    'account.move.line'].search(
-                                    [('tax_ids', '=', tax.id),
-                                     ('date', '>=', com_start_date),
-                                     ('date', '<=', com_end_date),
-                                     ('account_id', '=', account.id),
-                                     ('parent_state', 'in',
-                                      option_domain)]).read(
-                                    ['debit', 'credit'])
-                                tax_debit_sums = sum(
-                                    record['debit'] for record in tax_id)
-                                tax_credit_sums = sum(
-                                    record['credit'] for record in tax_id)
-                                dynamic_total_net_sum[
-                                    f"dynamic_total_net_sum{i}"] = tax_debit_sums + tax_credit_sums
-                                dynamic_total_tax_sum[
-                                    f"dynamic_total_tax_sum{i}"] = \
-                                    dynamic_total_net_sum[
-                                        f"dynamic_total_net_sum{i}"] * (
-                                            tax.amount / 100)
-                                dynamic_date_num[
-                                    f"dynamic_date_num{i}"] = 'Q' + ' ' + str(
-                                    get_quarter_number(
-                                        com_start_date)) + ' ' + str(
-                                    com_start_date.year)
-                    tax_id = self.env['account.move.line'].search(
-                        [('tax_ids', '=', tax.id),
-                         ('parent_state', 'in', option_domain),
-                         ('date', '>=', start_date_first),
-                         ('date', '<=', end_date_first),
-                         ('account_id', '=', account.id)]).read(
-                        ['debit', 'credit'])
-                    tax_debit_sums = sum(
-                        record['debit'] for record in tax_id)
-                    tax_credit_sums = sum(
-                        record['credit'] for record in tax_id)
-                    if tax_id and tax.type_tax_use == 'sale':
-                        if comparison_number:
-                            sale.append({
-                                'name': tax.name,
-                                'amount': tax.amount,
-                                'net': round(tax_debit_sums + tax_credit_sums,
-                                             2),
-                                'tax': round(
-                                    (tax_debit_sums + tax_credit_sums) * (
-                                            tax.amount / 100), 2),
-                                'dynamic net': dynamic_total_net_sum,
-                                'dynamic tax': dynamic_total_tax_sum,
-                                'account': account.display_name,
-                            })
-                        else:
-                            sale.append({
-                                'name': tax.name,
-                                'amount': tax.amount,
-                                'net': round(tax_debit_sums + tax_credit_sums,
-                                             2),
-                                'tax': round(
-                                    (tax_debit_sums + tax_credit_sums) * (
-                                            tax.amount / 100), 2),
-                                'account': account.display_name,
-                            })
-                    elif tax_id and tax.type_tax_use == 'purchase':
-                        if comparison_number:
-                            purchase.append({
-                                'name': tax.name,
-                                'amount': tax.amount,
-                                'net': round(tax_debit_sums + tax_credit_sums,
-                                             2),
-                                'tax': round(
-                                    (tax_debit_sums + tax_credit_sums) * (
-                                            tax.amount / 100), 2),
-                                'dynamic net': dynamic_total_net_sum,
-                                'dynamic tax': dynamic_total_tax_sum,
-                                'account': account.display_name,
-                            })
-                        else:
-                            purchase.append({
-                                'name': tax.name,
-                                'amount': tax.amount,
-                                'net': round(tax_debit_sums + tax_credit_sums,
-                                             2),
-                                'tax': round(
-                                    (tax_debit_sums + tax_credit_sums) * (
-                                            tax.amount / 100), 2),
-                                'account': account.display_name,
-                            })
+        periods = {}
+        if comparison_number:
+            if comparison_type == 'month':
+                dynamic_date_num[
+                    f"dynamic_date_num{0}"] = self.get_month_name(
+                    start_date) + ' ' + str(start_date.year)
+            elif comparison_type == 'quarter':
+                dynamic_date_num[
+                    f"dynamic_date_num{0}"] = 'Q' + ' ' + str(
+                    get_quarter_number(start_date)) + ' ' + str(
+                    start_date.year)
+            for i in range(1, comparison_number + 1):
+                if comparison_type == 'year':
+                    com_start_date = subtract(start_date, years=i)
+                    com_end_date = subtract(end_date, years=i)
+                elif comparison_type == 'month':
+                    com_start_date = subtract(start_date, months=i)
+                    com_end_date = subtract(end_date, months=i)
+                    dynamic_date_num[
+                        f"dynamic_date_num{i}"] = self.get_month_name(
+                        com_start_date) + ' ' + str(com_start_date.year)
+                elif comparison_type == 'quarter':
+                    com_start_date = subtract(start_date, months=i * 3)
+                    com_end_date = subtract(end_date, months=i * 3)
+                    dynamic_date_num[
+                        f"dynamic_date_num{i}"] = 'Q' + ' ' + str(
+                        get_quarter_number(com_start_date)) + ' ' + str(
+                        com_start_date.year)
+                else:
+                    break
+                periods[i] = (com_start_date, com_end_date)
+        periods['period'] = (start_date, end_date)
+        domain = [('parent_state', 'in', option_domain)]
+        if report_type is not None and (
+                'account' in report_type or 'tax' in report_type):
+            balances = self._get_tax_balances(domain, periods,
+                                              by_account=True)
+            # Every tax/account pair having lines is listed, grouped by
+            # account or by tax, including the pairs whose lines sum to zero.
+            # With comparison periods, the pairs having lines in a compared
+            # period only are listed too, with a zero amount in the
+            # reported period.
+            keys = list(balances)
+            taxes = self.env['account.tax'].search(
+                [('id', 'in', list({key[0] for key in keys}))])
+            accounts = self.env['account.account'].search(
+                [('id', 'in', list({key[1] for key in keys}))])
+            tax_rank = {tax.id: rank for rank, tax in enumerate(taxes)}
+            account_rank = {account.id: rank
+                            for rank, account in enumerate(accounts)}
+            if 'account' in report_type:
+                keys.sort(key=lambda key: (account_rank[key[1]],
+                                           tax_rank[key[0]]))
+            else:
+                keys.sort(key=lambda key: (tax_rank[key[0]],
+                                           account_rank[key[1]]))
+            rows = [(taxes.browse(tax_id), accounts.browse(account_id),
+                     balances[tax_id, account_id])
+                    for tax_id, account_id in keys]
         else:
-            start_date = start_date_first
-            end_date = end_date_first
-            for tax in tax_ids:
-                dynamic_total_tax_sum = {}
-                dynamic_total_net_sum = {}
-                if comparison_number:
-                    if comparison_type == 'year':
-                        start_date = start_date_first
-                        end_date = end_date_first
-                        for i in range(1, eval(comparison_number) + 1):
-                            com_start_date = subtract(start_date,
-                                                      years=i)
-                            com_end_date = subtract(end_date, years=i)
-                            tax_id = self.env[
-                                'account.move.line'].search(
-                                [('tax_ids', '=', tax.id),
-                                 ('date', '>=', com_start_date),
-                                 ('date', '<=', com_end_date),
-                                 ('parent_state', 'in', option_domain)]).read(
-                                ['debit', 'credit'])
-                            tax_debit_sums = sum(
-                                record['debit'] for record in tax_id)
-                            tax_credit_sums = sum(
-                                record['credit'] for record in tax_id)
-                            dynamic_total_net_sum[
-                                f"dynamic_total_net_sum{i}"] = tax_debit_sums + tax_credit_sums
-                            dynamic_total_tax_sum[
-                                f"dynamic_total_tax_sum{i}"] = \
-                                dynamic_total_net_sum[
-                                    f"dynamic_total_net_sum{i}"] * (
-                                        tax.amount / 100)
-                    elif comparison_type == 'month':
-                        dynamic_date_num[
-                            f"dynamic_date_num{0}"] = self.get_month_name(
-                            start_date) + ' ' + str(start_date.year)
-                        for i in range(1, eval(comparison_number) + 1):
-                            com_start_date = subtract(start_date, months=i)
-                            com_end_date = subtract(end_date, months=i)
-                            tax_id = self.env[
-                                'account.move.line'].search(
-                                [('tax_ids', '=', tax.id),
-                                 ('date', '>=', com_start_date),
-                                 ('date', '<=', com_end_date),
-                                 ('parent_state', 'in', option_domain)]).read(
-                                ['debit', 'credit'])
-                            tax_debit_sums = sum(
-                                record['debit'] for record in tax_id)
-                            tax_credit_sums = sum(
-                                record['credit'] for record in tax_id)
-                            dynamic_total_net_sum[
-                                f"dynamic_total_net_sum{i}"] = tax_debit_sums + tax_credit_sums
-                            dynamic_total_tax_sum[
-                                f"dynamic_total_tax_sum{i}"] = \
-                                dynamic_total_net_sum[
-                                    f"dynamic_total_net_sum{i}"] * (
-                                        tax.amount / 100)
-                            dynamic_date_num[
-                                f"dynamic_date_num{i}"] = self.get_month_name(
-                                com_start_date) + ' ' + str(
-                                com_start_date.year)
-                    elif comparison_type == 'quarter':
-                        dynamic_date_num[
-                            f"dynamic_date_num{0}"] = 'Q' + ' ' + str(
-                            get_quarter_number(start_date)) + ' ' + str(
-                            start_date.year)
-                        for i in range(1, eval(comparison_number) + 1):
-                            com_start_date = subtract(start_date,
-                                                      months=i * 3)
-                            com_end_date = subtract(end_date,
-                                                    months=i * 3)
-                            tax_id = self.env[
-                                'account.move.line'].search(
-                                [('tax_ids', '=', tax.id),
-                                 ('date', '>=', com_start_date),
-                                 ('date', '<=', com_end_date),
-                                 ('parent_state', 'in', option_domain)]).read(
-                                ['debit', 'credit'])
-                            tax_debit_sums = sum(
-                                record['debit'] for record in tax_id)
-                            tax_credit_sums = sum(
-                                record['credit'] for record in tax_id)
-                            dynamic_total_net_sum[
-                                f"dynamic_total_net_sum{i}"] = tax_debit_sums + tax_credit_sums
-                            dynamic_total_tax_sum[
-                                f"dynamic_total_tax_sum{i}"] = \
-                                dynamic_total_net_sum[
-                                    f"dynamic_total_net_sum{i}"] * (
-                                        tax.amount / 100)
-                            dynamic_date_num[
-                                f"dynamic_date_num{i}"] = 'Q' + ' ' + str(
-                                get_quarter_number(
-                                    com_start_date)) + ' ' + str(
-                                com_start_date.year)
-                tax_id = self.env['account.move.line'].search(
-                    [('tax_ids', '=', tax.id),
-                     ('parent_state', 'in', option_domain),
-                     ('date', '>=', start_date_first),
-                     ('date', '<=', end_date_first)]).read(['debit', 'credit'])
-                tax_debit_sums = sum(record['debit'] for record in tax_id)
-                tax_credit_sums = sum(record['credit'] for record in tax_id)
-                if tax.type_tax_use == 'sale':
-                    if comparison_number:
-                        sale.append({
-                            'name': tax.name,
-                            'amount': tax.amount,
-                            'net': round(tax_debit_sums + tax_credit_sums, 2),
-                            'tax': round((tax_debit_sums + tax_credit_sums) * (
-                                    tax.amount / 100), 2),
-                            'dynamic net': dynamic_total_net_sum,
-                            'dynamic tax': dynamic_total_tax_sum,
-                        })
-                    else:
-                        sale.append({
-                            'name': tax.name,
-                            'amount': tax.amount,
-                            'net': round(tax_debit_sums + tax_credit_sums, 2),
-                            'tax': round((tax_debit_sums + tax_credit_sums) * (
-                                    tax.amount / 100), 2),
-                        })
-                elif tax.type_tax_use == 'purchase':
-                    if comparison_number:
-                        purchase.append({
-                            'name': tax.name,
-                            'amount': tax.amount,
-                            'net': round(tax_debit_sums + tax_credit_sums, 2),
-                            'tax': round((tax_debit_sums + tax_credit_sums) * (
-                                    tax.amount / 100), 2),
-                            'dynamic net': dynamic_total_net_sum,
-                            'dynamic tax': dynamic_total_tax_sum,
-                        })
-                    else:
-                        purchase.append({
-                            'name': tax.name,
-                            'amount': tax.amount,
-                            'net': round(tax_debit_sums + tax_credit_sums, 2),
-                            'tax': round((tax_debit_sums + tax_credit_sums) * (
-                                    tax.amount / 100), 2),
-                        })
+            balances = self._get_tax_balances(domain, periods)
+            rows = [(tax, None, balances.get(tax.id, {}))
+                    for tax in self._get_distinct_values('tax_ids')]
+        for tax, account, amounts in rows:
+            tax_debit_sums, tax_credit_sums = amounts.get(
+                'period', (0.0, 0.0))
+            values = self._get_tax_values(tax, tax_debit_sums,
+                                          tax_credit_sums)
+            if comparison_number:
+                values['dynamic net'] = {}
+                values['dynamic tax'] = {}
+                for i in periods:
+                    if i == 'period':
+                        continue
+                    net = sum(amounts.get(i, (0.0, 0.0)))
+                    values['dynamic net'][f"dynamic_total_net_sum{i}"] = net
+                    values['dynamic tax'][
+                        f"dynamic_total_tax_sum{i}"] = net * (tax.amount / 100)
+            if account:
+                values['account'] = account.display_name
+            if tax.type_tax_use == 'sale':
+                sale.append(values)
+            elif tax.type_tax_use == 'purchase':
+                purchase.append(values)
         return {
             'dynamic_date_num': dynamic_date_num,
             'sale': sale,
             'purchase': purchase
         }
 
+    @api.model
+    def _get_tax_balances(self, domain, periods, by_account=False):
+        """
+        Compute the base amounts of every tax for several periods in one
+        aggregated query over the move lines joined to their taxes.
+
+        :param domain: Domain on account.move.line selecting the lines.
+        :type domain: list
+        :param periods: The (date_from, date_to) range of each period keyed by
+                        the period name.
+        :type periods: dict
+        :param by_account: Also group the amounts by account.
+        :type by_account: bool
+        :return: Dictionary keyed by tax id, or by (tax id, account id) when
+                 grouped by account, mapping each period to a
+                 (debit, credit) tuple.
+        :rtype: dict
+        """
+        groupby = ['tax_ids', 'account_id'] if by_account else 'tax_ids'
+        return self._get_period_balances(domain, periods, groupby)
+
+    @api.model
+    def _get_tax_values(self, tax, tax_debit_sums, tax_credit_sums):
+        """
+        Build the report line of a tax from its base debit and credit.
+
+        :param tax: The tax of the line.
+        :type tax: account.tax
+        :param float tax_debit_sums: Debit of the lines having the tax.
+        :param float tax_credit_sums: Credit of the lines having the tax.
+        :return: Dictionary with the name, rate, net and tax amounts.
+        :rtype: dict
+        """
+        return {
+            'name': tax.name,
+            'amount': tax.amount,
+            'net': round(tax_debit_sums + tax_credit_sums, 2),
+            'tax': round((tax_debit_sums + tax_credit_sums) * (
+                    tax.amount / 100), 2)
+        }
+
     @api.model
     def get_month_name(self, date):
         """
@@ -18,6 +18,8 @@ class AgedPayable extends owl.Component {
         this.date_range = useRef('date_to');
         this.unfoldButton = useRef('unfoldButton');
         this.state = useState({
+            unfolded: {},
+            formatted: false,
             move_line: null,
             data: null,
             total: null,
@@ -52,7 +54,9 @@ class AgedPayable extends owl.Component {
         var action_title = self.props.action.display_name;
         try {
             var self = this;
-            self.state.data = await self.orm.call("age.payable.report", "view_report", []);
+            self.state.data = await self.orm.call("age.payable.report", "view_report", [], {lazy: true});
+            self.state.unfolded = {};
+            self.state.formatted = true;
             for (const index in self.state.data) {
                 const value = self.state.data[index];
                 if (index !== 'partner_totals') {
@@ -135,23 +139,44 @@ class AgedPayable extends owl.Component {
     }
     async unfoldAll(ev) {
         /**
-         * Unfolds all items in the table body if the event target does not have the 'selected-filter' class,
-         * or folds all items if the event target has the 'selected-filter' class.
+         * Unfolds all partners, loading their lines when needed, if the event target does not have the 'selected-filter' class,
+         * or folds all partners if the event target has the 'selected-filter' class.
          *
          * @param {Event} ev - The event object triggered by the action.
          */
         if (!ev.target.classList.contains("selected-filter")) {
-            for (var length = 0; length < this.tbody.el.children.length; length++) {
-                 this.tbody.el.children[length].classList.add('show')
+            for (const partner of this.state.move_line || []) {
+                if (!this.state.unfolded[partner]) {
+                    await this.togglePartner(partner);
+                }
             }
             ev.target.classList.add("selected-filter");
         } else {
-            for (var length = 0; length < this.tbody.el.children.length; length++) {
-                this.tbody.el.children[length].classList.remove('show')
-            }
+            this.state.unfolded = {};
             ev.target.classList.remove("selected-filter");
         }
     }
+    async togglePartner(partner) {
+        /**
+         * Folds or unfolds a partner, fetching its lines the first time it is unfolded.
+         *
+         * @param {string} partner - The name of the partner.
+         */
+        if (this.state.unfolded[partner]) {
+            this.state.unfolded[partner] = false;
+            return;
+        }
+        if (!this.state.data[partner] || !this.state.data[partner].length) {
+            this.state.data[partner] = await this.orm.call("age.payable.report", "get_partner_lines", [this.state.total[partner]['partner_id'], this.date_range.el.value || null, null]);
+        }
+        this.state.unfolded[partner] = true;
+    }
+    async fetchAllLines() {
+        /**
+         * Fetches the report with the lines of every partner, the screen only holds the unfolded ones.
+         */
+        return await this.orm.call("age.payable.report", "get_filter_values", [this.date_range.el.value, this.state.selected_partner,]);
+    }
     async printPdf(ev) {
         /**
          * Generates and displays a PDF report for the aged payable.
@@ -161,6 +186,7 @@ class AgedPayable extends owl.Component {
          */
         ev.preventDefault();
         var self = this;
+        const data = await this.fetchAllLines();
         var action_title = self.props.action.display_name;
         let totals = {
             'diff0_sum':this.state.diff0_sum,
@@ -179,7 +205,7 @@ class AgedPayable extends owl.Component {
             'report_file': 'dynamic_accounts_report.aged_payable',
             'data': {
                 'move_lines': self.state.move_line,
-                'data': self.state.data,
+                'data': data,
                 'total': self.state.total,
                 'filters': this.filter(),
                 'grand_total': totals,
@@ -201,6 +227,7 @@ class AgedPayable extends owl.Component {
          * Generates and downloads an XLSX report for the aged payable.
          */
         var self = this;
+        const data = await this.fetchAllLines();
         var action_title = self.props.action.display_name;
         let totals = {
             'diff0_sum':this.state.diff0_sum,
@@ -213,7 +240,7 @@ class AgedPayable extends owl.Component {
         }
         var datas = {
             'move_lines': self.state.move_line,
-            'data': self.state.data,
+            'data': data,
             'total': self.state.total,
             'filters': this.filter(),
             'grand_total': totals,
@@ -274,7 +301,9 @@ class AgedPayable extends owl.Component {
             this.state.selected_partner_rec.splice(index, 1)
             this.state.selected_partner = this.state.selected_partner_rec.map((rec) => rec.id)
         }
-        let filtered_data = await this.orm.call("age.payable.report", "get_filter_values", [this.date_range.el.value, this.state.selected_partner,]);
+        let filtered_data = await this.orm.call("age.payable.report", "get_filter_values", [this.date_range.el.value, this.state.selected_partner,], {lazy: true});
+        this.state.unfolded = {};
+        this.state.formatted = false;
         for (const index in filtered_data) {
             const value = filtered_data[index];
 
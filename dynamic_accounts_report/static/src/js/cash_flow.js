@@ -17,6 +17,8 @@ class CashBook extends owl.Component {
         this.tbody = useRef('tbody');
         this.unfoldButton = useRef('unfoldButton');
         this.state = useState({
+            unfolded: {},
+            next_key: {},
             move_line: null,
             data: null,
             total: null,
@@ -49,7 +51,9 @@ class CashBook extends owl.Component {
         var action_title = self.props.action.display_name;
         try {
             var self = this;
-            self.state.data = await self.orm.call("cash.book.report", "view_report", []);
+            self.state.data = await self.orm.call("cash.book.report", "view_report", [], {lazy: true});
+            self.state.unfolded = {};
+            self.state.next_key = {};
             for (const index in self.state.data) {
                 const value = self.state.data[index];
                 if (index !== 'move_lines_total' && index !== 'accounts') {
@@ -99,6 +103,7 @@ class CashBook extends owl.Component {
          */
         ev.preventDefault();
         var self = this;
+        const data = await this.fetchAllLines();
         var action_title = self.props.action.display_name;
         let totals = {
             'total_debit':this.state.total_debit,
@@ -114,7 +119,7 @@ class CashBook extends owl.Component {
                 'move_lines': self.state.move_line,
                 'filters': this.filter(),
                 'grand_total': totals,
-                'data': self.state.data,
+                'data': data,
                 'total': self.state.total,
                 'title': action_title,
                 'report_name': self.props.action.display_name
@@ -187,23 +192,24 @@ class CashBook extends owl.Component {
          */
         var self = this;
         var action_title = self.props.action.display_name;
-        let totals = {
-            'total_debit':this.state.total_debit,
-            'total_credit':this.state.total_credit,
-            'currency':this.state.currency,
-        }
+        // The server queries the lines again from the filters and streams
+        // the file, only the filters are posted.
         var datas = {
-            'move_lines': self.state.move_line,
-            'data': self.state.data,
-            'total': self.state.total,
             'title': action_title,
             'filters': this.filter(),
-            'grand_total': totals,
+        }
+        var options = {
+            'partner_id': this.state.selected_partner,
+            'data_range': this.state.date_range,
+            'account_list': this.state.selected_account_list,
+            'options': this.state.options,
+            'filters': datas.filters,
         }
         var action = {
             'data': {
                 'model': 'cash.book.report',
                 'data': JSON.stringify(datas),
+                'options': JSON.stringify(options),
                 'output_format': 'xlsx',
                 'report_action': self.props.action.xml_id,
                 'report_name': action_title,
@@ -291,7 +297,9 @@ class CashBook extends owl.Component {
                 }
             }
         }
-        let filtered_data = await this.orm.call("cash.book.report", "get_filter_values", [this.state.selected_partner, this.state.date_range, this.state.selected_account_list, this.state.options,]);
+        let filtered_data = await this.orm.call("cash.book.report", "get_filter_values", [this.state.selected_partner, this.state.date_range, this.state.selected_account_list, this.state.options,], {lazy: true});
+        this.state.unfolded = {};
+        this.state.next_key = {};
         for (const [index, value] of Object.entries(filtered_data)) {
             if (index !== 'move_lines_total') {
                 move_line_list.push(index);
@@ -314,23 +322,59 @@ class CashBook extends owl.Component {
     }
     async unfoldAll(ev) {
         /**
-         * Unfolds all items in the table body if the event target does not have the 'selected-filter' class,
-         * or folds all items if the event target has the 'selected-filter' class.
+         * Unfolds all accounts, loading their first page of lines when needed, if the event target does not have the 'selected-filter' class,
+         * or folds all accounts if the event target has the 'selected-filter' class.
          *
          * @param {Event} ev - The event object triggered by the action.
          */
         if (!ev.target.classList.contains("selected-filter")) {
-            for (var length = 0; length < this.tbody.el.children.length; length++) {
-                this.tbody.el.children[length].classList.add('show')
+            for (const account of this.state.move_line || []) {
+                if (!this.state.unfolded[account]) {
+                    await this.toggleAccount(account);
+                }
             }
             ev.target.classList.add("selected-filter");
         } else {
-            for (var length = 0; length < this.tbody.el.children.length; length++) {
-                this.tbody.el.children[length].classList.remove('show')
-            }
+            this.state.unfolded = {};
             ev.target.classList.remove("selected-filter");
         }
     }
+    async toggleAccount(account) {
+        /**
+         * Folds or unfolds an account, fetching its first page of lines the first time it is unfolded.
+         *
+         * @param {string} account - The display name of the account.
+         */
+        if (this.state.unfolded[account]) {
+            this.state.unfolded[account] = false;
+            return;
+        }
+        if (this.state.next_key[account] === undefined) {
+            await this.loadAccountLines(account);
+        }
+        this.state.unfolded[account] = true;
+    }
+    async loadAccountLines(account) {
+        /**
+         * Fetches the next page of lines of an account, with their running balance.
+         *
+         * @param {string} account - The display name of the account.
+         */
+        const lastKey = this.state.next_key[account] || null;
+        const page = await this.orm.call("cash.book.report", "get_account_lines", [this.state.total[account]['account_id'], this.state.selected_partner, this.state.date_range, this.state.selected_account_list, this.state.options, lastKey]);
+        page.lines.forEach(line => {
+            line.balance_display = (line.balance || 0).toFixed(2);
+        });
+        this.state.data[account] = [...(lastKey ? this.state.data[account] : []), ...page.lines];
+        this.state.next_key[account] = page.next_key;
+    }
+    async fetchAllLines() {
+        /**
+         * Fetches the report with the lines of every account, the screen only holds the unfolded pages.
+         */
+        const data = await this.orm.call("cash.book.report", "get_filter_values", [this.state.selected_partner, this.state.date_range, this.state.selected_account_list, this.state.options,]);
+        return data;
+    }
     getDomain() {
         return [];
     }
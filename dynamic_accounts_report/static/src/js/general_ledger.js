@@ -38,6 +38,8 @@ class GeneralLedger extends owl.Component {
             method: {
                         'accural': true
                     },
+            unfolded: {},
+            next_key: {},
         });
         this.load_data(self.initial_render = true);
     }
@@ -61,11 +63,13 @@ class GeneralLedger extends owl.Component {
         var action_title = self.props.action.display_name;
         try {
             var self = this;
-            let filtered_data = await this.orm.call("account.general.ledger", "get_filter_values", [self.state.selected_journal_list, self.state.date_range, self.state.options, self.state.selected_analytic_list,self.state.method]);
+            let filtered_data = await this.orm.call("account.general.ledger", "get_filter_values", [self.state.selected_journal_list, self.state.date_range, self.state.options, self.state.selected_analytic_list,self.state.method], {lazy: true});
             self.state.journals = filtered_data['journal_ids']
             self.state.analytics = filtered_data['analytic_ids']
             account_totals = filtered_data['account_totals']
-            self.state.account_data = await self.orm.call("account.general.ledger", "view_report", [self.wizard_id, action_title,]);
+            self.state.account_data = await self.orm.call("account.general.ledger", "view_report", [self.wizard_id, action_title,], {lazy: true});
+            self.state.unfolded = {}
+            self.state.next_key = {}
             for (const [index, value] of Object.entries(self.state.account_data)){
                 if (index !== 'account_totals' && index !== 'journal_ids' && index !== 'analytic_ids') {
                     account_list.push(index)
@@ -115,6 +119,7 @@ class GeneralLedger extends owl.Component {
             'currency':this.state.currency  || false,
         }
         var action_title = self.props.action.display_name;
+        const account_data = await this.fetchAllLines();
         return self.action.doAction({
             'type': 'ir.actions.report',
             'report_type': 'qweb-pdf',
@@ -122,7 +127,7 @@ class GeneralLedger extends owl.Component {
             'report_file': 'dynamic_accounts_report.general_ledger',
             'data': {
                 'account': self.state.account,
-                'account_data': self.state.account_data,
+                'account_data': account_data,
                 'total': self.state.account_total,
                 'title': action_title,
                 'filters': this.filter(),
@@ -134,26 +139,26 @@ class GeneralLedger extends owl.Component {
     }
     async print_xlsx() {
         var self = this;
-        let totals = {
-            'total_debit':this.state.total_debit,
-            'total_debit_display':this.state.total_debit_display || false,
-            'total_credit':this.state.total_credit,
-            'total_credit_display':this.state.total_credit_display || false,
-            'currency':this.state.currency,
-        }
         var action_title = self.props.action.display_name;
+        // The server queries the lines again from the filters and streams
+        // the file, only the filters are posted.
         var datas = {
-            'account': self.state.account,
-            'data': self.state.account_data,
-            'total': self.state.account_total,
             'title': action_title,
             'filters': this.filter(),
-            'grand_total': totals,
+        }
+        var options = {
+            'journal_id': this.state.selected_journal_list,
+            'date_range': this.state.date_range,
+            'options': this.state.options,
+            'analytic': this.state.selected_analytic_list,
+            'method': this.state.method,
+            'filters': datas.filters,
         }
         var action = {
             'data': {
                 'model': 'account.general.ledger',
                 'data': JSON.stringify(datas),
+                'options': JSON.stringify(options),
                 'output_format': 'xlsx',
                 'report_action': self.props.action.xml_id,
                 'report_name': action_title,
@@ -167,6 +172,25 @@ class GeneralLedger extends owl.Component {
             error: (error) => self.call('crash_manager', 'rpc_error', error),
         });
     }
+    async fetchAllLines() {
+        // The screen only holds the unfolded pages, prints need every line.
+        return await this.orm.call("account.general.ledger", "get_filter_values", [this.state.selected_journal_list, this.state.date_range, this.state.options, this.state.selected_analytic_list, this.state.method]);
+    }
+    async loadAccountLines(account) {
+        const page = await this.orm.call("account.general.ledger", "get_account_lines", [this.state.account_data.account_totals[account]['account_id'], this.state.selected_journal_list, this.state.date_range, this.state.options, this.state.selected_analytic_list, this.state.method, this.state.next_key[account] || null]);
+        this.state.account_data[account] = [...(this.state.account_data[account] || []), ...page.lines];
+        this.state.next_key[account] = page.next_key;
+    }
+    async toggleAccount(account) {
+        if (this.state.unfolded[account]) {
+            this.state.unfolded[account] = false;
+            return;
+        }
+        if (this.state.next_key[account] === undefined) {
+            await this.loadAccountLines(account);
+        }
+        this.state.unfolded[account] = true;
+    }
     gotoJournalEntry(ev) {
         return this.action.doAction({
             type: "ir.actions.act_window",
@@ -306,7 +330,9 @@ class GeneralLedger extends owl.Component {
                 }
             }
         }
-        let filtered_data = await this.orm.call("account.general.ledger", "get_filter_values", [this.state.selected_journal_list, this.state.date_range, this.state.options, this.state.selected_analytic_list,this.state.method]);
+        let filtered_data = await this.orm.call("account.general.ledger", "get_filter_values", [this.state.selected_journal_list, this.state.date_range, this.state.options, this.state.selected_analytic_list,this.state.method], {lazy: true});
+        this.state.unfolded = {}
+        this.state.next_key = {}
         for (let index in filtered_data) {
              const value = filtered_data[index];
             if (index !== 'account_totals' && index !== 'journal_ids' && index !== 'analytic_ids') {
@@ -331,14 +357,14 @@ class GeneralLedger extends owl.Component {
     }
     async unfoldAll(ev) {
         if (!ev.target.classList.contains("selected-filter")) {
-            for (var length = 0; length < this.tbody.el.children.length; length++) {
-                this.tbody.el.children[length].classList.add('show')
+            for (const account of this.state.account || []) {
+                if (!this.state.unfolded[account]) {
+                    await this.toggleAccount(account);
+                }
             }
             ev.target.classList.add("selected-filter");
         } else {
-            for (var length = 0; length < this.tbody.el.children.length; length++) {
-                this.tbody.el.children[length].classList.remove('show')
-            }
+            this.state.unfolded = {}
             ev.target.classList.remove("selected-filter");
         }
     }
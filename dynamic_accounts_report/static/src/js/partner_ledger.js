@@ -17,6 +17,7 @@ class PartnerLedger extends owl.Component {
         this.unfoldButton = useRef('unfoldButton');
         this.dialog = useService("dialog");
         this.state = useState({
+            unfolded: {},
             partners: null,
             data: null,
             total: null,
@@ -62,7 +63,8 @@ class PartnerLedger extends owl.Component {
         var action_title = self.props.action.display_name;
         try {
             var self = this;
-            self.state.data = await self.orm.call("account.partner.ledger", "view_report", [[this.wizard_id], action_title,]);
+            self.state.data = await self.orm.call("account.partner.ledger", "view_report", [[this.wizard_id], action_title,], {lazy: true});
+            self.state.unfolded = {};
             const dataArray = self.state.data;
              Object.entries(dataArray).forEach(([key, value]) => {
             if (key !== 'partner_totals') {
@@ -117,6 +119,7 @@ class PartnerLedger extends owl.Component {
             'currency':this.state.currency,
         }
         var action_title = this.props.action.display_name;
+        const data = await this.fetchAllLines();
         return this.action.doAction({
             'type': 'ir.actions.report',
             'report_type': 'qweb-pdf',
@@ -126,7 +129,7 @@ class PartnerLedger extends owl.Component {
                 'partners': this.state.partners,
                 'filters': this.filter(),
                 'grand_total': totals,
-                'data': this.state.data,
+                'data': data,
                 'total': this.state.total,
                 'title': action_title,
                 'report_name': this.props.action.display_name
@@ -193,28 +196,25 @@ class PartnerLedger extends owl.Component {
          * Generates and downloads an XLSX report for the partner ledger.
          */
         var self = this;
-
-        let partner_list = []
-        let partner_value = []
-        let partner_totals = ''
-        let totals = {
-            'total_debit':this.state.total_debit,
-            'total_credit':this.state.total_credit,
-            'currency':this.state.currency,
-        }
         var action_title = self.props.action.display_name;
+        // The server queries the lines again from the filters and streams
+        // the file, only the filters are posted.
         var datas = {
-            'partners': self.state.partners,
-            'data': self.state.data,
-            'total': self.state.total,
             'title': action_title,
             'filters': this.filter(),
-            'grand_total': totals,
+        }
+        var options = {
+            'partner_id': this.state.selected_partner,
+            'data_range': this.state.date_range,
+            'account': this.state.account,
+            'options': this.state.options,
+            'filters': datas.filters,
         }
         var action = {
             'data': {
                 'model': 'account.partner.ledger',
                 'data': JSON.stringify(datas),
+                'options': JSON.stringify(options),
                 'output_format': 'xlsx',
                 'report_action': self.props.action.xml_id,
                 'report_name': action_title,
@@ -372,7 +372,8 @@ class PartnerLedger extends owl.Component {
                 }
             }
         }
-        let filtered_data = await this.orm.call("account.partner.ledger", "get_filter_values", [this.state.selected_partner, this.state.date_range, this.state.account, this.state.options,]);
+        let filtered_data = await this.orm.call("account.partner.ledger", "get_filter_values", [this.state.selected_partner, this.state.date_range, this.state.account, this.state.options,], {lazy: true});
+        this.state.unfolded = {};
         for (let index in filtered_data) {
             const value = filtered_data[index];
             if (index !== 'partner_totals') {
@@ -400,23 +401,50 @@ class PartnerLedger extends owl.Component {
     }
     async unfoldAll(ev) {
         /**
-         * Unfolds all items in the table body if the event target does not have the 'selected-filter' class,
-         * or folds all items if the event target has the 'selected-filter' class.
+         * Unfolds all partners, loading their lines when needed, if the event target does not have the 'selected-filter' class,
+         * or folds all partners if the event target has the 'selected-filter' class.
          *
          * @param {Event} ev - The event object triggered by the action.
          */
         if (!ev.target.classList.contains("selected-filter")) {
-            for (var length = 0; length < this.tbody.el.children.length; length++) {
-                this.tbody.el.children[length].classList.add('show')
+            for (const partner of this.state.partners || []) {
+                if (!this.state.unfolded[partner]) {
+                    await this.togglePartner(partner);
+                }
             }
             ev.target.classList.add("selected-filter");
         } else {
-            for (var length = 0; length < this.tbody.el.children.length; length++) {
-                  this.tbody.el.children[length].classList.remove('show')
-            }
+            this.state.unfolded = {};
             ev.target.classList.remove("selected-filter");
         }
     }
+    async togglePartner(partner) {
+        /**
+         * Folds or unfolds a partner, fetching its lines the first time it is unfolded.
+         *
+         * @param {string} partner - The name of the partner.
+         */
+        if (this.state.unfolded[partner]) {
+            this.state.unfolded[partner] = false;
+            return;
+        }
+        if (!this.state.data[partner] || !this.state.data[partner].length) {
+            const lines = await this.orm.call("account.partner.ledger", "get_partner_lines", [this.state.total[partner]['partner_id'], this.state.date_range, this.state.account, this.state.options]);
+            lines.forEach(entry => {
+                entry[0].debit_display = this.formatNumberWithSeparators(entry[0].debit || 0);
+                entry[0].credit_display = this.formatNumberWithSeparators(entry[0].credit || 0);
+                entry[0].amount_currency_display = this.formatNumberWithSeparators(entry[0].amount_currency || 0);
+            });
+            this.state.data[partner] = lines;
+        }
+        this.state.unfolded[partner] = true;
+    }
+    async fetchAllLines() {
+        /**
+         * Fetches the report with the lines of every partner, the screen only holds the unfolded ones.
+         */
+        return await this.orm.call("account.partner.ledger", "get_filter_values", [this.state.selected_partner, this.state.date_range, this.state.account, this.state.options,]);
+    }
 }
 PartnerLedger.defaultProps = {
     resIds: [],
@@ -2,5 +2,6 @@
 
 from . import account
 from . import account_asset
+from . import account_asset_job
 from . import account_move
 from . import product
@@ -16,6 +16,18 @@ class AccountMove(models.Model):
                 line.move_posted_check = False
         return super(AccountMove, self).button_cancel()
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        moves = super(AccountMove, self).create(vals_list)
+        # the depreciation lines linked through asset_depreciation_ids are not written one by one
+        self.env['asset.asset.report']._mark_assets_to_refresh(moves.asset_depreciation_ids.asset_id.ids)
+        return moves
+
+    def unlink(self):
+        # the depreciation lines of the removed moves are unlinked from them in SQL, without write
+        self.env['asset.asset.report']._mark_assets_to_refresh(self.asset_depreciation_ids.asset_id.ids)
+        return super(AccountMove, self).unlink()
+
     def action_post(self):
         for move in self:
             for depreciation_line in move.asset_depreciation_ids:
@@ -1,12 +1,22 @@
 import calendar
-from datetime import date, datetime
+from datetime import date
 from dateutil.relativedelta import relativedelta
 
 from odoo import api, fields, models, _
 from odoo.exceptions import UserError, ValidationError
-from odoo.tools import float_compare, float_is_zero
+from odoo.tools import float_compare, float_is_zero, split_every
 from markupsafe import Markup
 
+# default number of depreciation entries created and posted together, can be
+# changed with the om_account_asset.depreciation_batch_size system parameter
+DEPRECIATION_BATCH_SIZE = 500
+
+# depreciation line fields computed by the depreciation board
+BOARD_LINE_FIELDS = ['amount', 'name', 'remaining_value', 'depreciated_value', 'depreciation_date']
+
+# asset fields copied on the rows of the asset analysis report
+ASSET_REPORT_FIELDS = ['active', 'category_id', 'company_id', 'date', 'partner_id', 'state', 'value']
+
 
 class AccountAssetCategory(models.Model):
     _name = 'account.asset.category'
@@ -219,22 +229,29 @@ class AccountAssetAsset(models.Model):
 
     @api.model
     def _cron_generate_entries(self):
-        self.compute_generated_entries(datetime.today())
+        # the work is split into jobs committed independently, so that a failing asset only stops its own job
+        # and an interrupted run resumes where it stopped; _cron_run_jobs crons can run the jobs in parallel
+        jobs = self.env['account.asset.depreciation.job']
+        jobs._plan_jobs(fields.Date.context_today(self))
+        jobs._run_jobs()
 
     @api.model
     def compute_generated_entries(self, date, asset_type=None):
         # Entries generated : one by grouped category and one by asset from ungrouped category
         created_move_ids = []
         type_domain = []
+        category_type_domain = []
         if asset_type:
             type_domain = [('type', '=', asset_type)]
+            category_type_domain = [('category_id.type', '=', asset_type)]
 
         ungrouped_assets = self.env['account.asset.asset'].search(type_domain + [('state', '=', 'open'), ('category_id.group_entries', '=', False)])
         created_move_ids += ungrouped_assets._compute_entries(date, group_entries=False)
 
-        for grouped_category in self.env['account.asset.category'].search(type_domain + [('group_entries', '=', True)]):
-            assets = self.env['account.asset.asset'].search([('state', '=', 'open'), ('category_id', '=', grouped_category.id)])
+        grouped_assets = self.env['account.asset.asset'].search(category_type_domain + [('state', '=', 'open'), ('category_id.group_entries', '=', True)])
+        for assets in grouped_assets.grouped('category_id').values():
             created_move_ids += assets._compute_entries(date, group_entries=True)
+            self.env['account.asset.depreciation.line']._commit_depreciation_batch()
         return created_move_ids
 
     def _compute_board_amount(self, sequence, residual_amount, amount_to_depr,
@@ -285,14 +302,55 @@ class AccountAssetAsset(models.Model):
         return undone_dotation_number
 
     def compute_depreciation_board(self):
-        self.ensure_one()
-
-        posted_depreciation_line_ids = self.depreciation_line_ids.filtered(lambda x: x.move_check).sorted(key=lambda l: l.depreciation_date)
-        unposted_depreciation_line_ids = self.depreciation_line_ids.filtered(lambda x: not x.move_check)
+        # The boards of all the assets are computed first and compared, by sequence, with their current unposted
+        # lines: only the lines whose values changed are updated, the missing and extra lines of the whole
+        # recordset are created and deleted at once.
+        self.depreciation_line_ids.fetch(BOARD_LINE_FIELDS + ['sequence', 'move_check'])
+        vals_to_create = []
+        lines_to_unlink = self.env['account.asset.depreciation.line']
+        # the lines getting the same changes are written together, the other changed lines are replaced, so that
+        # no line is written on its own
+        lines_by_changes = {}
+        for asset in self:
+            posted_depreciation_line_ids = asset.depreciation_line_ids.filtered(lambda x: x.move_check).sorted(key=lambda l: l.depreciation_date)
+            unposted_lines = {}
+            for line in asset.depreciation_line_ids - posted_depreciation_line_ids:
+                if line.sequence in unposted_lines:
+                    lines_to_unlink |= line
+                else:
+                    unposted_lines[line.sequence] = line
+            for vals in asset._compute_board_lines(posted_depreciation_line_ids):
+                line = unposted_lines.pop(vals['sequence'], None)
+                if not line:
+                    vals_to_create.append(vals)
+                    continue
+                changes = dict(
+                    (field_name, vals[field_name]) for field_name in BOARD_LINE_FIELDS
+                    if asset._is_board_value_changed(line, field_name, vals[field_name]))
+                if changes:
+                    lines_by_changes.setdefault(tuple(changes.items()), []).append((line, vals))
+            for line in unposted_lines.values():
+                lines_to_unlink |= line
+        for changes, lines_vals in lines_by_changes.items():
+            if len(lines_vals) > 1:
+                lines_to_unlink.browse([line.id for line, vals in lines_vals]).write(dict(changes))
+            else:
+                line, vals = lines_vals[0]
+                lines_to_unlink |= line
+                vals_to_create.append(vals)
+        lines_to_unlink.unlink()
+        self.env['account.asset.depreciation.line'].create(vals_to_create)
+        return True
 
-        # Remove old unposted depreciation lines. We cannot use unlink() with One2many field
-        commands = [(2, line_id.id, False) for line_id in unposted_depreciation_line_ids]
+    def _is_board_value_changed(self, line, field_name, value):
+        if line._fields[field_name].type in ('float', 'monetary'):
+            return bool(self.currency_id.compare_amounts(line[field_name], value))
+        return line[field_name] != value
 
+    def _compute_board_lines(self, posted_depreciation_line_ids):
+        """ Return the values of the unposted depreciation lines of the asset, by sequence. """
+        self.ensure_one()
+        board = []
         if self.value_residual != 0.0:
             amount_to_depr = residual_amount = self.value_residual
 
@@ -337,7 +395,7 @@ class AccountAssetAsset(models.Model):
                     'depreciated_value': self.value - (self.salvage_value + residual_amount),
                     'depreciation_date': depreciation_date,
                 }
-                commands.append((0, False, vals))
+                board.append(vals)
 
                 depreciation_date = depreciation_date + relativedelta(months=+self.method_period)
 
@@ -350,9 +408,7 @@ class AccountAssetAsset(models.Model):
                     max_day_in_month = calendar.monthrange(depreciation_date.year, depreciation_date.month)[1]
                     depreciation_date = depreciation_date.replace(day=max_day_in_month)
 
-        self.write({'depreciation_line_ids': commands})
-
-        return True
+        return board
 
     def validate(self):
         self.write({'state': 'open'})
@@ -517,15 +573,15 @@ class AccountAssetAsset(models.Model):
     @api.model_create_multi
     def create(self, vals_list):
         assets = super(AccountAssetAsset, self.with_context(mail_create_nolog=True)).create(vals_list)
-        for asset in assets:
-            asset.sudo().compute_depreciation_board()
+        assets.sudo().compute_depreciation_board()
         return assets
 
     def write(self, vals):
         res = super(AccountAssetAsset, self).write(vals)
         if 'depreciation_line_ids' not in vals and 'state' not in vals:
-            for rec in self:
-                rec.compute_depreciation_board()
+            self.compute_depreciation_board()
+        if any(field_name in vals for field_name in ASSET_REPORT_FIELDS):
+            self.env['asset.asset.report']._mark_assets_to_refresh(self.ids)
         return res
 
     def open_entries(self):
@@ -581,18 +637,32 @@ class AccountAssetDepreciationLine(models.Model):
         for line in self:
             line.move_posted_check = True if line.move_id and line.move_id.state == 'posted' else False
 
+    @api.model
+    def _get_depreciation_batch_size(self):
+        return int(self.env['ir.config_parameter'].sudo().get_param(
+            'om_account_asset.depreciation_batch_size', DEPRECIATION_BATCH_SIZE))
+
+    @api.model
+    def _commit_depreciation_batch(self):
+        # only the cron commits, so that an interrupted run resumes from the lines still without entry
+        if self.env.context.get('asset_batch_commit'):
+            # the heartbeat of the running job tells the other workers it is not abandoned
+            job = self.env['account.asset.depreciation.job'].browse(self.env.context.get('asset_depreciation_job_id'))
+            if job:
+                job.heartbeat = fields.Datetime.now()
+            self.env.cr.commit()
+
     def create_move(self, post_move=True):
+        if any(line.move_id for line in self):
+            raise UserError(_('This depreciation is already linked to a journal entry. Please post or delete it.'))
         created_moves = self.env['account.move']
-        for line in self:
-            if line.move_id:
-                raise UserError(_('This depreciation is already linked to a journal entry. Please post or delete it.'))
-            move_vals = self._prepare_move(line)
-            move = self.env['account.move'].create(move_vals)
-            line.write({'move_id': move.id, 'move_check': True})
-            created_moves |= move
-
-        if post_move and created_moves:
-            created_moves.filtered(lambda m: any(m.asset_depreciation_ids.mapped('asset_id.category_id.open_asset'))).action_post()
+        for lines in split_every(self._get_depreciation_batch_size(), self.ids, self.browse):
+            moves = self.env['account.move'].create([
+                dict(self._prepare_move(line), asset_depreciation_ids=[(4, line.id)]) for line in lines])
+            created_moves |= moves
+            if post_move:
+                moves.filtered(lambda m: any(m.asset_depreciation_ids.mapped('asset_id.category_id.open_asset'))).action_post()
+            self._commit_depreciation_batch()
         return [x.id for x in created_moves]
 
     def _prepare_move(self, line):
@@ -717,7 +787,19 @@ class AccountAssetDepreciationLine(models.Model):
                 msg = _format_message(_('Depreciation line posted.'), msg_values)
                 line.asset_id.message_post(body=msg)
     
+    @api.model_create_multi
+    def create(self, vals_list):
+        lines = super(AccountAssetDepreciationLine, self).create(vals_list)
+        self.env['asset.asset.report']._mark_assets_to_refresh(lines.asset_id.ids)
+        return lines
+
+    def write(self, vals):
+        res = super(AccountAssetDepreciationLine, self).write(vals)
+        self.env['asset.asset.report']._mark_assets_to_refresh(self.asset_id.ids)
+        return res
+
     def unlink(self):
+        self.env['asset.asset.report']._mark_assets_to_refresh(self.asset_id.ids)
         for record in self:
             if record.move_check:
                 if record.asset_id.category_id.type == 'purchase':
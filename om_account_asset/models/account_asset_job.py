@@ -0,0 +1,155 @@
+import logging
+from datetime import timedelta
+
+from odoo import api, fields, models
+from odoo.tools import split_every
+
+_logger = logging.getLogger(__name__)
+
+# maximum number of assets of an ungrouped category handled by one job
+DEPRECIATION_JOB_SIZE = 1000
+# a running job whose heartbeat was not updated for that long is considered
+# abandoned (killed worker, time limit) and can be resumed by another worker
+DEPRECIATION_JOB_TIMEOUT = timedelta(hours=1)
+
+
+class AccountAssetDepreciationJob(models.Model):
+    _name = 'account.asset.depreciation.job'
+    _description = 'Asset Depreciation Job'
+    _order = 'date desc, id'
+
+    date = fields.Date(required=True, readonly=True, index=True,
+                       help="Entries of the depreciation lines up to this date are generated.")
+    company_id = fields.Many2one('res.company', string='Company', required=True, readonly=True, ondelete='cascade')
+    category_id = fields.Many2one('account.asset.category', string='Asset Category', required=True, readonly=True,
+                                  ondelete='cascade')
+    min_asset_id = fields.Integer(string='First Asset', required=True, readonly=True)
+    max_asset_id = fields.Integer(string='Last Asset', required=True, readonly=True)
+    last_asset_id = fields.Integer(string='Processed Up To', readonly=True, default=0,
+                                   help="Last asset whose entries were generated and committed, "
+                                        "a resumed job starts after it.")
+    state = fields.Selection([('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')],
+                             string='Status', required=True, readonly=True, default='pending', index=True)
+    heartbeat = fields.Datetime(readonly=True,
+                                help="Last time the worker running the job committed some progress.")
+    error = fields.Text(readonly=True)
+
+    @api.model
+    def _plan_jobs(self, date):
+        # Split the open assets having depreciation lines to post into jobs by company, category and id range.
+        # Assets of a category grouping its entries stay in a single job, as they share one move.
+        # Planning is idempotent: the jobs already planned for the date are kept with their progress.
+        if self.search_count([('date', '=', date)], limit=1):
+            return
+        # the jobs of an earlier date not being run are covered by the new ones, which post every line up to
+        # date; a job claimed meanwhile is locked, the statement waits for the claim and then keeps it
+        self.env.flush_all()
+        self._cr.execute('''
+            DELETE FROM account_asset_depreciation_job
+            WHERE date < %(date)s
+                AND (state != 'running' OR heartbeat IS NULL OR heartbeat < %(stale_date)s)''',
+                         {'date': date, 'stale_date': fields.Datetime.now() - DEPRECIATION_JOB_TIMEOUT})
+        self._cr.execute('''
+            SELECT company_id, category_id, MIN(id), MAX(id)
+            FROM (
+                SELECT a.id, a.company_id, a.category_id,
+                    CASE WHEN c.group_entries THEN 0
+                         ELSE (ROW_NUMBER() OVER (PARTITION BY a.company_id, a.category_id ORDER BY a.id) - 1)
+                              / %(job_size)s
+                    END AS shard
+                FROM account_asset_asset a
+                    JOIN account_asset_category c ON (a.category_id = c.id)
+                WHERE a.state = 'open'
+                    AND a.active
+                    AND EXISTS (
+                        SELECT 1 FROM account_asset_depreciation_line l
+                        WHERE l.asset_id = a.id
+                            AND l.move_check IS NOT TRUE
+                            AND l.depreciation_date <= %(date)s)
+            ) AS asset
+            GROUP BY company_id, category_id, shard
+            ORDER BY company_id, category_id, MIN(id)''', {'date': date, 'job_size': DEPRECIATION_JOB_SIZE})
+        self.create([{
+            'date': date,
+            'company_id': company_id,
+            'category_id': category_id,
+            'min_asset_id': min_asset_id,
+            'max_asset_id': max_asset_id,
+        } for company_id, category_id, min_asset_id, max_asset_id in self._cr.fetchall()])
+        self._cr.commit()
+
+    @api.model
+    def _claim_job(self):
+        # SKIP LOCKED lets any number of workers pick jobs concurrently without taking the same one;
+        # a job waits while a job of an earlier date still runs on the same category, as both cover its assets
+        self.env.flush_all()
+        self._cr.execute('''
+            UPDATE account_asset_depreciation_job
+            SET state = 'running', heartbeat = (NOW() AT TIME ZONE 'UTC'), write_date = (NOW() AT TIME ZONE 'UTC')
+            WHERE id = (
+                SELECT j.id FROM account_asset_depreciation_job j
+                WHERE (j.state = 'pending' OR (j.state = 'running' AND (j.heartbeat IS NULL OR j.heartbeat < %(stale_date)s)))
+                    AND NOT EXISTS (
+                        SELECT 1 FROM account_asset_depreciation_job o
+                        WHERE o.company_id = j.company_id
+                            AND o.category_id = j.category_id
+                            AND o.date < j.date
+                            AND o.state = 'running'
+                            AND o.heartbeat >= %(stale_date)s)
+                ORDER BY j.date DESC, j.id
+                LIMIT 1
+                FOR UPDATE OF j SKIP LOCKED)
+            RETURNING id''', {'stale_date': fields.Datetime.now() - DEPRECIATION_JOB_TIMEOUT})
+        row = self._cr.fetchone()
+        self._cr.commit()
+        self.invalidate_model()
+        return self.browse(row and row[0])
+
+    @api.model
+    def _run_jobs(self):
+        while True:
+            job = self._claim_job()
+            if not job:
+                break
+            try:
+                job._run()
+            except Exception as e:
+                # only the failing job is rolled back, its progress up to the last commit is kept
+                self._cr.rollback()
+                _logger.exception("Asset depreciation job %s failed", job.id)
+                # the job may have been removed meanwhile if it was abandoned for too long, or finished by
+                # another worker which resumed it, whose outcome is kept
+                self._cr.execute('''
+                    UPDATE account_asset_depreciation_job
+                    SET state = 'failed', error = %s, write_date = (NOW() AT TIME ZONE 'UTC')
+                    WHERE state = 'running' AND id = %s''', [str(e), job.id])
+                self._cr.commit()
+                self.invalidate_model()
+
+    @api.model
+    def _cron_run_jobs(self):
+        # entry point of additional cron workers, running the jobs in parallel with the main cron
+        self._run_jobs()
+
+    def _save_progress(self, vals):
+        self.write(dict(vals, heartbeat=fields.Datetime.now()))
+        self._cr.commit()
+
+    def _run(self):
+        self.ensure_one()
+        assets = self.env['account.asset.asset'].with_company(self.company_id).with_context(
+            asset_batch_commit=True, asset_depreciation_job_id=self.id).search([
+                ('company_id', '=', self.company_id.id),
+                ('category_id', '=', self.category_id.id),
+                ('state', '=', 'open'),
+                ('id', '>', max(self.last_asset_id, self.min_asset_id - 1)),
+                ('id', '<=', self.max_asset_id),
+            ], order='id')
+        if self.category_id.group_entries:
+            assets._compute_entries(self.date, group_entries=True)
+        else:
+            batch_size = self.env['account.asset.depreciation.line']._get_depreciation_batch_size()
+            for batch in split_every(batch_size, assets.ids, assets.browse):
+                batch._compute_entries(self.date, group_entries=False)
+                self._save_progress({'last_asset_id': batch.ids[-1]})
+        self._save_progress({'state': 'done', 'last_asset_id': self.max_asset_id, 'error': False})
@@ -1,5 +1,8 @@
 from odoo import api, fields, models, tools
 
+# key of the precommit data holding the ids of the assets whose report rows are out of date
+ASSETS_TO_REFRESH = 'asset.asset.report.assets'
+
 
 class AssetAssetReport(models.Model):
     _name = "asset.asset.report"
@@ -24,42 +27,124 @@ class AssetAssetReport(models.Model):
     company_id = fields.Many2one('res.company', string='Company', readonly=True)
 
     def init(self):
+        # The report is a table refreshed asset by asset rather than a view, so that reading it does not
+        # aggregate every depreciation line again. One row by asset and depreciation period, as the former view.
         tools.drop_view_if_exists(self._cr, 'asset_asset_report')
         self._cr.execute("""
-            create or replace view asset_asset_report as (
-                select
-                    min(dl.id) as id,
-                    dl.name as name,
-                    dl.depreciation_date as depreciation_date,
-                    a.date as date,
-                    (CASE WHEN dlmin.id = min(dl.id)
-                      THEN a.value
-                      ELSE 0
-                      END) as gross_value,
-                    dl.amount as depreciation_value,
-                    dl.amount as installment_value,
-                    (CASE WHEN dl.move_check
-                      THEN dl.amount
-                      ELSE 0
-                      END) as posted_value,
-                    (CASE WHEN NOT dl.move_check
-                      THEN dl.amount
-                      ELSE 0
-                      END) as unposted_value,
-                    dl.asset_id as asset_id,
-                    dl.move_check as move_check,
-                    a.category_id as asset_category_id,
-                    a.partner_id as partner_id,
-                    a.state as state,
-                    count(dl.*) as installment_nbr,
-                    count(dl.*) as depreciation_nbr,
-                    a.company_id as company_id
-                from account_asset_depreciation_line dl
-                    left join account_asset_asset a on (dl.asset_id=a.id)
-                    left join (select min(d.id) as id,ac.id as ac_id from account_asset_depreciation_line as d inner join account_asset_asset as ac ON (ac.id=d.asset_id) group by ac_id) as dlmin on dlmin.ac_id=a.id
-                where a.active is true 
-                group by
-                    dl.amount,dl.asset_id,dl.depreciation_date,dl.name,
-                    a.date, dl.move_check, a.state, a.category_id, a.partner_id, a.company_id,
-                    a.value, a.id, a.salvage_value, dlmin.id
-        )""")
+            CREATE TABLE IF NOT EXISTS asset_asset_report (
+                id integer PRIMARY KEY,
+                name varchar,
+                depreciation_date date,
+                date date,
+                gross_value numeric,
+                depreciation_value numeric,
+                installment_value numeric,
+                posted_value numeric,
+                unposted_value numeric,
+                asset_id integer REFERENCES account_asset_asset (id) ON DELETE CASCADE,
+                move_check boolean,
+                asset_category_id integer,
+                partner_id integer,
+                state varchar,
+                installment_nbr integer,
+                depreciation_nbr integer,
+                company_id integer
+            )""")
+        self._cr.execute("CREATE INDEX IF NOT EXISTS asset_asset_report_asset_id_index ON asset_asset_report (asset_id)")
+        self._cr.execute("SELECT 1 FROM asset_asset_report LIMIT 1")
+        if not self._cr.fetchone():
+            self._refresh_assets()
+
+    @api.model
+    def _refresh_assets(self, asset_ids=None):
+        # Recompute the rows of the given assets, or of all of them when asset_ids is None
+        params = {}
+        asset_clause = report_asset_clause = ''
+        if asset_ids is not None:
+            if not asset_ids:
+                return
+            asset_clause = 'AND a.id IN %(asset_ids)s'
+            report_asset_clause = 'AND r.asset_id IN %(asset_ids)s'
+            params['asset_ids'] = tuple(asset_ids)
+        self.env.flush_all()
+        # the gross value is reported on the first line of the asset, found with a window over the asset
+        # instead of a subquery over every depreciation line; the rows are upserted so that concurrent
+        # refreshes of an asset wait for each other instead of failing on the primary key, and the rows
+        # not produced anymore are deleted by the same statement
+        self._cr.execute("""
+            WITH upserted AS (
+            INSERT INTO asset_asset_report (
+                id, name, depreciation_date, date, gross_value, depreciation_value, installment_value,
+                posted_value, unposted_value, asset_id, move_check, asset_category_id, partner_id, state,
+                installment_nbr, depreciation_nbr, company_id)
+            SELECT
+                min(dl.id) as id,
+                dl.name as name,
+                dl.depreciation_date as depreciation_date,
+                a.date as date,
+                (CASE WHEN min(min(dl.id)) OVER (PARTITION BY dl.asset_id) = min(dl.id)
+                  THEN a.value
+                  ELSE 0
+                  END) as gross_value,
+                dl.amount as depreciation_value,
+                dl.amount as installment_value,
+                (CASE WHEN dl.move_check
+                  THEN dl.amount
+                  ELSE 0
+                  END) as posted_value,
+                (CASE WHEN NOT dl.move_check
+                  THEN dl.amount
+                  ELSE 0
+                  END) as unposted_value,
+                dl.asset_id as asset_id,
+                dl.move_check as move_check,
+                a.category_id as asset_category_id,
+                a.partner_id as partner_id,
+                a.state as state,
+                count(dl.*) as installment_nbr,
+                count(dl.*) as depreciation_nbr,
+                a.company_id as company_id
+            FROM account_asset_depreciation_line dl
+                JOIN account_asset_asset a ON (dl.asset_id = a.id)
+            WHERE a.active IS TRUE
+                """ + asset_clause + """
+            GROUP BY
+                dl.amount, dl.asset_id, dl.depreciation_date, dl.name,
+                a.date, dl.move_check, a.state, a.category_id, a.partner_id, a.company_id,
+                a.value, a.id
+            ON CONFLICT (id) DO UPDATE SET
+                name = EXCLUDED.name, depreciation_date = EXCLUDED.depreciation_date, date = EXCLUDED.date,
+                gross_value = EXCLUDED.gross_value, depreciation_value = EXCLUDED.depreciation_value,
+                installment_value = EXCLUDED.installment_value, posted_value = EXCLUDED.posted_value,
+                unposted_value = EXCLUDED.unposted_value, asset_id = EXCLUDED.asset_id,
+                move_check = EXCLUDED.move_check, asset_category_id = EXCLUDED.asset_category_id,
+                partner_id = EXCLUDED.partner_id, state = EXCLUDED.state, installment_nbr = EXCLUDED.installment_nbr,
+                depreciation_nbr = EXCLUDED.depreciation_nbr, company_id = EXCLUDED.company_id
+            RETURNING id
+            )
+            DELETE FROM asset_asset_report r
+            WHERE NOT EXISTS (SELECT 1 FROM upserted u WHERE u.id = r.id)
+                """ + report_asset_clause, params)
+        self.invalidate_model()
+
+    @api.model
+    def _mark_assets_to_refresh(self, asset_ids):
+        # The rows are refreshed once before the transaction is committed, or before the report is read,
+        # whatever the number of writes made on the assets and their lines meanwhile.
+        if not asset_ids:
+            return
+        data = self.env.cr.precommit.data
+        if ASSETS_TO_REFRESH not in data:
+            self.env.cr.precommit.add(self._refresh_marked_assets)
+        data.setdefault(ASSETS_TO_REFRESH, set()).update(asset_ids)
+
+    @api.model
+    def _refresh_marked_assets(self):
+        asset_ids = self.env.cr.precommit.data.pop(ASSETS_TO_REFRESH, None)
+        if asset_ids:
+            self._refresh_assets(asset_ids)
+
+    @api.model
+    def _search(self, domain, *args, **kwargs):
+        self._refresh_marked_assets()
+        return super(AssetAssetReport, self)._search(domain, *args, **kwargs)
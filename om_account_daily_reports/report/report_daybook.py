@@ -1,21 +1,21 @@
 import time
+from itertools import groupby
+from operator import itemgetter
 from odoo import api, models, _
 from odoo.exceptions import UserError
-from datetime import timedelta, datetime
+from datetime import datetime
+
+DAY_BOOK_FETCH_SIZE = 1000
 
 
 class ReportDayBook(models.AbstractModel):
     _name = 'report.om_account_daily_reports.report_daybook'
     _description = 'Day Book'
 
-    def _get_account_move_entry(self, accounts, form_data, date):
+    def _get_account_move_entries(self, accounts, form_data, date_from, date_to):
+        # All the lines of the period are read by one query ordered by date,
+        # and grouped into days while the cursor is consumed.
         cr = self.env.cr
-        MoveLine = self.env['account.move.line']
-        init_wheres = [""]
-
-        init_tables, init_where_clause, init_where_params =MoveLine._query_get()
-        if init_where_clause.strip():
-            init_wheres.append(init_where_clause.strip())
         if form_data['target_move'] == 'posted':
             target_move = "AND m.state = 'posted'"
         else:
@@ -25,7 +25,7 @@ class ReportDayBook(models.AbstractModel):
                     SELECT 0 AS lid, 
                           l.account_id AS account_id, l.date AS ldate, j.code AS lcode, 
                           l.amount_currency AS amount_currency,l.ref AS lref,l.name AS lname, 
-                          COALESCE(SUM(l.credit),0.0) AS credit,COALESCE(l.debit,0) AS debit,COALESCE(SUM(l.debit),0) - COALESCE(SUM(l.credit),0) as balance, 
+                          COALESCE(l.credit,0.0) AS credit,COALESCE(l.debit,0) AS debit,COALESCE(l.debit,0) - COALESCE(l.credit,0) as balance, 
                               m.name AS move_name, 
                               c.symbol AS currency_code, 
                               p.name AS lpartner_id, 
@@ -40,35 +40,28 @@ class ReportDayBook(models.AbstractModel):
                             WHERE 
                               l.account_id IN %s 
                               AND l.journal_id IN %s """ + target_move + """ 
-                              AND l.date = %s 
-                            GROUP BY 
-                              l.id, 
-                              l.account_id, 
-                              l.date, 
-                              m.name, 
-                              m.id, 
-                              p.name, 
-                              c.symbol, 
-                              j.code, 
-                              l.ref 
+                              AND l.date BETWEEN %s AND %s 
                             ORDER BY 
-                              l.date DESC
+                              l.date, 
+                              l.id
                      """)
 
-        where_params = (tuple(accounts.ids), tuple(form_data['journal_ids']), date)
+        where_params = (tuple(accounts.ids), tuple(form_data['journal_ids']), date_from, date_to)
         cr.execute(sql, where_params)
-        data = cr.dictfetchall()
-        res = {}
-        debit = credit = balance = 0.00
-        for line in data:
-            debit += line['debit']
-            credit += line['credit']
-            balance += line['balance']
-        res['debit'] = debit
-        res['credit'] = credit
-        res['balance'] = balance
-        res['lines'] = data
-        return res
+        for date, lines in groupby(self._fetch_lines(cr), key=itemgetter('ldate')):
+            res = {'date': date, 'debit': 0.0, 'credit': 0.0, 'balance': 0.0, 'lines': []}
+            for line in lines:
+                res['debit'] += line['debit']
+                res['credit'] += line['credit']
+                res['balance'] += line['balance']
+                res['lines'].append(line)
+            yield res
+
+    def _fetch_lines(self, cr):
+        rows = cr.dictfetchmany(DAY_BOOK_FETCH_SIZE)
+        while rows:
+            yield from rows
+            rows = cr.dictfetchmany(DAY_BOOK_FETCH_SIZE)
 
     @api.model
     def _get_report_values(self, docids, data=None):
@@ -87,22 +80,15 @@ class ReportDayBook(models.AbstractModel):
             codes = [journal.code for journal in
                      self.env['account.journal'].browse(data['form']['journal_ids'])]
         accounts = self.env['account.account'].search([])
-        dates = []
         record = []
-        days_total = date_to - date_from
-        for day in range(days_total.days + 1):
-            dates.append(date_from + timedelta(days=day))
-        for date in dates:
-            date_data = str(date)
-            accounts_res = self.with_context(data['form'].get('comparison_context', {}))._get_account_move_entry(accounts, form_data, date_data)
-            if accounts_res['lines']:
-                record.append({
-                    'date': date,
-                    'debit': accounts_res['debit'],
-                    'credit': accounts_res['credit'],
-                    'balance': accounts_res['balance'],
-                    'move_lines': accounts_res['lines']
-                })
+        for accounts_res in self.with_context(data['form'].get('comparison_context', {}))._get_account_move_entries(accounts, form_data, date_from, date_to):
+            record.append({
+                'date': accounts_res['date'],
+                'debit': accounts_res['debit'],
+                'credit': accounts_res['credit'],
+                'balance': accounts_res['balance'],
+                'move_lines': accounts_res['lines']
+            })
         return {
             'doc_ids': docids,
             'doc_model': model,
@@ -1,6 +1,26 @@
 from odoo import api, fields, models, _
 
 
+class AccountMove(models.Model):
+    _inherit = 'account.move'
+
+    def _get_followup_partners(self):
+        return self.line_ids.filtered(
+            lambda l: l.account_id.account_type == 'asset_receivable').partner_id
+
+    def _post(self, soft=True):
+        posted = super(AccountMove, self)._post(soft)
+        self.env['followup.partner.summary']._refresh_partners(
+            posted._get_followup_partners().ids)
+        return posted
+
+    def button_draft(self):
+        partners = self._get_followup_partners()
+        res = super(AccountMove, self).button_draft()
+        self.env['followup.partner.summary']._refresh_partners(partners.ids)
+        return res
+
+
 class AccountMoveLine(models.Model):
     _inherit = 'account.move.line'
 
@@ -11,3 +31,27 @@ class AccountMoveLine(models.Model):
     def _get_result(self):
         for aml in self:
             aml.result = aml.debit - aml.credit
+
+    def write(self, vals):
+        res = super(AccountMoveLine, self).write(vals)
+        if 'followup_line_id' in vals or 'followup_date' in vals:
+            self.env['followup.partner.summary']._refresh_partners(
+                self.partner_id.ids)
+        return res
+
+
+class AccountFullReconcile(models.Model):
+    _inherit = 'account.full.reconcile'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        full_reconciles = super(AccountFullReconcile, self).create(vals_list)
+        self.env['followup.partner.summary']._refresh_partners(
+            full_reconciles.reconciled_line_ids.partner_id.ids)
+        return full_reconciles
+
+    def unlink(self):
+        partners = self.reconciled_line_ids.partner_id
+        res = super(AccountFullReconcile, self).unlink()
+        self.env['followup.partner.summary']._refresh_partners(partners.ids)
+        return res
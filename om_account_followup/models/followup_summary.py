@@ -0,0 +1,126 @@
+from odoo import api, fields, models
+from odoo.tools import split_every
+
+# number of partners whose summary rows are refreshed together by the daily cron
+SUMMARY_REFRESH_BATCH_SIZE = 1000
+
+SUMMARY_FIELDS = [
+    'partner_id', 'company_id', 'amount_due', 'amount_overdue', 'overdue_date',
+    'next_due_date', 'earliest_due_date', 'latest_followup_date',
+    'latest_followup_level_id',
+]
+
+
+class FollowupPartnerSummary(models.Model):
+    _name = "followup.partner.summary"
+    _description = "Follow-up Summary by Partner"
+    _rec_name = 'partner_id'
+
+    partner_id = fields.Many2one('res.partner', 'Partner', required=True, readonly=True, index=True,
+                                 ondelete='cascade')
+    company_id = fields.Many2one('res.company', 'Company', required=True, readonly=True, ondelete='cascade')
+    amount_due = fields.Float('Amount Due', readonly=True)
+    amount_overdue = fields.Float('Amount Overdue', readonly=True)
+    overdue_date = fields.Date('Overdue Computed On', readonly=True)
+    next_due_date = fields.Date('Next Due Date', readonly=True,
+                                help="First due date after the date the overdue amount was computed on, "
+                                     "the overdue amount is out of date once it is reached.")
+    earliest_due_date = fields.Date('Worst Due Date', readonly=True)
+    latest_followup_date = fields.Date('Latest Follow-up Date', readonly=True)
+    latest_followup_level_id = fields.Many2one('followup.line', 'Latest Follow-up Level', readonly=True,
+                                               ondelete='set null')
+
+    _sql_constraints = [('partner_company_uniq', 'unique(partner_id, company_id)',
+                         'Only one follow-up summary per partner and company is allowed')]
+
+    def init(self):
+        self._cr.execute("SELECT 1 FROM followup_partner_summary LIMIT 1")
+        if not self._cr.fetchone():
+            self._refresh_partners()
+
+    def _get_summary_query(self, partner_clause):
+        return '''
+            SELECT
+                l.partner_id AS partner_id,
+                l.company_id AS company_id,
+                SUM(l.debit - l.credit) AS amount_due,
+                COALESCE(SUM(l.debit - l.credit) FILTER (
+                    WHERE COALESCE(l.date_maturity, l.date) <= %(today)s), 0.0) AS amount_overdue,
+                %(today)s::date AS overdue_date,
+                MIN(COALESCE(l.date_maturity, l.date)) FILTER (
+                    WHERE COALESCE(l.date_maturity, l.date) > %(today)s) AS next_due_date,
+                MIN(COALESCE(l.date_maturity, l.date)) AS earliest_due_date,
+                MAX(l.followup_date) AS latest_followup_date,
+                (ARRAY_AGG(l.followup_line_id ORDER BY fl.delay DESC, l.id) FILTER (
+                    WHERE l.followup_line_id IS NOT NULL))[1] AS latest_followup_level_id
+            FROM account_move_line l
+                JOIN account_account a ON (l.account_id = a.id)
+                LEFT JOIN followup_line fl ON (l.followup_line_id = fl.id)
+            WHERE a.account_type = 'asset_receivable'
+                AND l.full_reconcile_id IS NULL
+                AND l.parent_state = 'posted'
+                AND l.partner_id IS NOT NULL
+                ''' + partner_clause + '''
+            GROUP BY l.partner_id, l.company_id'''
+
+    @api.model
+    def _refresh_partners(self, partner_ids=None):
+        """ Recompute the summary rows of the given partners, or of all of them when partner_ids is None.
+        Called when entries are posted or reset to draft, when lines get (un)reconciled and when their
+        follow-up level changes, which are the only events changing the aggregated open lines, and daily
+        for the rows whose next due date was reached.
+        """
+        params = {'today': fields.Date.today()}
+        partner_clause = summary_partner_clause = ''
+        if partner_ids is not None:
+            if not partner_ids:
+                return
+            partner_clause = 'AND l.partner_id IN %(partner_ids)s'
+            summary_partner_clause = 'AND s.partner_id IN %(partner_ids)s'
+            params['partner_ids'] = tuple(partner_ids)
+        self.env.flush_all()
+        # upsert rather than delete and insert, so that concurrent transactions refreshing a partner without
+        # row yet wait for each other instead of failing on the unique constraint; the same statement deletes
+        # the rows of the partners left without open lines
+        self._cr.execute('''
+            WITH upserted AS (
+                INSERT INTO followup_partner_summary (''' + ', '.join(SUMMARY_FIELDS) + ''')
+                SELECT ''' + ', '.join(SUMMARY_FIELDS) + ''' FROM (''' + self._get_summary_query(partner_clause) + ''') AS summary
+                ON CONFLICT (partner_id, company_id) DO UPDATE SET ''' + ', '.join(
+            '%s = EXCLUDED.%s' % (field_name, field_name) for field_name in SUMMARY_FIELDS[2:]) + '''
+                RETURNING partner_id, company_id
+            )
+            DELETE FROM followup_partner_summary s
+            WHERE NOT EXISTS (SELECT 1 FROM upserted u WHERE u.partner_id = s.partner_id AND u.company_id = s.company_id)
+                ''' + summary_partner_clause, params)
+        self.invalidate_model()
+
+    @api.model
+    def _cron_refresh_overdue(self):
+        # persist the overdue amount of the rows whose next due date was reached, which _get_summaries
+        # would otherwise recompute on every read
+        self._cr.execute('SELECT DISTINCT partner_id FROM followup_partner_summary WHERE next_due_date <= %s',
+                         [fields.Date.today()])
+        partner_ids = [partner_id for partner_id, in self._cr.fetchall()]
+        for batch_ids in split_every(SUMMARY_REFRESH_BATCH_SIZE, partner_ids):
+            self._refresh_partners(batch_ids)
+
+    @api.model
+    def _get_summaries(self, partners, company):
+        """ Return the summary values of partners for company, by partner id. The overdue amount of the rows
+        for which one of the due dates was reached since they were refreshed is recomputed on the fly.
+        """
+        today = fields.Date.today()
+        summaries = {}
+        stale_partner_ids = []
+        for summary in self.search_read([('partner_id', 'in', partners.ids), ('company_id', '=', company.id)],
+                                        SUMMARY_FIELDS, load=None):
+            summaries[summary['partner_id']] = summary
+            if summary['overdue_date'] < today and summary['next_due_date'] and summary['next_due_date'] <= today:
+                stale_partner_ids.append(summary['partner_id'])
+        if stale_partner_ids:
+            self._cr.execute(self._get_summary_query('AND l.partner_id IN %(partner_ids)s AND l.company_id = %(company_id)s'),
+                             {'today': today, 'partner_ids': tuple(stale_partner_ids), 'company_id': company.id})
+            for row in self._cr.dictfetchall():
+                summaries[row['partner_id']]['amount_overdue'] = row['amount_overdue']
+        return summaries
@@ -1,10 +1,15 @@
+from collections import defaultdict
 from functools import reduce
 from lxml import etree
+from markupsafe import escape
 from odoo import api, fields, models, _
 from datetime import datetime
 from odoo.exceptions import ValidationError
+from odoo.tools import split_every
 from odoo.tools.misc import formatLang
 
+FOLLOWUP_MAIL_BATCH_SIZE = 500
+
 
 class ResPartner(models.Model):
     _inherit = "res.partner"
@@ -24,30 +29,14 @@ class ResPartner(models.Model):
 
     def _get_latest(self):
         company = self.env.user.company_id
+        summaries = self.env['followup.partner.summary'].sudo()._get_summaries(
+            self, company)
         for partner in self:
-            amls = partner.unreconciled_aml_ids
-            latest_date = False
-            latest_level = False
-            latest_days = False
-            latest_level_without_lit = False
-            latest_days_without_lit = False
-            for aml in amls:
-                aml_followup = aml.followup_line_id
-                if (aml.company_id == company) and aml_followup and \
-                        (not latest_days or latest_days < aml_followup.delay):
-                    latest_days = aml_followup.delay
-                    latest_level = aml_followup.id
-                if (aml.company_id == company) and aml.followup_date and (
-                        not latest_date or latest_date < aml.followup_date):
-                    latest_date = aml.followup_date
-                if (aml.company_id == company) and \
-                        (aml_followup and (not latest_days_without_lit or
-                         latest_days_without_lit < aml_followup.delay)):
-                    latest_days_without_lit = aml_followup.delay
-                    latest_level_without_lit = aml_followup.id
-            partner.latest_followup_date = latest_date
+            summary = summaries.get(partner.id, {})
+            latest_level = summary.get('latest_followup_level_id') or False
+            partner.latest_followup_date = summary.get('latest_followup_date') or False
             partner.latest_followup_level_id = latest_level
-            partner.latest_followup_level_id_without_lit = latest_level_without_lit
+            partner.latest_followup_level_id_without_lit = latest_level
 
     def do_partner_manual_action_dermanord(self, followup_line):
         action_text = followup_line.manual_action_note or ''
@@ -103,6 +92,10 @@ class ResPartner(models.Model):
         ctx['followup'] = True
         template = 'om_account_followup.email_template_om_account_followup_default'
         unknown_mails = 0
+        # mails are grouped by template and queued in batches, the chatter
+        # notes are logged together once all of them are queued
+        recipients = defaultdict(list)
+        bodies = {}
         for partner in self:
             partners_to_email = [child for child in partner.child_ids if
                                  child.type == 'invoice' and child.email]
@@ -110,19 +103,18 @@ class ResPartner(models.Model):
                 partners_to_email = [partner]
             if partners_to_email:
                 level = partner.latest_followup_level_id_without_lit
-                for partner_to_email in partners_to_email:
-                    if level and level.send_email and \
-                            level.email_template_id and \
-                            level.email_template_id.id:
-                        level.email_template_id.with_context(ctx).send_mail(
-                            partner_to_email.id)
-                    else:
-                        mail_template_id = self.env.ref(template)
-                        mail_template_id.with_context(ctx).send_mail(
-                            partner_to_email.id)
+                if level and level.send_email and \
+                        level.email_template_id and \
+                        level.email_template_id.id:
+                    mail_template = level.email_template_id
+                else:
+                    mail_template = self.env.ref(template)
+                recipients[mail_template] += [
+                    partner_to_email.id for partner_to_email in
+                    partners_to_email]
                 if partner not in partners_to_email:
-                    partner.message_post(body=_(
-                        'Overdue email sent to %s' % ', '.join(
+                    bodies[partner.id] = escape(_(
+                        'Overdue email sent to %s', ', '.join(
                             ['%s <%s>' % (partner.name, partner.email) for
                              partner in partners_to_email])))
             else:
@@ -143,6 +135,12 @@ class ResPartner(models.Model):
                 partner.with_context(ctx).write(
                     {'payment_next_action_date': payment_action_date,
                      'payment_next_action': payment_next_action})
+        for mail_template, res_ids in recipients.items():
+            for batch_ids in split_every(FOLLOWUP_MAIL_BATCH_SIZE, res_ids,
+                                         list):
+                mail_template.with_context(ctx).send_mail_batch(batch_ids)
+        if bodies:
+            self.browse(list(bodies))._message_log_batch(bodies)
         return unknown_mails
 
     def get_followup_table_html(self):
@@ -251,21 +249,13 @@ class ResPartner(models.Model):
 
     def _get_amounts_and_date(self):
         company = self.env.user.company_id
-        current_date = fields.Date.today()
+        summaries = self.env['followup.partner.summary'].sudo()._get_summaries(
+            self, company)
         for partner in self:
-            worst_due_date = False
-            amount_due = amount_overdue = 0.0
-            for aml in partner.unreconciled_aml_ids:
-                if (aml.company_id == company):
-                    date_maturity = aml.date_maturity or aml.date
-                    if not worst_due_date or date_maturity < worst_due_date:
-                        worst_due_date = date_maturity
-                    amount_due += aml.result
-                    if (date_maturity <= current_date):
-                        amount_overdue += aml.result
-            partner.payment_amount_due = amount_due
-            partner.payment_amount_overdue = amount_overdue
-            partner.payment_earliest_due_date = worst_due_date
+            summary = summaries.get(partner.id, {})
+            partner.payment_amount_due = summary.get('amount_due', 0.0)
+            partner.payment_amount_overdue = summary.get('amount_overdue', 0.0)
+            partner.payment_earliest_due_date = summary.get('earliest_due_date') or False
 
     def _get_followup_overdue_query(self, args, overdue_only=False):
         company_id = self.env.user.company_id.id
@@ -1,5 +1,6 @@
 import datetime
 import time
+from collections import defaultdict
 from odoo import api, fields, models, _
 from markupsafe import Markup
 
@@ -48,13 +49,17 @@ class FollowupPrint(models.TransientModel):
         nbmanuals = 0
         manuals = {}
         nbmails = 0
-        nbunknownmails = 0
         nbprints = 0
         resulttext = " "
+        # the manual actions, mails and letter notes are collected first and
+        # then processed for all the partners at once
+        manual_partner_ids = []
+        mail_partners = partner_obj
+        letter_bodies = {}
         for partner in self.env['followup.stat.by.partner'].browse(
                 partner_ids):
             if partner.max_followup_id.manual_action:
-                partner_obj.do_partner_manual_action([partner.partner_id.id])
+                manual_partner_ids.append(partner.partner_id.id)
                 nbmanuals = nbmanuals + 1
                 key = partner.partner_id.payment_responsible_id.name or _(
                     "Anybody")
@@ -63,17 +68,23 @@ class FollowupPrint(models.TransientModel):
                 else:
                     manuals[key] = manuals[key] + 1
             if partner.max_followup_id.send_email:
-                nbunknownmails += partner.partner_id.do_partner_mail()
+                mail_partners |= partner.partner_id
                 nbmails += 1
             if partner.max_followup_id.send_letter:
                 partner_ids_to_print.append(partner.id)
                 nbprints += 1
                 followup_without_lit = \
                     partner.partner_id.latest_followup_level_id_without_lit
-                message = "%s<I> %s </I>%s" % (_("Follow-up letter of "),
-                                               followup_without_lit.name,
-                                               _(" will be sent"))
-                partner.partner_id.message_post(body=message)
+                letter_bodies[partner.partner_id.id] = Markup(
+                    "%s<I> %s </I>%s") % (_("Follow-up letter of "),
+                                          followup_without_lit.name,
+                                          _(" will be sent"))
+        if manual_partner_ids:
+            partner_obj.do_partner_manual_action(manual_partner_ids)
+        nbunknownmails = mail_partners.do_partner_mail()
+        if letter_bodies:
+            partner_obj.browse(list(letter_bodies))._message_log_batch(
+                letter_bodies)
         if nbunknownmails == 0:
             resulttext += str(nbmails) + _(" email(s) sent")
         else:
@@ -100,11 +111,14 @@ class FollowupPrint(models.TransientModel):
         return result
 
     def do_update_followup_level(self, to_update, partner_list, date):
-        for id in to_update.keys():
-            if to_update[id]['partner_id'] in partner_list:
-                self.env['account.move.line'].browse([int(id)]).write(
-                    {'followup_line_id': to_update[id]['level'],
-                     'followup_date': date})
+        partner_list = set(partner_list)
+        line_ids_by_level = defaultdict(list)
+        for id, values in to_update.items():
+            if values['partner_id'] in partner_list:
+                line_ids_by_level[values['level']].append(int(id))
+        for level, line_ids in line_ids_by_level.items():
+            self.env['account.move.line'].browse(line_ids).write(
+                {'followup_line_id': level, 'followup_date': date})
 
     def clear_manual_actions(self, partner_list):
         partner_list_ids = [partner.partner_id.id for partner in self.env[
@@ -164,62 +178,59 @@ class FollowupPrint(models.TransientModel):
         data = self
         company_id = data.company_id.id
         context = self.env.context
-        self._cr.execute(
-            '''SELECT
-                    l.partner_id,
-                    l.followup_line_id,
-                    l.date_maturity,
-                    l.date, l.id
-                FROM account_move_line AS l
-                LEFT JOIN account_account AS a
-                ON (l.account_id=a.id)
-                WHERE (l.full_reconcile_id IS NULL)
-                AND a.account_type = 'asset_receivable'
-                AND (l.partner_id is NOT NULL)
-                AND (l.debit > 0)
-                AND (l.company_id = %s)
-                ORDER BY l.date''' % (company_id))
-        move_lines = self._cr.fetchall()
-        old = None
-        fups = {}
         fup_id = 'followup_id' in context and context[
             'followup_id'] or data.followup_id.id
         date = 'date' in context and context['date'] or data.date
-        date = fields.Date.to_string(date)
-        current_date = datetime.date(*time.strptime(date, '%Y-%m-%d')[:3])
+        current_date = fields.Date.to_date(date)
         self._cr.execute(
-            '''SELECT *
+            '''SELECT id, delay
             FROM followup_line
-            WHERE followup_id=%s
-            ORDER BY delay''' % (fup_id,))
+            WHERE followup_id = %s
+            ORDER BY delay''', (fup_id,))
 
+        # each level is reached from the previous one (no level for the
+        # first) once the due date is older than its delay
+        old = None
+        current_levels, thresholds, next_levels = [], [], []
         for result in self._cr.dictfetchall():
-            delay = datetime.timedelta(days=result['delay'])
-            fups[old] = (current_date - delay, result['id'])
+            current_levels.append(old)
+            thresholds.append(
+                current_date - datetime.timedelta(days=result['delay']))
+            next_levels.append(result['id'])
             old = result['id']
+        if not next_levels:
+            return {'partner_ids': [], 'to_update': {}}
 
-        partner_list = []
+        # only the open receivable lines whose threshold is reached are
+        # fetched, lines already at the last level or not due yet are
+        # filtered out by the join
+        self._cr.execute(
+            '''SELECT l.partner_id, l.id, fup.next_level
+                FROM account_move_line AS l
+                JOIN account_account AS a ON (l.account_id = a.id)
+                JOIN unnest(%(current_levels)s::int[],
+                            %(thresholds)s::date[],
+                            %(next_levels)s::int[])
+                    AS fup(current_level, threshold, next_level)
+                ON (l.followup_line_id IS NOT DISTINCT FROM fup.current_level)
+                WHERE (l.full_reconcile_id IS NULL)
+                AND a.account_type = 'asset_receivable'
+                AND (l.partner_id IS NOT NULL)
+                AND (l.debit > 0)
+                AND (l.company_id = %(company_id)s)
+                AND COALESCE(l.date_maturity, l.date) <= fup.threshold
+                ORDER BY l.date''', {
+                'current_levels': current_levels,
+                'thresholds': thresholds,
+                'next_levels': next_levels,
+                'company_id': company_id,
+            })
+
+        partner_list = {}
         to_update = {}
-
-        for partner_id, followup_line_id, date_maturity, date, id in \
-                move_lines:
-            if not partner_id:
-                continue
-            if followup_line_id not in fups:
-                continue
+        for partner_id, id, level in self._cr.fetchall():
             stat_line_id = partner_id * 10000 + company_id
-            if date_maturity:
-                date_maturity = fields.Date.to_string(date_maturity)
-                if date_maturity <= fups[followup_line_id][0].strftime(
-                        '%Y-%m-%d'):
-                    if stat_line_id not in partner_list:
-                        partner_list.append(stat_line_id)
-                    to_update[str(id)] = {'level': fups[followup_line_id][1],
-                                          'partner_id': stat_line_id}
-            elif date and date <= fups[followup_line_id][0].strftime(
-                    '%Y-%m-%d'):
-                if stat_line_id not in partner_list:
-                    partner_list.append(stat_line_id)
-                to_update[str(id)] = {'level': fups[followup_line_id][1],
-                                      'partner_id': stat_line_id}
-        return {'partner_ids': partner_list, 'to_update': to_update}
+            partner_list[stat_line_id] = True
+            to_update[str(id)] = {'level': level,
+                                  'partner_id': stat_line_id}
+        return {'partner_ids': list(partner_list), 'to_update': to_update}